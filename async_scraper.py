@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asyncio scraping engine for the Naver JSON API
+Runs hundreds of in-flight lookups on one event loop, gated by a single
+shared token bucket (requests/sec + burst) and a concurrency semaphore.
+Backs off adaptively on HTTP 429/5xx.
+"""
+
+import asyncio
+import time
+from urllib.parse import quote
+
+from naver_fetcher import NAVER_API_URL, PARSER_VERSION, REQUEST_TIMEOUT, USER_AGENT, parse_word_json
+
+# Configuration
+DEFAULT_RATE = 20.0  # requests per second
+DEFAULT_BURST = 10  # bucket capacity
+DEFAULT_CONCURRENCY = 200  # max in-flight requests
+MAX_RETRIES = 3
+MIN_RATE = 0.5  # adaptive backoff never throttles below this
+BACKOFF_FACTOR = 0.5  # rate multiplier on 429/5xx
+RECOVERY_STEP = 0.05  # fraction of the target rate regained per success
+BASE_PAUSE = 1.0  # seconds, doubled per consecutive throttle response
+MAX_PAUSE = 60.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CACHE_SOURCE = 'http'  # Shares cache entries with the threaded http backend
+
+class TokenBucket:
+    """
+    Shared token bucket with adaptive rate
+
+    acquire() waits until a token is available. throttle() halves the
+    current rate and pauses all callers; succeed() slowly restores the rate
+    towards the configured target.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.target_rate = rate
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.consecutive_throttles = 0
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, retry_after=None):
+        """Back off after a 429/5xx response"""
+        self.consecutive_throttles += 1
+        self.rate = max(MIN_RATE, self.rate * BACKOFF_FACTOR)
+        pause = retry_after if retry_after is not None else BASE_PAUSE * 2 ** (self.consecutive_throttles - 1)
+        self.paused_until = max(self.paused_until, time.monotonic() + min(pause, MAX_PAUSE))
+        self.tokens = 0.0
+
+    def succeed(self):
+        """Recover the rate after a successful response"""
+        self.consecutive_throttles = 0
+        if self.rate < self.target_rate:
+            self.rate = min(self.target_rate, self.rate + self.target_rate * RECOVERY_STEP)
+
+class EngineStats:
+    """Request counters for the end-of-run report"""
+
+    def __init__(self):
+        self.requests = 0
+        self.ok = 0
+        self.not_found = 0
+        self.failed = 0
+        self.throttled = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.started = time.monotonic()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def achieved_rate(self):
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self, bucket):
+        print(f"\n[INFO] Async engine: {self.requests} requests in {self.elapsed:.1f}s")
+        print(f"  Achieved rate:  {self.achieved_rate:.1f} req/s (limit {bucket.target_rate:g} req/s, burst {bucket.capacity})")
+        print(f"  Final rate:     {bucket.rate:.1f} req/s")
+        print(f"  OK: {self.ok}  Not found: {self.not_found}  Failed: {self.failed}")
+        print(f"  Throttled (429/5xx): {self.throttled}  Network errors: {self.errors}  Cache hits: {self.cache_hits}")
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+async def fetch_word(session, bucket, stats, word, api_url=NAVER_API_URL, max_retries=MAX_RETRIES):
+    """Fetch the raw JSON body for word, retrying on 429/5xx; None on failure"""
+    url = f"{api_url}?query={quote(word)}&range=word"
+
+    for attempt in range(max_retries):
+        await bucket.acquire()
+        stats.requests += 1
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    bucket.succeed()
+                    return await response.text()
+                if response.status in RETRY_STATUSES:
+                    stats.throttled += 1
+                    bucket.throttle(parse_retry_after(response.headers.get('Retry-After')))
+                    continue
+                return None
+        except Exception:
+            # Timeouts, connection resets, aiohttp.ClientError
+            stats.errors += 1
+
+    return None
+
+async def lookup_words(words, on_result, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                       concurrency=DEFAULT_CONCURRENCY, api_url=NAVER_API_URL, cache=None, archive=None):
+    """
+    Look up all words concurrently
+
+    Args:
+        words: iterable of (key, word) pairs
+        on_result: callback(key, word, meaning) called as each lookup finishes
+                   (meaning is None when not found / failed)
+        rate, burst: token bucket parameters shared by all requests
+        concurrency: max in-flight requests
+        api_url: API endpoint (point at a local fixture server for testing)
+        cache: optional LookupCache; hits never reach the rate limiter
+        archive: optional ResponseArchive receiving every raw response
+
+    Returns:
+        EngineStats
+    """
+    import aiohttp
+
+    bucket = TokenBucket(rate, burst)
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = EngineStats()
+
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    headers = {
+        'User-Agent': USER_AGENT,
+        'Accept': 'application/json',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+        'Referer': 'https://ja.dict.naver.com/',
+    }
+
+    async def worker(key, word):
+        async with semaphore:
+            raw = await fetch_word(session, bucket, stats, word, api_url)
+        if raw is None:
+            stats.failed += 1
+            meaning = None
+        else:
+            if archive is not None:
+                archive.add(CACHE_SOURCE, word, raw)
+            meaning = parse_word_json(raw)
+            if meaning:
+                stats.ok += 1
+            else:
+                stats.not_found += 1
+            if cache is not None:
+                cache.put(CACHE_SOURCE, word, PARSER_VERSION, raw, meaning)
+        on_result(key, word, meaning)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+        pending = set()
+        for key, word in words:
+            if cache is not None:
+                found, meaning = cache.get(CACHE_SOURCE, word, PARSER_VERSION, parse_word_json)
+                if found:
+                    stats.cache_hits += 1
+                    on_result(key, word, meaning)
+                    continue
+            # Keep task creation bounded so huge inputs don't allocate all tasks up front
+            if len(pending) >= concurrency * 2:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()  # Re-raise errors from on_result
+            pending.add(asyncio.create_task(worker(key, word)))
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            for task in done:
+                task.result()
+
+    stats.finished = time.monotonic()
+    stats.report(bucket)
+    return stats
+
+def run_lookups(words, on_result, **kwargs):
+    """Synchronous entry point for lookup_words()"""
+    return asyncio.run(lookup_words(words, on_result, **kwargs))
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Async Naver lookup (try against naver_fixture_server.py)')
+    parser.add_argument('words', nargs='*', default=['する', '思う', 'ある'])
+    parser.add_argument('--api-url', default=NAVER_API_URL)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE)
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--repeat', type=int, default=1, help='Repeat the word list (load testing)')
+    args = parser.parse_args()
+
+    words = [(i, w) for i, w in enumerate(args.words * args.repeat)]
+    show = args.repeat == 1
+
+    def on_result(key, word, meaning):
+        if show:
+            print(f"{word}: {meaning or '[NOT FOUND]'}")
+
+    run_lookups(words, on_result, rate=args.rate, burst=args.burst,
+                concurrency=args.concurrency, api_url=args.api_url)
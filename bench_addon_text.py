@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the JPDB frequency addon's field text pipeline
+
+Compares the addon's previous per-note text handling (uncompiled re.sub,
+chained str.replace, six substring scans, stripping twice) with the
+text.py pipeline over the deck's expressions, then times the lookup part
+of a fill loop both ways (same compiled index). A JPDB.txt is generated
+from the deck's Frequency column, so no external file is needed.
+
+Usage:
+    python bench_addon_text.py
+    python bench_addon_text.py --input resources/all/26225_Japanese.csv --repeat 5
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jpdb-frequency-addon'))
+from freq_index import open_index  # noqa: E402
+from text import analyze_field  # noqa: E402
+
+# Configuration
+INPUT_FILE = 'resources/all/26225_Japanese.csv'
+
+# Previous implementation, kept here for comparison
+
+def old_strip_html(text):
+    if not text:
+        return text
+    clean = re.sub(r'<[^>]+>', '', text)
+    clean = clean.replace('&nbsp;', ' ')
+    clean = clean.replace('&lt;', '<')
+    clean = clean.replace('&gt;', '>')
+    clean = clean.replace('&amp;', '&')
+    clean = clean.replace('&quot;', '"')
+    return clean.strip()
+
+def old_is_sentence(text):
+    if not text:
+        return False
+    if any(p in text for p in ['。', '、', '！', '？', '「', '」']):
+        return True
+    if len(text) > 15:
+        return True
+    if ' ' in text or '　' in text:
+        return True
+    return False
+
+def old_fill_loop(values, index):
+    hits = 0
+    for raw in values:
+        clean = old_strip_html(raw)
+        if old_is_sentence(clean):
+            continue
+        if index.get(old_strip_html(clean)) is not None:  # get_frequency_local() stripped again
+            hits += 1
+    return hits
+
+def new_fill_loop(values, index):
+    hits = 0
+    freq_of = {}
+    for raw in values:
+        clean, sentence = analyze_field(raw)
+        if sentence:
+            continue
+        if clean not in freq_of:
+            freq_of[clean] = index.get(clean)
+        if freq_of[clean] is not None:
+            hits += 1
+    return hits
+
+def load_rows(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(row['Expression'], row.get('Frequency', '')) for row in csv.DictReader(f)
+                if row.get('Expression', '').strip()]
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        analyze_field.cache_clear()
+        started = time.process_time()
+        result = func(*args)
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def report(label, count, elapsed, baseline=None):
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ''
+    print(f"  {label:28s} {elapsed * 1000:8.1f} ms CPU  {count / elapsed:11,.0f} fields/sec{speedup}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the addon text pipeline')
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    rows = load_rows(args.input)
+    # Each note is filled more than once in practice (re-runs, overwrite); two passes show the memo
+    values = [expression for expression, _ in rows] * 2
+
+    print("=" * 60)
+    print(f"Addon text pipeline: {len(values):,} field values")
+    print("=" * 60)
+
+    old, old_results = best_of(args.repeat, lambda: [old_is_sentence(old_strip_html(v)) for v in values])
+    report('old strip + is_sentence', len(values), old)
+    new, new_results = best_of(args.repeat, lambda: [analyze_field(v)[1] for v in values])
+    report('analyze_field (memoized)', len(values), new, old)
+    assert old_results == new_results, 'sentence detection differs'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jpdb_path = os.path.join(tmp, 'JPDB.txt')
+        with open(jpdb_path, 'w', encoding='utf-8') as f:
+            for expression, frequency in rows:
+                f.write(f"{expression.strip()}\t{frequency}\n")
+        index, _ = open_index(jpdb_path, os.path.join(tmp, 'frequency.idx'))
+
+        try:
+            old, old_hits = best_of(args.repeat, old_fill_loop, values, index)
+            report('fill loop, before', len(values), old)
+            new, new_hits = best_of(args.repeat, new_fill_loop, values, index)
+            report('fill loop, after', len(values), new, old)
+        finally:
+            index.close()
+    assert old_hits == new_hits, 'fill loops found different words'
+
+    print(f"\n[OK] Same results ({new_hits:,} hits)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark POS classification: serial vs batched vs N processes
+
+Every mode must produce exactly the same (category, pos_detail) list as
+the serial analyze_word() loop. The compound analysis is timed against the
+batched head-token pass.
+
+Usage:
+    python bench_classify.py
+    python bench_classify.py --workers 2 4 8 --dict core
+"""
+
+import argparse
+import csv
+import os
+import time
+
+from classify_pos import (INPUT_FILE, SUDACHI_DICT, BATCH_SIZE,
+                          analyze_word, classify_batch, classify_batch_compound, classify_words,
+                          create_tokenizer)
+
+def load_words(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [row['Expression'].strip() for row in csv.DictReader(f)
+                if row.get('Expression', '').strip()]
+
+def report(label, count, elapsed, baseline=None):
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ''
+    print(f"  {label:24s} {elapsed:7.2f}s  {count / elapsed:9,.0f} words/sec{speedup}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark POS classification modes')
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--dict', default=SUDACHI_DICT, choices=['small', 'core', 'full'])
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({2, 4, os.cpu_count() or 1}),
+                        help='Process counts to try')
+    args = parser.parse_args()
+
+    words = load_words(args.input)
+    print("=" * 60)
+    print(f"POS classification benchmark: {len(words):,} words, {args.dict.upper()} dictionary")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    tokenizer_obj = create_tokenizer(args.dict)
+    print(f"  {'dictionary load':24s} {time.perf_counter() - started:7.2f}s")
+
+    # Serial: one analyze_word() call per row (the original loop)
+    started = time.perf_counter()
+    expected = [analyze_word(tokenizer_obj, word) for word in words]
+    serial = time.perf_counter() - started
+    report('serial', len(words), serial)
+
+    # Batched, in-process
+    started = time.perf_counter()
+    results = []
+    for i in range(0, len(words), args.batch_size):
+        results.extend(classify_batch(tokenizer_obj, words[i:i + args.batch_size]))
+    batched = time.perf_counter() - started
+    report('batched', len(words), batched, serial)
+    assert results == expected, 'batched results differ from serial'
+
+    # Compound analysis (whole C-mode analysis + B/A votes), batched
+    started = time.perf_counter()
+    compound = []
+    for i in range(0, len(words), args.batch_size):
+        compound.extend(classify_batch_compound(tokenizer_obj, words[i:i + args.batch_size]))
+    elapsed = time.perf_counter() - started
+    report('compound (batched)', len(words), elapsed, serial)
+    changed = sum(1 for old, new in zip(expected, compound) if old[0] != new[0])
+    print(f"  {'':24s} {elapsed / batched:.2f}x the batched head-token pass, "
+          f"{changed:,} categories changed")
+
+    # N processes (includes pool startup and one dictionary load per process)
+    for workers in args.workers:
+        if workers < 2:
+            continue
+        started = time.perf_counter()
+        results = classify_words(words, workers, args.batch_size, args.dict, progress=False)
+        report(f'{workers} processes', len(words), time.perf_counter() - started, serial)
+        assert results == expected, f'{workers}-process results differ from serial'
+
+    print("\n[OK] All head-token modes produced identical classifications")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark convert_to_csv.py: json.load + DictWriter vs the streaming converter
+
+Generates a pretty-printed JSON word list of the requested size, converts
+it both ways in separate processes (so each reports its own peak RSS) and
+checks that the CSV outputs are identical.
+
+Usage:
+    python bench_convert.py
+    python bench_convert.py --entries 500000
+"""
+
+import argparse
+import csv
+import filecmp
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from convert_to_csv import HEADERS, convert
+
+def legacy_convert(input_file, output_file):
+    """The previous converter: whole-file json.load, one dict per row, DictWriter"""
+    with open(input_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS, extrasaction='ignore')
+        writer.writeheader()
+        for entry in data:
+            row = {header: '' for header in HEADERS}
+            row.update({field: entry.get(field, '') for field in ('Frequency', 'Expression', 'Reading', 'Meaning')})
+            writer.writerow(row)
+    return len(data)
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def write_sample(path, entries):
+    """Pretty-printed JSON array shaped like 26225_Japanese.json"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i in range(entries):
+            entry = {
+                'Frequency': i + 1,
+                'Expression': f'単語{i}',
+                'Reading': f'たんご{i}',
+                'Meaning': f'1. 단어 {i}, 2. "낱말"',
+                'Image': '',
+                'IMM_Sentence': '',
+            }
+            f.write(json.dumps(entry, ensure_ascii=False, indent=4))
+            f.write(',\n' if i + 1 < entries else '\n')
+        f.write(']\n')
+
+def run_child(mode, input_file, output_file):
+    started = time.perf_counter()
+    count = (legacy_convert if mode == 'legacy' else convert)(input_file, output_file)
+    print(json.dumps({'rows': count, 'seconds': time.perf_counter() - started, 'rss': peak_rss_mb()}))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON to CSV conversion')
+    parser.add_argument('--entries', type=int, default=500000)
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'INPUT', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = os.path.join(tmp, 'sample.json')
+        write_sample(sample, args.entries)
+
+        print("=" * 60)
+        print(f"JSON -> CSV: {args.entries:,} entries ({os.path.getsize(sample) / 1024 / 1024:.1f} MB)")
+        print("=" * 60)
+
+        outputs = {}
+        for mode in ('legacy', 'streaming'):
+            outputs[mode] = os.path.join(tmp, f'{mode}.csv')
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, sample, outputs[mode]],
+                                    capture_output=True, text=True, check=True)
+            stats = json.loads(result.stdout)
+            rss = f"{stats['rss']:7.1f} MB peak RSS" if stats['rss'] is not None else 'peak RSS n/a'
+            print(f"  {mode:10s} {stats['seconds']:7.2f}s  {stats['rows'] / stats['seconds']:10,.0f} rows/sec  {rss}")
+
+        assert filecmp.cmp(outputs['legacy'], outputs['streaming'], shallow=False), 'CSV outputs differ'
+    print("\n[OK] Identical CSV output")
+
+if __name__ == '__main__':
+    main()
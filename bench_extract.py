@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the offline extractor on saved Naver pages / API responses
+
+Usage:
+    python bench_extract.py                       # fixtures + suru_page.html
+    python bench_extract.py captures/ --repeat 20
+"""
+
+import argparse
+import os
+import time
+
+from naver_extract import extract_entries
+from naver_fixture_server import FIXTURE_DIR
+
+# Configuration
+DEFAULT_CORPUS = [FIXTURE_DIR, 'suru_page.html']
+EXTENSIONS = ('.html', '.htm', '.json')
+
+def collect_files(paths):
+    """Expand directories into the saved pages they contain"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(EXTENSIONS):
+                    files.append(os.path.join(path, name))
+        elif os.path.exists(path):
+            files.append(path)
+    return files
+
+def load_corpus(files):
+    corpus = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus.append((path.endswith('.json'), f.read()))
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offline Naver extraction')
+    parser.add_argument('paths', nargs='*', default=DEFAULT_CORPUS,
+                        help='Saved pages or directories (default: fixtures + suru_page.html)')
+    parser.add_argument('--repeat', type=int, default=10, help='Passes over the corpus')
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        print("[ERROR] No saved pages found")
+        return
+
+    corpus = load_corpus(files)
+    total_bytes = sum(len(content.encode('utf-8')) for _, content in corpus)
+    html_pages = sum(1 for is_json, _ in corpus if not is_json)
+
+    print("=" * 60)
+    print("Offline extraction benchmark")
+    print("=" * 60)
+    print(f"Corpus: {len(corpus)} files ({html_pages} HTML, {len(corpus) - html_pages} JSON), "
+          f"{total_bytes / 1024:.0f} KB")
+
+    entries = sum(len(extract_entries(content, is_json)) for is_json, content in corpus)
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for is_json, content in corpus:
+            extract_entries(content, is_json)
+    elapsed = time.perf_counter() - started
+
+    pages = len(corpus) * args.repeat
+    print(f"Entries per pass: {entries}")
+    print(f"Parsed {pages} pages in {elapsed:.2f}s: {pages / elapsed:,.0f} pages/sec, "
+          f"{total_bytes * args.repeat / elapsed / 1024 / 1024:.1f} MB/s (one core)")
+
+if __name__ == '__main__':
+    main()
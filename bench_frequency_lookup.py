@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hit rates of the JPDB frequency addon's lookups on the deck's expressions
+
+Compares exact lookups (the addon's previous behaviour) with the
+normalized/deinflected fallback of FrequencyIndex.lookup().
+
+Usage:
+    python bench_frequency_lookup.py path/to/JPDB.txt
+    python bench_frequency_lookup.py JPDB.txt --input resources/all/26225_Japanese.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jpdb-frequency-addon'))
+from freq_index import open_index  # noqa: E402
+
+# Configuration
+INPUT_FILE = 'resources/all/26225_Japanese.csv'
+
+def load_expressions(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [row['Expression'].strip() for row in csv.DictReader(f)
+                if row.get('Expression', '').strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='JPDB frequency lookup hit rates')
+    parser.add_argument('jpdb_file', help='JPDB.txt (word<TAB>rank)')
+    parser.add_argument('--input', default=INPUT_FILE, help='CSV with an Expression column')
+    args = parser.parse_args()
+
+    expressions = load_expressions(args.input)
+    total = len(expressions)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        index, _ = open_index(args.jpdb_file, os.path.join(tmp, 'frequency.idx'))
+        build = time.perf_counter() - started
+
+        try:
+            started = time.perf_counter()
+            exact = sum(1 for word in expressions if index.get(word) is not None)
+            exact_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            kinds = Counter(index.lookup(word)[1] for word in expressions)
+            fallback_time = time.perf_counter() - started
+        finally:
+            index.close()
+
+    found = total - kinds[None]
+    print("=" * 60)
+    print(f"JPDB lookup hit rates: {total:,} expressions, {len(index):,} JPDB words")
+    print("=" * 60)
+    print(f"  Index build:              {build:7.2f}s")
+    print(f"  Exact only (before):      {exact:7,} hits ({exact / total * 100:5.1f}%)  {exact_time * 1000:7.1f} ms")
+    print(f"  With fallback (after):    {found:7,} hits ({found / total * 100:5.1f}%)  {fallback_time * 1000:7.1f} ms")
+    for kind in ('exact', 'normalized', 'deinflected'):
+        print(f"    - {kind:12s}          {kinds[kind]:7,}")
+    print(f"  Still not found:          {kinds[None]:7,}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the JPDB frequency addon's multi-source merge policies
+
+Builds a FrequencyStore from synthetic overlapping frequency lists (or from
+real source files) and times every merge policy over the whole store.
+NumPy is used if installed, otherwise the array fallback.
+
+Usage:
+    python bench_frequency_merge.py --words 150000 --sources 3
+    python bench_frequency_merge.py --source JPDB.txt --source resources/all/26225_Japanese.csv
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jpdb-frequency-addon'))
+import freq_sources  # noqa: E402
+from freq_sources import MERGE_POLICIES, FrequencyStore, open_store, read_source  # noqa: E402
+
+def synthetic_rank_maps(words, sources, coverage=0.7, seed=1):
+    """Overlapping lists: each source ranks a random subset of the vocabulary, noisily"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i:07d}" for i in range(words)]
+    rank_maps = []
+    for _ in range(sources):
+        listed = [word for word in vocabulary if rng.random() < coverage]
+        rng.shuffle(listed)
+        listed.sort(key=lambda word: int(word[1:]) * rng.uniform(0.5, 1.5))
+        rank_maps.append({word: rank for rank, word in enumerate(listed, 1)})
+    return rank_maps
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark frequency merge policies')
+    parser.add_argument('--words', type=int, default=150000, help='Synthetic vocabulary size')
+    parser.add_argument('--sources', type=int, default=3, help='Synthetic source count')
+    parser.add_argument('--source', action='append', default=[], help='Real source file (repeatable)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.source:
+        rank_maps = [read_source({'path': path}) for path in args.source]
+    else:
+        rank_maps = synthetic_rank_maps(args.words, args.sources)
+    load = time.perf_counter() - started
+
+    started = time.perf_counter()
+    store = FrequencyStore(rank_maps)
+    build = time.perf_counter() - started
+
+    backend = 'numpy' if freq_sources.np is not None else 'array fallback'
+    print("=" * 60)
+    print(f"Frequency merge: {len(store):,} words x {store.sources} sources ({backend})")
+    print("=" * 60)
+    print(f"  {'read sources':20s} {load * 1000:9.1f} ms")
+    print(f"  {'build store':20s} {build * 1000:9.1f} ms")
+
+    # Real sources: the saved store a policy or weight change re-merges from
+    if args.source:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store_path = os.path.join(tmp_dir, 'frequency_sources.bin')
+            sources = [{'path': path} for path in args.source]
+            open_store(sources, store_path)
+            started = time.perf_counter()
+            _, status = open_store(sources, store_path)
+            print(f"  {'reopen saved store':20s} {(time.perf_counter() - started) * 1000:9.1f} ms  ({status})")
+
+    weights = [float(i + 1) for i in range(store.sources)]
+    for policy in MERGE_POLICIES:
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            merged = store.merge(policy, weights)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"  {'merge: ' + policy:20s} {best * 1000:9.1f} ms  {len(store) / best:13,.0f} words/sec"
+              f"  (rank of {store.words[0]}: {merged[0]})")
+
+if __name__ == '__main__':
+    main()
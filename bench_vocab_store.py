@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark loading two columns: CSV row dicts vs the columnar vocab store
+
+Times what a tool needing only Frequency and Expression pays today
+(csv.DictReader over the master CSV, 14-field dict per row) against opening
+the memory-mapped store and reading the same two columns.
+
+Usage:
+    python bench_vocab_store.py
+    python bench_vocab_store.py --input resources/all/26225_Japanese.csv --repeat 10
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from vocab_store import build_store, open_store, read_list_rows
+
+# Configuration
+INPUT_FILE = 'resources/all/26225_Japanese.csv'
+
+def load_csv(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(int(row['Frequency']), row['Expression']) for row in csv.DictReader(f)]
+
+def load_store(path):
+    with open_store(path) as store:
+        return list(zip(store.column('Frequency').tolist(), store.column('Expression')))
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark two-column loads: CSV vs vocab store')
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = os.path.join(tmp, 'vocab.store')
+        build_store(read_list_rows(args.input), store_path)
+
+        print("=" * 60)
+        print(f"Frequency + Expression from {args.input}")
+        print("=" * 60)
+        csv_time, csv_rows = best_of(args.repeat, load_csv, args.input)
+        print(f"  {'csv.DictReader':20s} {csv_time * 1000:8.1f} ms")
+        store_time, store_rows = best_of(args.repeat, load_store, store_path)
+        print(f"  {'vocab store':20s} {store_time * 1000:8.1f} ms  ({csv_time / store_time:.1f}x)")
+        open_time, _ = best_of(args.repeat, lambda: open_store(store_path).close())
+        print(f"  {'open store only':20s} {open_time * 1000:8.2f} ms")
+
+    assert csv_rows == store_rows, 'loaders disagree'
+    print(f"\n[OK] Same {len(store_rows):,} rows")
+
+if __name__ == '__main__':
+    main()
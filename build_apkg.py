@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless Anki package builder for the word list
+
+Writes an .apkg straight from 26225_Japanese.csv (or the JSON word list)
+instead of importing the CSV through Anki's GUI. The note type is built
+from src/word/{kr2jp,jp2kr}-{front,back}.html and src/card.css:
+
+    ord 0  한→일  generated when GenerateKR2JP is filled
+    ord 1  일→한  generated when GenerateJP2KR is filled
+
+Rows with both Generate fields empty get the --default-generate fields
+filled with 'Y' in the note itself (the fronts are wrapped in
+{{#GenerateXX}}, so a card without its field would render blank).
+
+Note GUIDs are derived from Expression (plus the occurrence number for
+homographs listed more than once), and the note type and deck ids from
+their names, so re-importing a rebuilt package updates the existing notes
+instead of adding duplicates. Every note is stamped with the build time,
+which makes it newer than the copy already in the collection.
+
+The collection is written in Anki's legacy (schema 11) format, which every
+Anki version since 2.1 imports, with all rows bulk-inserted in one
+transaction.
+
+Usage:
+    python build_apkg.py
+    python build_apkg.py --input 26225_Japanese.json --output Japanese.apkg
+    python build_apkg.py --input resources/vocab.store
+    python build_apkg.py --default-generate both --deck "Japanese::Words"
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import zipfile
+
+from convert_to_csv import HEADERS, entry_row, iter_json_array
+from vocab_store import open_store
+
+# Configuration
+INPUT_FILE = '26225_Japanese.csv'
+OUTPUT_FILE = '26225_Japanese.apkg'
+TEMPLATE_DIR = 'src/word/'
+CSS_FILE = 'src/card.css'
+FONT_DIR = 'fonts/'  # Fonts referenced by card.css (optional, bundled as media)
+DECK_NAME = 'Japanese'
+NOTE_TYPE_NAME = 'Japanese Word'
+SORT_FIELD = 'Expression'
+
+# (template name, file prefix, Generate field) in card ord order
+CARD_TEMPLATES = [
+    ('한→일', 'kr2jp', 'GenerateKR2JP'),
+    ('일→한', 'jp2kr', 'GenerateJP2KR'),
+]
+# Generate fields filled in (with GENERATE_VALUE) on rows where both are empty
+DEFAULT_GENERATE = {
+    'none': (),
+    'jp2kr': ('GenerateJP2KR',),
+    'kr2jp': ('GenerateKR2JP',),
+    'both': ('GenerateKR2JP', 'GenerateJP2KR'),
+}
+GENERATE_VALUE = 'Y'  # The templates only test the field for being non-empty
+
+GUID_PREFIX = '26225_Japanese:'  # Namespaces our GUIDs; changing it turns every rebuild into new notes
+ID_BASE = 10 ** 12  # Note/card ids are millisecond-like integers in [ID_BASE, 2 * ID_BASE)
+BASE91 = ('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+          '!#$%&()*+,-./:;<=>?@[]^_`{|}~')
+FIELD_SEPARATOR = '\x1f'
+CSS_URL_RE = re.compile(r"url\(['\"]?([^'\")]+)['\"]?\)")
+HTML_RE = re.compile(r'<[^>]+>')
+
+SCHEMA = """
+CREATE TABLE col (
+    id integer primary key, crt integer not null, mod integer not null, scm integer not null,
+    ver integer not null, dty integer not null, usn integer not null, ls integer not null,
+    conf text not null, models text not null, decks text not null, dconf text not null, tags text not null
+);
+CREATE TABLE notes (
+    id integer primary key, guid text not null, mid integer not null, mod integer not null,
+    usn integer not null, tags text not null, flds text not null, sfld integer not null,
+    csum integer not null, flags integer not null, data text not null
+);
+CREATE TABLE cards (
+    id integer primary key, nid integer not null, did integer not null, ord integer not null,
+    mod integer not null, usn integer not null, type integer not null, queue integer not null,
+    due integer not null, ivl integer not null, factor integer not null, reps integer not null,
+    lapses integer not null, left integer not null, odue integer not null, odid integer not null,
+    flags integer not null, data text not null
+);
+CREATE TABLE revlog (
+    id integer primary key, cid integer not null, usn integer not null, ease integer not null,
+    ivl integer not null, lastIvl integer not null, factor integer not null, time integer not null,
+    type integer not null
+);
+CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+CREATE INDEX ix_notes_usn on notes (usn);
+CREATE INDEX ix_cards_usn on cards (usn);
+CREATE INDEX ix_revlog_usn on revlog (usn);
+CREATE INDEX ix_cards_nid on cards (nid);
+CREATE INDEX ix_cards_sched on cards (did, queue, due);
+CREATE INDEX ix_revlog_cid on revlog (cid);
+CREATE INDEX ix_notes_csum on notes (csum);
+"""
+
+def stable_hash(text):
+    """64-bit integer from SHA-1 of text"""
+    return int.from_bytes(hashlib.sha1(text.encode('utf-8')).digest()[:8], 'big')
+
+def base91(number):
+    """Anki's GUID encoding of a 64-bit integer"""
+    digits = []
+    while number:
+        number, remainder = divmod(number, len(BASE91))
+        digits.append(BASE91[remainder])
+    return ''.join(reversed(digits)) or BASE91[0]
+
+def stable_id(key, used):
+    """Id derived from key, probing forward past ids already taken in this build"""
+    value = ID_BASE + stable_hash(key) % ID_BASE
+    while value in used:
+        value += 1
+    used.add(value)
+    return value
+
+def field_checksum(text):
+    """Anki's duplicate-check checksum of a note's first field"""
+    return int(hashlib.sha1(HTML_RE.sub('', text).strip().encode('utf-8')).hexdigest()[:8], 16)
+
+def read_rows(path):
+    """Rows as lists in HEADERS order, from the CSV (any column order), the JSON word list or a vocab store"""
+    if path.lower().endswith('.store'):
+        with open_store(path) as store:
+            return [list(row) for row in store.iter_rows(HEADERS)]
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [[str(value) for value in entry_row(entry)] for entry in iter_json_array(f)]
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = [header.index(name) if name in header else None for name in HEADERS]
+        return [[row[i] if i is not None and i < len(row) else '' for i in columns] for row in reader]
+
+def load_templates(template_dir, css_file):
+    with open(css_file, 'r', encoding='utf-8') as f:
+        css = f.read()
+    templates = []
+    for ord_, (name, prefix, _) in enumerate(CARD_TEMPLATES):
+        with open(os.path.join(template_dir, f'{prefix}-front.html'), 'r', encoding='utf-8') as f:
+            qfmt = f.read()
+        with open(os.path.join(template_dir, f'{prefix}-back.html'), 'r', encoding='utf-8') as f:
+            afmt = f.read()
+        templates.append({
+            'name': name, 'ord': ord_, 'qfmt': qfmt, 'afmt': afmt,
+            'bqfmt': '', 'bafmt': '', 'did': None, 'bfont': '', 'bsize': 0,
+        })
+    return templates, css
+
+def collect_fonts(css, font_dir):
+    """[(media name, path)] for the url() files of card.css found in font_dir; missing names"""
+    found, missing = [], []
+    for name in dict.fromkeys(CSS_URL_RE.findall(css)):
+        path = os.path.join(font_dir, name)
+        (found if os.path.isfile(path) else missing).append((name, path))
+    return found, [name for name, _ in missing]
+
+def note_type(model_id, deck_id, templates, css, now):
+    generate_index = {name: HEADERS.index(name) for _, _, name in CARD_TEMPLATES}
+    return {
+        'id': model_id,
+        'name': NOTE_TYPE_NAME,
+        'type': 0,
+        'mod': now,
+        'usn': -1,
+        'sortf': HEADERS.index(SORT_FIELD),
+        'did': deck_id,
+        'tmpls': templates,
+        'flds': [{'name': name, 'ord': i, 'sticky': False, 'rtl': False, 'font': 'Arial', 'size': 20, 'media': []}
+                 for i, name in enumerate(HEADERS)],
+        'css': css,
+        'latexPre': ('\\documentclass[12pt]{article}\n\\special{papersize=3in,5in}\n\\usepackage[utf8]{inputenc}\n'
+                     '\\usepackage{amssymb,amsmath}\n\\pagestyle{empty}\n\\setlength{\\parindent}{0in}\n'
+                     '\\begin{document}\n'),
+        'latexPost': '\\end{document}',
+        'latexsvg': False,
+        'req': [[ord_, 'all', [generate_index[generate]]] for ord_, (_, _, generate) in enumerate(CARD_TEMPLATES)],
+        'tags': [],
+        'vers': [],
+    }
+
+def deck(deck_id, name, now):
+    return {
+        'id': deck_id, 'name': name, 'mod': now, 'usn': -1, 'desc': '', 'dyn': 0, 'conf': 1,
+        'collapsed': False, 'browserCollapsed': False, 'extendNew': 0, 'extendRev': 0,
+        'newToday': [0, 0], 'revToday': [0, 0], 'lrnToday': [0, 0], 'timeToday': [0, 0],
+    }
+
+def deck_config(now):
+    return {
+        'id': 1, 'name': 'Default', 'mod': now, 'usn': -1, 'maxTaken': 60, 'autoplay': True, 'timer': 0,
+        'replayq': True, 'dyn': False,
+        'new': {'bury': False, 'delays': [1.0, 10.0], 'initialFactor': 2500, 'ints': [1, 4, 0],
+                'order': 1, 'perDay': 20},
+        'rev': {'bury': False, 'ease4': 1.3, 'ivlFct': 1.0, 'maxIvl': 36500, 'perDay': 200, 'hardFactor': 1.2},
+        'lapse': {'delays': [10.0], 'leechAction': 1, 'leechFails': 8, 'minInt': 1, 'mult': 0.0},
+    }
+
+def frequency_rank(fields):
+    """Sort key putting rows in Frequency order (rows without a numeric Frequency last)"""
+    frequency = fields[HEADERS.index('Frequency')].strip()
+    return int(frequency) if frequency.isdigit() else float('inf')
+
+def apply_default_generate(fields, default_generate):
+    """fields with the DEFAULT_GENERATE fields set when both Generate fields are empty"""
+    generate_indexes = [HEADERS.index(generate) for _, _, generate in CARD_TEMPLATES]
+    if not default_generate or any(fields[i].strip() for i in generate_indexes):
+        return fields
+    fields = list(fields)
+    for generate in DEFAULT_GENERATE[default_generate]:
+        fields[HEADERS.index(generate)] = GENERATE_VALUE
+    return fields
+
+def note_entries(rows, default_generate='jp2kr'):
+    """
+    [(position, GUID key, fields)] for the rows with an Expression, in Frequency order
+
+    The key is Expression, plus '#n' for the n-th homograph by Frequency, so it
+    does not depend on which file (master list or POS split) a row came from.
+    Rows with both Generate fields empty get the default_generate fields set,
+    since the templates only render a card whose Generate field is filled.
+    """
+    expression_index = HEADERS.index('Expression')
+    ordered = sorted(range(len(rows)), key=lambda i: (frequency_rank(rows[i]), i))
+    entries = []
+    seen = {}
+    for i in ordered:
+        fields = rows[i]
+        expression = fields[expression_index].strip()
+        if not expression:
+            continue
+        occurrence = seen[expression] = seen.get(expression, 0) + 1
+        key = expression + (f'#{occurrence}' if occurrence > 1 else '')
+        entries.append((len(entries) + 1, key, apply_default_generate(fields, default_generate)))
+    return entries
+
+def note_guid(key):
+    """Anki GUID of the note with the given note_entries() key"""
+    return base91(stable_hash(GUID_PREFIX + key))
+
+def build_records(entries, model_id, deck_id, now):
+    """(note rows, card rows) for the notes/cards tables; ids and GUIDs are stable across builds"""
+    sort_index = HEADERS.index(SORT_FIELD)
+    generate_indexes = [HEADERS.index(generate) for _, _, generate in CARD_TEMPLATES]
+
+    notes, cards = [], []
+    note_ids, card_ids = set(), set()
+    for position, key, fields in entries:
+        note_id = stable_id('note:' + GUID_PREFIX + key, note_ids)
+        notes.append((note_id, note_guid(key), model_id, now, -1, '', FIELD_SEPARATOR.join(fields),
+                      HTML_RE.sub('', fields[sort_index]).strip(), field_checksum(fields[0]), 0, ''))
+
+        for ord_, generate_index in enumerate(generate_indexes):
+            if fields[generate_index].strip():
+                card_id = stable_id(f'card:{GUID_PREFIX}{key}:{ord_}', card_ids)
+                cards.append((card_id, note_id, deck_id, ord_, now, -1, 0, 0, position,
+                               0, 0, 0, 0, 0, 0, 0, 0, ''))
+    return notes, cards
+
+def write_collection(path, notes, cards, models, decks, dconf, model_id, now):
+    conf = {
+        'nextPos': len(notes) + 1, 'estTimes': True, 'activeDecks': [1], 'sortType': 'noteFld',
+        'timeLim': 0, 'sortBackwards': False, 'addToCur': True, 'curDeck': 1, 'newBury': True,
+        'newSpread': 0, 'dueCounts': True, 'curModel': model_id, 'collapseTime': 1200,
+    }
+    crt = int(time.mktime(time.localtime(now)[:3] + (0, 0, 0, 0, 0, -1)))
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.executescript(SCHEMA)
+        with conn:  # One transaction for everything
+            conn.execute('INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, ?)',
+                         (crt, now * 1000, now * 1000, json.dumps(conf), json.dumps(models, ensure_ascii=False),
+                          json.dumps(decks, ensure_ascii=False), json.dumps(dconf), '{}'))
+            conn.executemany('INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', notes)
+            conn.executemany('INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', cards)
+    finally:
+        conn.close()
+
+def write_package(entries, output_file, deck_name=DECK_NAME, template_dir=TEMPLATE_DIR, css_file=CSS_FILE,
+                  font_dir=FONT_DIR):
+    """Write the notes of note_entries() to output_file; returns (notes, cards, bundled fonts, missing fonts)"""
+    now = int(time.time())
+    model_id = stable_id('model:' + NOTE_TYPE_NAME, set())
+    deck_id = stable_id('deck:' + deck_name, set())
+
+    templates, css = load_templates(template_dir, css_file)
+    fonts, missing = collect_fonts(css, font_dir)
+    notes, cards = build_records(entries, model_id, deck_id, now)
+
+    models = {str(model_id): note_type(model_id, deck_id, templates, css, now)}
+    decks = {'1': deck(1, 'Default', now), str(deck_id): deck(deck_id, deck_name, now)}
+    dconf = {'1': deck_config(now)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collection = os.path.join(tmp, 'collection.anki2')
+        write_collection(collection, notes, cards, models, decks, dconf, model_id, now)
+        with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as package:
+            package.write(collection, 'collection.anki2')
+            for number, (_, path) in enumerate(fonts):
+                package.write(path, str(number))
+            package.writestr('media', json.dumps({str(number): name for number, (name, _) in enumerate(fonts)}))
+    return len(notes), len(cards), [name for name, _ in fonts], missing
+
+def build_package(input_file, output_file, deck_name=DECK_NAME, default_generate='jp2kr', font_dir=FONT_DIR):
+    """Full package of every note in input_file"""
+    return write_package(note_entries(read_rows(input_file), default_generate), output_file, deck_name,
+                         font_dir=font_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an Anki package from the word list')
+    parser.add_argument('--input', default=INPUT_FILE, help='CSV or JSON word list')
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--deck', default=DECK_NAME)
+    parser.add_argument('--default-generate', choices=sorted(DEFAULT_GENERATE), default='jp2kr',
+                        help=f'Generate fields set to {GENERATE_VALUE} on rows where both are empty (default: jp2kr)')
+    parser.add_argument('--fonts', default=FONT_DIR, help='Directory with the fonts card.css references')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Anki Package Builder")
+    print("=" * 60)
+    print(f"Input: {args.input}")
+    print(f"Output: {args.output}")
+
+    started = time.perf_counter()
+    notes, cards, fonts, missing = build_package(args.input, args.output, args.deck,
+                                                 args.default_generate, font_dir=args.fonts)
+    elapsed = time.perf_counter() - started
+
+    if fonts:
+        print(f"[OK] Bundled fonts: {', '.join(fonts)}")
+    if missing:
+        print(f"[WARNING] Fonts not found in {args.fonts}: {', '.join(missing)}")
+    print(f"[OK] {notes:,} notes, {cards:,} cards in deck '{args.deck}' ({elapsed:.2f}s)")
+
+if __name__ == '__main__':
+    main()
@@ -4,16 +4,31 @@
 POS (Part of Speech) classifier for Japanese words
 Uses SudachiPy to classify words by their part of speech
 Handles compound verbs as single words using SudachiPy's C mode
+(--analysis compound also classifies phrases from their whole analysis)
 """
 
+import argparse
 import csv
-from collections import defaultdict
+import os
+import time
+from collections import defaultdict, deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from sudachipy import tokenizer, dictionary
 
+from pos_cache import POS_CACHE_FILE, PosCache, classifier_key
+
 # Input and output configuration
 INPUT_FILE = 'resources/all/26225_Japanese.csv'
 OUTPUT_DIR = 'resources/pos/'
 
+# SudachiPy configuration
+SUDACHI_DICT = 'full'
+SPLIT_MODE_NAME = 'C'  # Longest tokenization mode
+SPLIT_MODE = getattr(tokenizer.Tokenizer.SplitMode, SPLIT_MODE_NAME)
+BATCH_SIZE = 500  # words per batch (per worker task in parallel mode)
+PROGRESS_EVERY = 1000
+
 # POS categories mapping (SudachiPy → simplified categories)
 POS_CATEGORIES = {
     'noun': ['名詞'],
@@ -36,6 +51,20 @@ def get_category(pos_major):
             return category
     return 'others'
 
+def classify_pos(pos):
+    """
+    Map a SudachiPy POS tuple to (category, pos_detail)
+
+    pos is a tuple: (品詞大分類, 品詞中分類, 品詞小分類, 品詞細分類, ...)
+    """
+    pos_major = pos[0] if pos else 'unknown'
+    pos_detail = '-'.join(filter(None, pos[:4]))
+    return get_category(pos_major), pos_detail
+
+def create_tokenizer(dict_name=SUDACHI_DICT):
+    """Load a SudachiPy dictionary and create a tokenizer"""
+    return dictionary.Dictionary(dict=dict_name).create()
+
 def analyze_word(tokenizer_obj, word):
     """
     Analyze word using SudachiPy
@@ -44,93 +73,595 @@ def analyze_word(tokenizer_obj, word):
     Uses SudachiPy C mode for longest tokenization
     This keeps compound verbs (like 思い出す) as single words
     """
-    mode = tokenizer.Tokenizer.SplitMode.C  # Longest tokenization mode
-
     try:
-        tokens = tokenizer_obj.tokenize(word, mode)
+        tokens = tokenizer_obj.tokenize(word, SPLIT_MODE)
 
         if not tokens:
             return 'others', 'unknown'
 
         # Use the first (and usually only) token for single word analysis
-        token = tokens[0]
-        pos = token.part_of_speech()
-
-        # pos is a tuple: (品詞大分類, 品詞中分類, 品詞小分類, 品詞細分類, ...)
-        pos_major = pos[0] if pos else 'unknown'
-        pos_detail = '-'.join(filter(None, pos[:4]))
-
-        category = get_category(pos_major)
-
-        return category, pos_detail
+        return classify_pos(tokens[0].part_of_speech())
 
     except Exception as e:
         print(f"Warning: Failed to analyze '{word}': {e}")
         return 'others', 'error'
 
-def main():
-    print("=" * 60)
-    print("Japanese POS Classifier using SudachiPy")
+def classify_batch(tokenizer_obj, words):
+    """
+    Classify a batch of words; same results as analyze_word() per word
+
+    Reuses one MorphemeList for every word and maps each POS id to its
+    category only once.
+    """
+    results = []
+    morphemes = None
+    by_pos_id = {}
+
+    for word in words:
+        try:
+            if morphemes is None:
+                morphemes = tokenizer_obj.tokenize(word, SPLIT_MODE)
+            else:
+                morphemes = tokenizer_obj.tokenize(word, SPLIT_MODE, out=morphemes)
+
+            if len(morphemes) == 0:
+                results.append(('others', 'unknown'))
+                continue
+
+            token = morphemes[0]
+            pos_id = token.part_of_speech_id()
+            if pos_id not in by_pos_id:
+                by_pos_id[pos_id] = classify_pos(token.part_of_speech())
+            results.append(by_pos_id[pos_id])
+
+        except Exception as e:
+            print(f"Warning: Failed to analyze '{word}': {e}")
+            results.append(('others', 'error'))
+            morphemes = None
+
+    return results
+
+# Compound analysis: head/core tokens of the whole C-mode analysis, A/B/C voting
+ANALYSIS_MODES = ('head', 'compound')
+FUNCTION_POS = {'助詞', '助動詞', '補助記号', '空白'}
+FORM_POS = {'動詞', '助動詞'}  # dictionary form needed for する / だ
+SUFFIX_CATEGORIES = {'名詞的': 'noun', '形状詞的': 'adjective', '動詞的': 'verb', '形容詞的': 'adjective'}
+VOTE_MODES = (tokenizer.Tokenizer.SplitMode.B, tokenizer.Tokenizer.SplitMode.A)
+
+def compound_category(tokens):
+    """
+    Category and label of a whole analysis
+
+    tokens: tuple of (pos, dictionary_form) per morpheme (form is None
+    except for verbs and auxiliaries). The core is the last content token,
+    i.e. not a particle, auxiliary or symbol: 手に入れる -> 入れる.
+
+    Returns: (category, label, core_index)
+    """
+    content = [i for i, (pos, _) in enumerate(tokens) if pos[0] not in FUNCTION_POS]
+    head = tokens[0][0]
+    if not content:
+        return get_category(head[0]), 'function phrase' if len(tokens) > 1 else 'word', 0
+    if len(tokens) > 1 and head[0] == '助詞':
+        return 'particle', 'compound particle', 0  # について, として
+
+    core = content[-1]
+    pos, form = tokens[core]
+    if pos[0] == '動詞' and form == 'する' and core > 0 and tokens[core - 1][0][0] == '名詞':
+        return 'verb', 'suru-verb', core - 1  # 勉強する (core: the noun)
+    if pos[0] == '形状詞':
+        copula = tokens[core + 1][0] if core + 1 < len(tokens) and tokens[core + 1][1] == 'だ' else None
+        if copula is None:
+            return 'adjective', 'na-adjective stem', core
+        if copula[5].startswith('連用形'):
+            return 'adverb', 'adverbial na-adjective', core  # 非常に
+        return 'adjective', 'na-adjective', core  # 静かな
+    if pos[0] == '接尾辞' and core > 0:
+        category = SUFFIX_CATEGORIES.get(pos[1], 'suffix')
+        return category, f'suffixed {category}', core  # 経済的, 一つ
+    if len(tokens) == 1 and pos[0] == '名詞':
+        if pos[2] == 'サ変可能':
+            return 'noun', 'suru-noun', core
+        if pos[2] == '形状詞可能':
+            return 'noun', 'na-capable noun', core
+
+    if len(tokens) == 1:
+        label = 'word'
+    elif len(content) < len(tokens):
+        label = 'phrase'
+    else:
+        label = 'prefixed' if head[0] == '接頭辞' else 'compound'
+    return get_category(pos[0]), label, core
+
+def classify_batch_compound(tokenizer_obj, words):
+    """
+    Classify a batch of words from their whole analysis, not just tokens[0]
+
+    Each word is tokenized once in C mode. Only a core token that has B-mode
+    sub-units is split further, in B then A mode (Morpheme.split, no
+    re-tokenization), and the three analyses vote on the category. A and B
+    must agree to overrule C, so a core without B sub-units keeps C's.
+
+    Returns: list of (category, pos_detail), pos_detail being
+    "<label>:<core token POS>"
+    """
+    results = []
+    morphemes = None
+    splits = [None] * len(VOTE_MODES)  # one reused MorphemeList per split mode
+    pos_by_id = {}  # pos id -> pos
+    units = {}  # word id -> (pos id, dictionary_form or None); OOV word ids encode the pos id
+    by_units = {}  # unit tuple -> (category, pos_detail, core_index)
+
+    def unit(morpheme):
+        pos_id = morpheme.part_of_speech_id()
+        pos = pos_by_id.get(pos_id)
+        if pos is None:
+            pos = pos_by_id[pos_id] = morpheme.part_of_speech()
+        info = units[morpheme.word_id()] = (pos_id, morpheme.dictionary_form() if pos[0] in FORM_POS else None)
+        return info
+
+    def analyze(key):
+        tokens = tuple([(pos_by_id[pos_id], form) for pos_id, form in key])
+        category, label, core = compound_category(tokens)
+        result = by_units[key] = (category, f"{label}:{classify_pos(tokens[core][0])[1]}", core)
+        return result
+
+    def analyze_split(key, core, split):
+        key = key[:core] + tuple([units.get(m.word_id()) or unit(m) for m in split]) + key[core + 1:]
+        return by_units.get(key) or analyze(key)
+
+    for word in words:
+        try:
+            if morphemes is None:
+                morphemes = tokenizer_obj.tokenize(word, SPLIT_MODE)
+            else:
+                morphemes = tokenizer_obj.tokenize(word, SPLIT_MODE, out=morphemes)
+
+            if len(morphemes) == 0:
+                results.append(('others', 'unknown'))
+                continue
+
+            if len(morphemes) == 1:
+                token = morphemes[0]
+                key = (units.get(token.word_id()) or unit(token),)
+            else:
+                key = tuple([units.get(m.word_id()) or unit(m) for m in morphemes])
+            best = by_units.get(key) or analyze(key)
+            core = best[2]
+
+            # B splits are coarser than A: no B sub-units, no vote that can overrule C
+            token = morphemes[core]
+            split_b = splits[0] = token.split(VOTE_MODES[0], out=splits[0])
+            if len(split_b) > 0:
+                split_a = splits[1] = token.split(VOTE_MODES[1], out=splits[1])
+                votes = [analyze_split(key, core, split) for split in (split_b, split_a)]
+                if votes[0][0] == votes[1][0] != best[0]:
+                    best = votes[0]
+
+            results.append(best[:2])
+
+        except Exception as e:
+            print(f"Warning: Failed to analyze '{word}': {e}")
+            results.append(('others', 'error'))
+            morphemes = None
+            splits = [None] * len(VOTE_MODES)
+
+    return results
+
+ANALYZERS = {'head': classify_batch, 'compound': classify_batch_compound}
+
+def analysis_key(analysis):
+    """Cache split_mode key: compound results must not mix with head-token ones"""
+    return SPLIT_MODE_NAME if analysis == 'head' else f'{SPLIT_MODE_NAME}+BA-{analysis}'
+
+# Parallel classification: each worker process loads the dictionary once
+_worker_tokenizer = None
+_worker_analyzer = classify_batch
+
+def _init_worker(dict_name, analysis='head'):
+    global _worker_tokenizer, _worker_analyzer
+    _worker_tokenizer = create_tokenizer(dict_name)
+    _worker_analyzer = ANALYZERS[analysis]
+
+def _classify_chunk(words):
+    return _worker_analyzer(_worker_tokenizer, words)
+
+def iter_classified(batches, workers=1, dict_name=SUDACHI_DICT, tokenizer_obj=None, service=None,
+                    word_of=None, analysis='head'):
+    """
+    Classify an iterable of batches lazily, yielding (batch, results) in input order
+
+    Args:
+        batches: iterable of lists (words, or items mapped to words by word_of)
+        workers: > 1 spreads batches over a process pool (one dictionary
+                 per process, loaded in the pool initializer); at most two
+                 batches per worker are in flight, so memory stays bounded
+        tokenizer_obj: tokenizer for the in-process path (created if None)
+        service: PosClient of a running pos_service.py (no dictionary load here)
+        analysis: 'head' (first C-mode token) or 'compound' (see classify_batch_compound())
+    """
+    word_of = word_of or (lambda item: item)
+
+    if service is not None:
+        for batch in batches:
+            yield batch, service.classify([word_of(item) for item in batch], analysis)
+    elif workers <= 1:
+        tokenizer_obj = tokenizer_obj or create_tokenizer(dict_name)
+        analyzer = ANALYZERS[analysis]
+        for batch in batches:
+            yield batch, analyzer(tokenizer_obj, [word_of(item) for item in batch])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(dict_name, analysis)) as executor:
+            in_flight = deque()
+            for batch in batches:
+                in_flight.append((batch, executor.submit(_classify_chunk, [word_of(item) for item in batch])))
+                if len(in_flight) >= workers * 2:
+                    done_batch, future = in_flight.popleft()
+                    yield done_batch, future.result()
+            while in_flight:
+                done_batch, future = in_flight.popleft()
+                yield done_batch, future.result()
+
+def print_progress(before, after):
+    """Progress indicator: one line per PROGRESS_EVERY words"""
+    for count in range(before // PROGRESS_EVERY + 1, after // PROGRESS_EVERY + 1):
+        print(f"  Processed {count * PROGRESS_EVERY} words...")
+
+def classify_words(words, workers=1, batch_size=BATCH_SIZE, dict_name=SUDACHI_DICT, tokenizer_obj=None, progress=True, service=None,
+                   analysis='head'):
+    """
+    Classify words in batches, results in input order
+
+    Args:
+        words: list of expressions
+        workers, tokenizer_obj, service, analysis: see iter_classified()
+        progress: print a line every PROGRESS_EVERY words
+
+    Returns:
+        list of (category, pos_detail), one per word
+    """
+    chunks = (words[i:i + batch_size] for i in range(0, len(words), batch_size))
+    results = []
+
+    for _, batch_results in iter_classified(chunks, workers, dict_name, tokenizer_obj, service,
+                                            analysis=analysis):
+        before = len(results)
+        results.extend(batch_results)
+        if progress:
+            print_progress(before, len(results))
+
+    return results
+
+def read_pos_file(path):
+    """Rows of an existing POS file, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def write_pos_file(path, headers, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def occurrence_keys(rows):
+    """(Expression, n) per row, n counting the Expression's repeats (the master list has homographs)"""
+    seen = defaultdict(int)
+    keys = []
+    for row in rows:
+        expression = row.get('Expression', '').strip()
+        seen[expression] += 1
+        keys.append((expression, seen[expression]))
+    return keys
+
+def keep_existing_rows(existing, rows):
+    """
+    rows with each one replaced by its current row in the file, if it has one
+
+    Rows match on (Expression, Frequency), then on the Expression's position
+    among its repeats; an existing row is used at most once.
+    """
+    by_frequency = defaultdict(list)
+    by_occurrence = {}
+    for key, row in zip(occurrence_keys(existing), existing):
+        by_frequency[key[0], row.get('Frequency', '').strip()].append(key)
+        by_occurrence[key] = row
+
+    keys = occurrence_keys(rows)
+    matched = []
+    used = set()
+    for key, row in zip(keys, rows):
+        match = next((candidate for candidate in by_frequency.get((key[0], row.get('Frequency', '').strip()), ())
+                      if candidate not in used), None)
+        if match is not None:
+            used.add(match)
+        matched.append(match)
+
+    merged = []
+    for key, match, row in zip(keys, matched, rows):
+        if match is None and key in by_occurrence and key not in used:
+            match = key
+            used.add(key)
+        merged.append(by_occurrence[match] if match is not None else row)
+    return merged
+
+def write_changed_files(rows_by_category, headers):
+    """
+    Rewrite only the POS files whose membership (expressions, in order) changed
+
+    Rows that stay in a rewritten file keep their current content, so
+    meanings scraped into resources/pos/ are not lost.
+
+    Returns:
+        (written, unchanged) file counts
+    """
+    categories = set(rows_by_category)
+    categories |= {c for c in POS_CATEGORIES if os.path.exists(os.path.join(OUTPUT_DIR, f"{c}.csv"))}
+
+    written = unchanged = 0
+    for category in sorted(categories):
+        output_file = os.path.join(OUTPUT_DIR, f"{category}.csv")
+        rows = rows_by_category.get(category, [])
+        existing = read_pos_file(output_file)
+
+        if existing is not None:
+            old_members = [row.get('Expression', '').strip() for row in existing]
+            if old_members == [row['Expression'].strip() for row in rows]:
+                unchanged += 1
+                continue
+            rows = keep_existing_rows(existing, rows)
+
+        write_pos_file(output_file, headers, rows)
+        written += 1
+        print(f"  [OK] {output_file} ({len(rows)} entries)")
+
+    return written, unchanged
+
+class CategoryWriters:
+    """
+    One lazily opened, buffered csv.writer per category
+
+    Rows go to <category>.csv.tmp as they are classified; commit() renames
+    the temp files over the real ones, abort() deletes them.
+    """
+
+    def __init__(self, output_dir, headers, buffer_size=1 << 16):
+        self.output_dir = output_dir
+        self.headers = headers
+        self.buffer_size = buffer_size
+        self.files = {}
+        self.writers = {}
+        self.counts = defaultdict(int)
+
+    def _path(self, category):
+        return os.path.join(self.output_dir, f"{category}.csv")
+
+    def write(self, category, row):
+        writer = self.writers.get(category)
+        if writer is None:
+            f = open(self._path(category) + '.tmp', 'w', encoding='utf-8', newline='',
+                     buffering=self.buffer_size)
+            self.files[category] = f
+            writer = self.writers[category] = csv.writer(f)
+            writer.writerow(self.headers)
+        writer.writerow([row.get(field, '') for field in self.headers])
+        self.counts[category] += 1
+
+    def _close_all(self):
+        for f in self.files.values():
+            f.close()
+
+    def commit(self):
+        for f in self.files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        self._close_all()
+        for category in self.files:
+            os.replace(self._path(category) + '.tmp', self._path(category))
+
+    def abort(self):
+        self._close_all()
+        for category in self.files:
+            try:
+                os.remove(self._path(category) + '.tmp')
+            except OSError:
+                pass
+
+def classify_streaming(input_file, writers_dir, batch_size=BATCH_SIZE, cache=None, key=None, **classifier):
+    """
+    Single pass: read, classify and write rows batch by batch
+
+    Memory stays flat regardless of input size (one batch per worker in
+    flight plus the writer buffers). Output files only replace the old
+    ones once every row is written.
+
+    Returns:
+        dict category -> row count
+    """
+    with open(input_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        writers = CategoryWriters(writers_dir, reader.fieldnames)
+        rows = (row for row in reader if row.get('Expression', '').strip())
+        batches = iter(lambda: list(islice(rows, batch_size)), [])
+        done = 0
+
+        try:
+            for batch, results in iter_classified(batches, word_of=lambda row: row['Expression'].strip(),
+                                                  **classifier):
+                for row, (category, pos_detail) in zip(batch, results):
+                    writers.write(category, row)
+                if cache is not None:
+                    cache.put_many(key, [(row['Expression'].strip(), result)
+                                         for row, result in zip(batch, results) if result[1] != 'error'])
+                print_progress(done, done + len(batch))
+                done += len(batch)
+        except BaseException:
+            writers.abort()
+            raise
+
+        writers.commit()
+    return writers.counts
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Classify Japanese words by part of speech')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Classifier processes (1 = in-process, no pool)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='Words per batch')
+    parser.add_argument('--dict', default=SUDACHI_DICT, choices=['small', 'core', 'full'],
+                        help='SudachiPy dictionary')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Classify only expressions missing from the cache; rewrite only changed POS files')
+    parser.add_argument('--cache-file', default=POS_CACHE_FILE,
+                        help='SQLite classification cache')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Neither read nor update the classification cache')
+    parser.add_argument('--no-service', action='store_true',
+                        help='Do not use a running pos_service.py')
+    parser.add_argument('--analysis', default='head', choices=ANALYSIS_MODES,
+                        help='head: first C-mode token; compound: whole analysis with A/B/C voting '
+                             '(suru-verbs, na-adjectives, phrases)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Single pass: write rows to every POS file as they are classified (flat memory)')
+    args = parser.parse_args()
+    if args.incremental and args.no_cache:
+        parser.error('--incremental needs the classification cache')
+    if args.incremental and args.stream:
+        parser.error('--incremental and --stream cannot be combined')
+    return args
+
+def prepare_classifier(args):
+    """
+    Pick the classifier: a running service, an in-process tokenizer or a pool
+
+    Returns:
+        dict of iter_classified() options, or None if SudachiPy failed to load
+    """
+    # Prefer a running service: its dictionary is already loaded
+    from pos_service import connect_service
+    service = None if args.no_service else connect_service(args.dict)
+
+    # Initialize SudachiPy (worker processes load their own copy)
+    tokenizer_obj = None
+    if service is not None:
+        print(f"[OK] Using pos_service.py ({args.dict.upper()} dictionary already loaded)")
+    elif args.workers <= 1:
+        print("\nInitializing SudachiPy...")
+        try:
+            tokenizer_obj = create_tokenizer(args.dict)
+            print(f"[OK] SudachiPy initialized with {args.dict.upper()} dictionary (C mode for compound words)")
+        except Exception as e:
+            print(f"[ERROR] Failed to initialize SudachiPy: {e}")
+            print("\nPlease install SudachiPy:")
+            print(f"  python -m pip install sudachipy sudachidict_{args.dict}")
+            return None
+    else:
+        print(f"[INFO] Classifying with {args.workers} processes ({args.dict.upper()} dictionary each)")
+
+    return {'workers': args.workers, 'dict_name': args.dict, 'tokenizer_obj': tokenizer_obj, 'service': service,
+            'analysis': args.analysis}
+
+def print_statistics(counts):
+    total_count = sum(counts.values())
+    print("\n" + "=" * 60)
+    print("Classification Results:")
     print("=" * 60)
+    for category in sorted(counts.keys()):
+        count = counts[category]
+        percentage = (count / total_count * 100) if total_count > 0 else 0
+        print(f"  {category:15s}: {count:6d} words ({percentage:5.2f}%)")
+
+def run_streaming(args, cache, key):
+    """--stream: classify and write in one pass (returns False on error)"""
+    classifier = prepare_classifier(args)
+    if classifier is None:
+        return False
 
-    # Initialize SudachiPy
-    print("\nInitializing SudachiPy...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print(f"\nStreaming {INPUT_FILE} -> {OUTPUT_DIR}")
     try:
-        tokenizer_obj = dictionary.Dictionary(dict="full").create()
-        print("[OK] SudachiPy initialized with FULL dictionary (C mode for compound words)")
+        counts = classify_streaming(INPUT_FILE, OUTPUT_DIR, args.batch_size, cache, key, **classifier)
+    except FileNotFoundError:
+        print(f"[ERROR] File not found: {INPUT_FILE}")
+        return False
     except Exception as e:
-        print(f"[ERROR] Failed to initialize SudachiPy: {e}")
-        print("\nPlease install SudachiPy:")
-        print("  python -m pip install sudachipy sudachidict_full")
-        return
+        print(f"[ERROR] Classification failed (POS files left untouched): {e}")
+        return False
+    finally:
+        if classifier['service'] is not None:
+            classifier['service'].close()
+
+    print(f"[OK] Analyzed {sum(counts.values())} words")
+    print_statistics(counts)
+
+    print("\n" + "=" * 60)
+    print("Written CSV files:")
+    print("=" * 60)
+    for category in sorted(counts):
+        print(f"  [OK] {os.path.join(OUTPUT_DIR, f'{category}.csv')} ({counts[category]} entries)")
+
+    return True
 
+def classify_in_memory(args, cache, key):
+    """Default mode: read everything, classify, then write the POS files (returns False on error)"""
     # Read input CSV
     print(f"\nReading {INPUT_FILE}...")
-    rows_by_category = defaultdict(list)
-    total_count = 0
-
     try:
         with open(INPUT_FILE, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             headers = reader.fieldnames
-
-            for row in reader:
-                expression = row.get('Expression', '').strip()
-
-                if not expression:
-                    continue
-
-                # Analyze word
-                category, pos_detail = analyze_word(tokenizer_obj, expression)
-
-                # Add POS info as a comment (not saved in CSV)
-                rows_by_category[category].append(row)
-                total_count += 1
-
-                # Progress indicator
-                if total_count % 1000 == 0:
-                    print(f"  Processed {total_count} words...")
+            rows = [row for row in reader if row.get('Expression', '').strip()]
 
     except FileNotFoundError:
         print(f"[ERROR] File not found: {INPUT_FILE}")
-        return
+        return False
     except Exception as e:
         print(f"[ERROR] Error reading file: {e}")
-        return
+        return False
+
+    words = [row['Expression'].strip() for row in rows]
+
+    known = cache.get_all(key) if args.incremental else {}
+    missing = list(dict.fromkeys(word for word in words if word not in known))
+    if args.incremental:
+        print(f"[INFO] {len(words) - len(missing):,} cached, {len(missing):,} to classify")
+
+    if missing:
+        classifier = prepare_classifier(args)
+        if classifier is None:
+            return False
+
+        # Analyze words
+        try:
+            results = classify_words(missing, batch_size=args.batch_size, **classifier)
+        except Exception as e:
+            print(f"[ERROR] Classification failed: {e}")
+            print("\nPlease install SudachiPy:")
+            print(f"  python -m pip install sudachipy sudachidict_{args.dict}")
+            return False
+        finally:
+            if classifier['service'] is not None:
+                classifier['service'].close()
+
+        classified = list(zip(missing, results))
+        known.update(classified)
+        if cache is not None:
+            # Analysis errors are not cached; they are retried next run
+            cache.put_many(key, [(word, result) for word, result in classified if result[1] != 'error'])
+
+    rows_by_category = defaultdict(list)
+    for row, word in zip(rows, words):
+        category, pos_detail = known[word]
+        rows_by_category[category].append(row)
+    total_count = len(rows)
 
     print(f"[OK] Analyzed {total_count} words")
 
-    # Print statistics
-    print("\n" + "=" * 60)
-    print("Classification Results:")
-    print("=" * 60)
-    for category in sorted(rows_by_category.keys()):
-        count = len(rows_by_category[category])
-        percentage = (count / total_count * 100) if total_count > 0 else 0
-        print(f"  {category:15s}: {count:6d} words ({percentage:5.2f}%)")
+    print_statistics({category: len(rows) for category, rows in rows_by_category.items()})
 
     # Create output directory
-    import os
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # Write CSV files by category
@@ -138,18 +669,42 @@ def main():
     print("Writing CSV files:")
     print("=" * 60)
 
-    for category, rows in sorted(rows_by_category.items()):
-        output_file = os.path.join(OUTPUT_DIR, f"{category}.csv")
+    if args.incremental:
+        written, unchanged = write_changed_files(rows_by_category, headers)
+        print(f"  [INFO] {written} files rewritten, {unchanged} unchanged")
+    else:
+        for category, rows in sorted(rows_by_category.items()):
+            output_file = os.path.join(OUTPUT_DIR, f"{category}.csv")
+            write_pos_file(output_file, headers, rows)
+            print(f"  [OK] {output_file} ({len(rows)} entries)")
 
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(rows)
+    return True
 
-        print(f"  [OK] {output_file} ({len(rows)} entries)")
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+
+    print("=" * 60)
+    print("Japanese POS Classifier using SudachiPy")
+    print("=" * 60)
+
+    # Cached results (computing the key does not load the dictionary)
+    cache = None if args.no_cache else PosCache(args.cache_file)
+    key = classifier_key(args.dict, analysis_key(args.analysis))
+
+    try:
+        if args.stream:
+            ok = run_streaming(args, cache, key)
+        else:
+            ok = classify_in_memory(args, cache, key)
+    finally:
+        if cache is not None:
+            cache.close()
+    if not ok:
+        return
 
     print("\n" + "=" * 60)
-    print("Classification complete!")
+    print(f"Classification complete! ({time.perf_counter() - started:.2f}s)")
     print("=" * 60)
 
 if __name__ == '__main__':
@@ -3,14 +3,20 @@
 """
 JSON to CSV converter for Anki import
 Converts 26225_Japanese.json to Anki-compatible CSV format
+
+The top-level JSON array is decoded one entry at a time from fixed-size
+chunks, so memory stays flat no matter how many entries the file holds.
 """
 
-import json
+import argparse
 import csv
+import json
 
 # Input and output files
 INPUT_FILE = '26225_Japanese.json'
 OUTPUT_FILE = '26225_Japanese.csv'
+READ_CHUNK = 1 << 16  # characters per read
+WRITE_BUFFER = 1 << 20  # bytes
 
 # Anki field headers (matching PLAN.md)
 HEADERS = [
@@ -30,44 +36,99 @@ HEADERS = [
     'IMM_SourceMedia'
 ]
 
+# Columns filled from the JSON entry; the rest start empty
+JSON_FIELDS = ('Frequency', 'Expression', 'Reading', 'Meaning')
+EMPTY_COLUMNS = [''] * (len(HEADERS) - len(JSON_FIELDS))
+assert HEADERS[:len(JSON_FIELDS)] == list(JSON_FIELDS)
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = WHITESPACE + ',]'
+
+def iter_json_array(f, chunk_size=READ_CHUNK):
+    """
+    Yield the elements of a top-level JSON array without loading the whole file
+
+    Each element is decoded with JSONDecoder.raw_decode from a buffer that
+    only holds the current element plus one chunk of read-ahead.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = 0
+    eof = not buf
+
+    def skip(chars):
+        nonlocal pos
+        while pos < len(buf) and buf[pos] in chars:
+            pos += 1
+
+    def fill():
+        """Append the next chunk to the unconsumed part of the buffer; False at EOF"""
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    skip(WHITESPACE + '\ufeff')
+    while pos >= len(buf) and fill():
+        skip(WHITESPACE + '\ufeff')
+    if pos >= len(buf) or buf[pos] != '[':
+        raise ValueError('expected a top-level JSON array')
+    pos += 1
+
+    first = True
+    while True:
+        skip(WHITESPACE if first else WHITESPACE + ',')
+        if pos >= len(buf):
+            if fill():
+                continue
+            raise ValueError('unterminated JSON array')
+        if buf[pos] == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if fill():
+                continue  # Element spans the chunk boundary
+            raise
+        if not eof and (end == len(buf) or buf[end] not in DELIMITERS) and fill():
+            continue  # A number may continue in the next chunk ("-1" of "-1.5")
+        pos = end
+        first = False
+        yield value
+
+def entry_row(entry):
+    """CSV row (in HEADERS order) for one JSON entry"""
+    get = entry.get
+    return [get(field, '') for field in JSON_FIELDS] + EMPTY_COLUMNS
+
+def convert(input_file, output_file, chunk_size=READ_CHUNK):
+    """Stream input_file (JSON array) into output_file (CSV); returns the row count"""
+    count = 0
+    with open(input_file, 'r', encoding='utf-8') as src, \
+            open(output_file, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER) as dst:
+        writer = csv.writer(dst)
+        writer.writerow(HEADERS)
+        for entry in iter_json_array(src, chunk_size):
+            writer.writerow(entry_row(entry))
+            count += 1
+    return count
+
 def main():
-    # Read JSON file
-    print(f'Reading {INPUT_FILE}...')
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f'Found {len(data)} entries')
-
-    # Write CSV file
-    print(f'Writing {OUTPUT_FILE}...')
-    with open(OUTPUT_FILE, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=HEADERS, extrasaction='ignore')
-
-        # Write header
-        writer.writeheader()
-
-        # Write rows
-        for entry in data:
-            # Create row with all fields
-            row = {
-                'Frequency': entry.get('Frequency', ''),
-                'Expression': entry.get('Expression', ''),
-                'Reading': entry.get('Reading', ''),
-                'Meaning': entry.get('Meaning', ''),
-                'MeaningCount': '',
-                'Exclude1': '',
-                'Exclude2': '',
-                'GenerateKR2JP': '',
-                'GenerateJP2KR': '',
-                'Image': '',
-                'IMM_Sentence': '',
-                'IMM_Image': '',
-                'IMM_Audio': '',
-                'IMM_SourceMedia': ''
-            }
-            writer.writerow(row)
-
-    print(f'Successfully converted {len(data)} entries to {OUTPUT_FILE}')
+    parser = argparse.ArgumentParser(description='Convert the JSON word list to an Anki CSV')
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    print(f'Reading {args.input}...')
+    print(f'Writing {args.output}...')
+    count = convert(args.input, args.output)
+
+    print(f'Successfully converted {count} entries to {args.output}')
     print(f'File encoding: UTF-8')
 
 if __name__ == '__main__':
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental deck sync: emit only the notes that changed since the last build
+
+Keeps a state file with one content hash per note, keyed on the note's
+Anki GUID key (Expression, plus '#n' for the n-th homograph by Frequency),
+from the previous run. The current word list (the master CSV or the
+resources/pos/*.csv splits) is hashed and diffed against it in one pass:
+
+    added     GUID not in the previous state
+    changed   same GUID, different content (including a homograph whose
+              '#n' now points at another row after a Frequency change)
+    deleted   GUID gone from the current list
+
+Notes are hashed as they are written, after --default-generate (same as
+build_apkg.py) has filled their Generate fields, so changing the default
+shows up as changed notes. Added and changed notes are written as a delta
+CSV and, with --package, as a delta .apkg using build_apkg.py's stable
+GUIDs, so Anki updates the existing notes. Anki imports never delete, so
+deleted notes are listed in a separate CSV (with their GUIDs) to be
+removed by hand.
+
+Usage:
+    python deck_delta.py --baseline            # Record the state of a full build
+    python deck_delta.py                       # Delta against the recorded state
+    python deck_delta.py --input "resources/pos/*.csv" --package
+    python deck_delta.py --dry-run
+    python deck_delta.py --default-generate both --package
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import time
+
+from build_apkg import DEFAULT_GENERATE, FIELD_SEPARATOR, note_entries, note_guid, read_rows, write_package
+from convert_to_csv import HEADERS
+
+# Configuration
+INPUT_FILES = ['26225_Japanese.csv']
+STATE_FILE = 'deck_state.json'
+DELTA_CSV = '26225_Japanese.delta.csv'
+DELETED_CSV = '26225_Japanese.deleted.csv'
+DELTA_PACKAGE = '26225_Japanese.delta.apkg'
+STATE_VERSION = 2
+
+EXPRESSION = HEADERS.index('Expression')
+FREQUENCY = HEADERS.index('Frequency')
+
+def state_key(fields):
+    return f"{fields[EXPRESSION].strip()}\t{fields[FREQUENCY].strip()}"
+
+def content_hash(fields):
+    return hashlib.blake2b(FIELD_SEPARATOR.join(fields).encode('utf-8'), digest_size=8).hexdigest()
+
+def expand_inputs(patterns):
+    """Input paths, with glob patterns expanded"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"No input matches {pattern}")
+        paths.extend(matches)
+    return paths
+
+def load_state(path):
+    """{GUID key: (content hash, state key)} of the previous run, or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('fields') != HEADERS:
+        return {}  # Different layout: every note counts as added
+    if state.get('version') == 1:
+        # Version 1 was keyed on Expression + Frequency: {state key: (hash, GUID key)}
+        return {guid_key: (digest, key) for key, (digest, guid_key) in state['notes'].items()}
+    if state.get('version') != STATE_VERSION:
+        return {}
+    return {guid_key: tuple(value) for guid_key, value in state['notes'].items()}
+
+def save_state(path, current):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': STATE_VERSION, 'fields': HEADERS, 'notes': current}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def diff(entries, previous):
+    """
+    (added, changed, deleted, current state) for note_entries() against the previous state
+
+    Notes are compared by GUID key, since that is what Anki matches on. When
+    a homograph changes Frequency its siblings' '#n' keys shift, so the same
+    GUID now holds another row: its content hash differs and it is changed.
+
+    added/changed are note_entries() tuples; deleted is [(state key, GUID key)].
+    """
+    previous = dict(previous)
+    current = {}
+    added, changed = [], []
+    for entry in entries:
+        guid_key, fields = entry[1], entry[2]
+        digest = content_hash(fields)
+        current[guid_key] = (digest, state_key(fields))
+        old = previous.pop(guid_key, None)
+        if old is None:
+            added.append(entry)
+        elif old[0] != digest:
+            changed.append(entry)
+
+    deleted = [(key, guid_key) for guid_key, (_, key) in previous.items()]
+    return added, changed, deleted, current
+
+def write_delta_csv(path, entries):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(fields for _, _, fields in entries)
+
+def write_deleted_csv(path, deleted):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Expression', 'Frequency', 'GUID'])
+        for key, guid_key in deleted:
+            expression, frequency = key.split('\t')
+            writer.writerow([expression, frequency, note_guid(guid_key)])
+
+def main():
+    parser = argparse.ArgumentParser(description='Emit only the notes changed since the last build')
+    parser.add_argument('--input', action='append', help='CSV/JSON word list or glob (repeatable)')
+    parser.add_argument('--state', default=STATE_FILE)
+    parser.add_argument('--output', default=DELTA_CSV, help='Delta CSV of added and changed notes')
+    parser.add_argument('--deleted', default=DELETED_CSV, help='CSV of deleted notes')
+    parser.add_argument('--package', nargs='?', const=DELTA_PACKAGE, help='Also write a delta .apkg')
+    parser.add_argument('--deck', default=None, help='Deck name for --package')
+    parser.add_argument('--default-generate', choices=sorted(DEFAULT_GENERATE), default='jp2kr',
+                        help='Generate fields filled on rows where both are empty (as in build_apkg.py)')
+    parser.add_argument('--baseline', action='store_true', help='Only record the current state')
+    parser.add_argument('--dry-run', action='store_true', help='Report the delta without writing anything')
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.input or INPUT_FILES)
+
+    print("=" * 60)
+    print("Deck Delta")
+    print("=" * 60)
+    print(f"Input: {', '.join(paths)}")
+
+    started = time.perf_counter()
+    rows = [row for path in paths for row in read_rows(path)]
+    entries = note_entries(rows, args.default_generate)
+    previous = load_state(args.state)
+    if previous is None:
+        print(f"[INFO] No state at {args.state}: every note counts as added")
+    added, changed, deleted, current = diff(entries, previous or {})
+    elapsed = time.perf_counter() - started
+
+    print(f"[OK] {len(entries):,} notes hashed in {elapsed:.2f}s")
+    print(f"  Added:   {len(added):,}")
+    print(f"  Changed: {len(changed):,}")
+    print(f"  Deleted: {len(deleted):,}")
+
+    if args.dry_run:
+        return
+    if not args.baseline:
+        delta = sorted(added + changed)
+        write_delta_csv(args.output, delta)
+        print(f"[OK] Delta CSV: {args.output} ({len(delta):,} notes)")
+        if deleted:
+            write_deleted_csv(args.deleted, deleted)
+            print(f"[WARNING] Anki imports do not delete notes; remove the ones in {args.deleted}")
+        if args.package:
+            deck_args = (args.deck,) if args.deck else ()
+            notes, cards, _, _ = write_package(delta, args.package, *deck_args)
+            print(f"[OK] Delta package: {args.package} ({notes:,} notes, {cards:,} cards)")
+    save_state(args.state, current)
+    print(f"[OK] State saved: {args.state}")
+
+if __name__ == '__main__':
+    main()
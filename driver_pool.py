@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Long-lived WebDriver pool for the Selenium backend
+
+- Resolves the chromedriver binary once and pre-warms N browsers
+- Hands out a browser per lookup (checkout/checkin)
+- Recycles a browser after MAX_PAGES_PER_DRIVER pages or when its memory
+  (RSS of Chrome + children, needs psutil) exceeds MAX_RSS_MB
+- Replaces dead sessions transparently and retries the lookup once
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from naver_fetcher import create_driver
+from latency_stats import percentile
+
+# Configuration
+MAX_PAGES_PER_DRIVER = 200  # Recycle a browser after this many lookups
+MAX_RSS_MB = 800  # Recycle a browser above this memory use (0 = disabled)
+RSS_CHECK_EVERY = 10  # pages between memory checks
+
+class DriverPool:
+    """Thread-safe pool of pre-warmed Chrome drivers"""
+
+    def __init__(self, size, max_pages=MAX_PAGES_PER_DRIVER, max_rss_mb=MAX_RSS_MB):
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.idle = queue.Queue()
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.latencies = []
+
+        self.checkouts = 0
+        self.recycles = 0
+        self.crash_replacements = 0
+
+        # Resolve the chromedriver binary once for every browser
+        print("[INFO] Resolving chromedriver...")
+        self.driver_path = ChromeDriverManager().install()
+
+        # Pre-warm browsers in parallel
+        print(f"[INFO] Starting {size} browsers...")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            for driver in executor.map(lambda _: self._new_driver(), range(size)):
+                self.idle.put(driver)
+        print(f"[OK] Driver pool ready in {time.perf_counter() - started:.1f}s")
+
+    def _new_driver(self):
+        driver = create_driver(self.driver_path)
+        with self.lock:
+            self.pages[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self.lock:
+            self.pages.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        """Cheap health check: does the session still answer?"""
+        try:
+            driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _rss_mb(driver):
+        """Memory of the browser process tree in MB (None without psutil)"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / 1024 / 1024
+        except Exception:
+            return None
+
+    def checkout(self):
+        driver = self.idle.get()
+        with self.lock:
+            self.checkouts += 1
+        return driver
+
+    def checkin(self, driver):
+        """Return a driver, recycling it first if it is worn out"""
+        with self.lock:
+            self.pages[driver] = pages = self.pages.get(driver, 0) + 1
+
+        recycle = pages >= self.max_pages
+        if not recycle and self.max_rss_mb and pages % RSS_CHECK_EVERY == 0:
+            rss = self._rss_mb(driver)
+            recycle = rss is not None and rss > self.max_rss_mb
+
+        if recycle:
+            self._discard(driver)
+            with self.lock:
+                self.recycles += 1
+            try:
+                driver = self._new_driver()
+            except Exception as e:
+                # Keep the slot: the quit driver fails its health check on the
+                # next lookup and gets replaced then
+                print(f"[WARNING] Could not restart browser: {e}")
+
+        self.idle.put(driver)
+
+    def lookup(self, word, scrape):
+        """
+        Run scrape(driver, word) on a pooled driver
+
+        A None result from a dead session triggers one transparent retry
+        on a fresh browser.
+        """
+        driver = self.checkout()
+        started = time.perf_counter()
+        try:
+            meaning = scrape(driver, word)
+            if meaning is None and not self._is_alive(driver):
+                self._discard(driver)
+                driver = self._new_driver()
+                with self.lock:
+                    self.crash_replacements += 1
+                meaning = scrape(driver, word)
+            return meaning
+        finally:
+            with self.lock:
+                self.latencies.append(time.perf_counter() - started)
+            self.checkin(driver)
+
+    def report(self):
+        values = sorted(self.latencies)
+        print(f"\n[INFO] Driver pool: {self.size} browsers, {self.checkouts} checkouts, "
+              f"{self.recycles} recycles, {self.crash_replacements} crash replacements")
+        if values:
+            print(f"  Lookup p50 {percentile(values, 50)*1000:.0f}ms  p95 {percentile(values, 95)*1000:.0f}ms")
+
+    def close(self):
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
@@ -0,0 +1,352 @@
+"""
+JPDB Frequency Addon - Compiled Frequency Index
+
+JPDB.txt is compiled once into a memory-mapped index: a sorted UTF-8
+string table with an offset array, plus an int32 rank array. Lookups are a
+binary search over the mapped file, so opening the index costs milliseconds
+and no Python dict of every word is built.
+
+A second table of the same shape maps normalized keys (see normalize.py)
+to the best rank of the words sharing them; lookup() falls back to it,
+then to deinflected candidates, when a word is not in JPDB.txt verbatim.
+
+The index stores the source files' mtime, size and SHA-1 plus a digest of
+the build settings (merge policy, see freq_sources.py). It is reused while
+mtime, size and settings match, re-stamped if only the mtime changed but
+the content did not, and rebuilt otherwise.
+
+This module does not import aqt, so it can be used and tested outside Anki:
+    python freq_index.py JPDB.txt [word ...]
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+
+try:
+    from .normalize import NORMALIZER_VERSION, deinflect, normalize
+except ImportError:  # Run as a script
+    from normalize import NORMALIZER_VERSION, deinflect, normalize
+
+
+INDEX_MAGIC = b'JPDBIDX3'
+BYTE_ORDER_MARK = 0x01020304  # Written natively; a mismatch means a foreign index
+# magic, byte order mark, normalizer version, source mtime (ns), source size, source SHA-1,
+# settings SHA-1, then (entry count, heap size) of the word table and of the normalized-key table
+HEADER = struct.Struct('=8sIIqq20s20sIQIQ')
+FENCE_STEP = 32  # keys per binary-search block kept in memory as one fence key
+
+
+def file_sha1(path):
+    """SHA-1 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def source_stamp(paths):
+    """(mtime_ns, size) summed over the source files."""
+    stats = [os.stat(path) for path in paths]
+    return sum(st.st_mtime_ns for st in stats), sum(st.st_size for st in stats)
+
+
+def sources_sha1(paths):
+    """SHA-1 of one source file, or of the concatenated digests of several."""
+    if len(paths) == 1:
+        return file_sha1(paths[0])
+    return hashlib.sha1(b''.join(file_sha1(path) for path in paths)).digest()
+
+
+class RankMap(dict):
+    """{word: rank}, plus the number of source lines that had no usable rank."""
+    skipped = 0
+
+
+def parse_frequency_file(path):
+    """
+    Read JPDB.txt into a RankMap.
+
+    Lines are "word<TAB>rank"; the first occurrence of a word wins (higher
+    rank). Non-blank lines without a tab or whose rank is not an integer
+    are skipped and counted in RankMap.skipped.
+    """
+    ranks = RankMap()
+    skipped = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.strip().split('\t')
+            if len(parts) < 2:
+                skipped += bool(parts[0])
+                continue
+            if parts[0] in ranks:
+                continue
+            try:
+                ranks[parts[0]] = int(parts[1])
+            except ValueError:
+                skipped += 1
+    ranks.skipped = skipped
+    return ranks
+
+
+def normalized_ranks(ranks):
+    """Best (lowest) rank per normalized key, for keys that differ from the word itself."""
+    best = {}
+    for word, rank in ranks.items():
+        key = normalize(word)
+        if key != word and (key not in best or rank < best[key]):
+            best[key] = rank
+    return best
+
+
+def table_size(count, heap_size):
+    """Bytes of one table: offsets, ranks and the heap padded to 4 bytes."""
+    return (count + 1) * 4 + count * 4 + (heap_size + 3) // 4 * 4
+
+
+def encode_table(ranks):
+    """(count, heap size, bytes) of a sorted string table for {word: rank}."""
+    entries = sorted((word.encode('utf-8'), rank) for word, rank in ranks.items())
+    keys = [key for key, _ in entries]
+    rank_array = array('i', [rank for _, rank in entries])
+    offsets = array('I', [0])
+    heap_size = 0
+    for key in keys:
+        heap_size += len(key)
+        offsets.append(heap_size)
+
+    heap = b''.join(keys)
+    data = offsets.tobytes() + rank_array.tobytes() + heap + b'\0' * (-len(heap) % 4)
+    return len(keys), heap_size, data
+
+
+def build_index(source_paths, index_path, ranks, settings=b''):
+    """Compile {word: rank} read from source_paths into index_path (temp file, then renamed)."""
+    mtime_ns, size = source_stamp(source_paths)
+    sha1 = sources_sha1(source_paths)
+    settings_sha1 = hashlib.sha1(settings).digest()
+
+    word_count, word_heap, word_table = encode_table(ranks)
+    key_count, key_heap, key_table = encode_table(normalized_ranks(ranks))
+
+    os.makedirs(os.path.dirname(index_path) or '.', exist_ok=True)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, BYTE_ORDER_MARK, NORMALIZER_VERSION, mtime_ns, size, sha1,
+                            settings_sha1, word_count, word_heap, key_count, key_heap))
+        f.write(word_table)
+        f.write(key_table)
+    os.replace(tmp_path, index_path)
+    return word_count
+
+
+def read_header(index_path):
+    """Header fields of an index file, or None if missing, stale or not a valid index."""
+    try:
+        with open(index_path, 'rb') as f:
+            data = f.read(HEADER.size)
+            file_size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+    if len(data) != HEADER.size:
+        return None
+
+    (magic, bom, version, mtime_ns, size, sha1, settings_sha1,
+     word_count, word_heap, key_count, key_heap) = HEADER.unpack(data)
+    if magic != INDEX_MAGIC or bom != BYTE_ORDER_MARK or version != NORMALIZER_VERSION:
+        return None
+    if file_size != HEADER.size + table_size(word_count, word_heap) + table_size(key_count, key_heap):
+        return None  # Truncated
+    return mtime_ns, size, sha1, settings_sha1
+
+
+def restamp_index(index_path, mtime_ns, size):
+    """Record a new source mtime/size in an index whose content is still current."""
+    with open(index_path, 'r+b') as f:
+        fields = list(HEADER.unpack(f.read(HEADER.size)))
+        fields[3], fields[4] = mtime_ns, size
+        f.seek(0)
+        f.write(HEADER.pack(*fields))
+
+
+class SortedTable:
+    """
+    One mapped table: binary search over a sorted UTF-8 string heap.
+
+    Every FENCE_STEP-th key is copied into a small in-memory list, so
+    bisect (in C) picks the block and only the last few probes touch the map.
+    """
+
+    def __init__(self, mm, view, start, count, heap_size):
+        ranks_start = start + (count + 1) * 4
+        self.heap_start = ranks_start + count * 4
+        self.end = start + table_size(count, heap_size)
+        self.offsets = view[start:ranks_start].cast('I')
+        self.ranks = view[ranks_start:self.heap_start].cast('i')
+        self.count = count
+
+        offsets, heap = self.offsets, self.heap_start
+        self.fences = [mm[heap + offsets[i]:heap + offsets[i + 1]] for i in range(0, count, FENCE_STEP)]
+
+    def find(self, mm, key):
+        """Rank of key (UTF-8 bytes), or None."""
+        block = bisect_right(self.fences, key) - 1
+        if block < 0:
+            return None
+        offsets, heap = self.offsets, self.heap_start
+        lo = block * FENCE_STEP
+        hi = min(lo + FENCE_STEP, self.count)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = mm[heap + offsets[mid]:heap + offsets[mid + 1]]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return self.ranks[mid]
+        return None
+
+    def release(self):
+        self.offsets.release()
+        self.ranks.release()
+
+
+class FrequencyIndex:
+    """Read-only, memory-mapped word -> rank lookup."""
+
+    skipped = 0  # Source lines dropped when open_index() built this index (0 when reused)
+
+    def __init__(self, index_path):
+        with open(index_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        fields = HEADER.unpack_from(self._mm)
+        self._view = memoryview(self._mm)
+        self._words = SortedTable(self._mm, self._view, HEADER.size, fields[7], fields[8])
+        self._keys = SortedTable(self._mm, self._view, self._words.end, fields[9], fields[10])
+
+    def __len__(self):
+        return self._words.count
+
+    def get(self, word, default=None):
+        """Rank of word as a string (like the JPDB.txt column), or default."""
+        rank = self._words.find(self._mm, word.encode('utf-8'))
+        return str(rank) if rank is not None else default
+
+    def __contains__(self, word):
+        return self._words.find(self._mm, word.encode('utf-8')) is not None
+
+    def _find_normalized(self, key):
+        """Best rank of the words normalizing to key (including key itself), or None."""
+        encoded = key.encode('utf-8')
+        ranks = [rank for rank in (self._words.find(self._mm, encoded), self._keys.find(self._mm, encoded))
+                 if rank is not None]
+        return min(ranks) if ranks else None
+
+    def lookup(self, word):
+        """
+        Rank of word, falling back to its normalized key and then to deinflected forms.
+
+        Returns:
+            (rank string, 'exact' | 'normalized' | 'deinflected'), or (None, None)
+        """
+        rank = self.get(word)
+        if rank is not None:
+            return rank, 'exact'
+
+        key = normalize(word)
+        rank = self._find_normalized(key)
+        if rank is not None:
+            return str(rank), 'normalized'
+
+        for candidate in deinflect(key):
+            rank = self._find_normalized(candidate)
+            if rank is not None:
+                return str(rank), 'deinflected'
+        return None, None
+
+    def close(self):
+        """Release the mapping (required before the index file can be replaced on Windows)."""
+        if self._mm is None:
+            return
+        self._words.release()
+        self._keys.release()
+        self._view.release()
+        self._mm.close()
+        self._mm = None
+
+
+def open_index(source_paths, index_path, load_ranks=None, settings=b''):
+    """
+    Open the compiled index for the source file(s), building it first if needed.
+
+    Args:
+        source_paths: JPDB.txt path, or a list of source files
+        load_ranks: () -> {word: rank}, called only to (re)build; default
+                    parses the single JPDB.txt. A RankMap's skipped count
+                    ends up in the returned index's skipped attribute
+        settings: bytes describing how ranks are built; a change rebuilds
+
+    Returns:
+        (FrequencyIndex, status) where status is 'cached', 'restamped' or 'built'
+    """
+    if isinstance(source_paths, str):
+        source_paths = [source_paths]
+    mtime_ns, size = source_stamp(source_paths)
+    header = read_header(index_path)
+    if header is not None and header[3] != hashlib.sha1(settings).digest():
+        header = None
+
+    if header is not None and header[:2] == (mtime_ns, size):
+        status = 'cached'
+    elif header is not None and header[2] == sources_sha1(source_paths):
+        restamp_index(index_path, mtime_ns, size)
+        status = 'restamped'
+    else:
+        ranks = load_ranks() if load_ranks is not None else parse_frequency_file(source_paths[0])
+        build_index(source_paths, index_path, ranks, settings)
+        status = 'built'
+
+    index = FrequencyIndex(index_path)
+    if status == 'built':
+        index.skipped = getattr(ranks, 'skipped', 0)
+    return index, status
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python freq_index.py JPDB.txt [word ...]")
+        return
+
+    source_path = sys.argv[1]
+    index_path = os.path.splitext(source_path)[0] + '.idx'
+
+    started = time.perf_counter()
+    index, status = open_index(source_path, index_path)
+    print(f"Index {status}: {len(index):,} words in {(time.perf_counter() - started) * 1000:.1f} ms ({index_path})")
+    if index.skipped:
+        print(f"Skipped {index.skipped:,} lines without an integer rank")
+    index.close()
+
+    started = time.perf_counter()
+    index, status = open_index(source_path, index_path)
+    print(f"Reopen ({status}): {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    started = time.perf_counter()
+    parse_frequency_file(source_path)
+    print(f"Parsing JPDB.txt into a dict (previous behaviour): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    for word in sys.argv[2:]:
+        rank, how = index.lookup(word)
+        print(f"  {word}: {rank} ({how})" if rank is not None else f"  {word}: not found")
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
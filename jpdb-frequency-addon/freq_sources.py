@@ -0,0 +1,286 @@
+"""
+JPDB Frequency Addon - Multiple Frequency Sources
+
+Reads several frequency lists (JPDB.txt-style TSV, Yomitan term_meta_bank
+zips, CSV) into one FrequencyStore: a sorted table of interned words and
+an int32 rank matrix with one column per source (0 = not in that source).
+A merge policy turns each row into one rank, evaluated over the whole
+matrix at once:
+
+    min        best rank in any source
+    harmonic   weighted harmonic mean of the available ranks
+    first      rank from the first source (in config order) that has the word
+
+NumPy is used when it is importable (it is not bundled with Anki); the
+fallback keeps one array('i') per source and merges row by row.
+
+open_store() keeps the store in a file next to the compiled index, keyed
+on the source files' mtime and size and on how they are read (not on the
+policy or weights), so a policy or weight change re-merges it without
+re-parsing any source.
+
+This module does not import aqt.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import struct
+import sys
+import zipfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .freq_index import BYTE_ORDER_MARK, RankMap, parse_frequency_file, source_stamp
+except ImportError:  # Run as a script
+    from freq_index import BYTE_ORDER_MARK, RankMap, parse_frequency_file, source_stamp
+
+
+MERGE_POLICIES = ('min', 'harmonic', 'first')
+SOURCE_FORMATS = ('tsv', 'yomitan', 'csv')
+MISSING = 0  # Rank of a word a source does not list
+
+STORE_MAGIC = b'JPFSTOR1'
+# magic, byte order mark, source mtime (ns), source size, read settings SHA-1, word count,
+# source count, word heap size; then the NUL-separated word heap (padded to 4 bytes) and
+# one int32 rank column per source
+STORE_HEADER = struct.Struct('=8sIqq20sIIQ')
+
+
+def read_yomitan(path):
+    """{term: best rank} from the term_meta_bank_*.json files of a Yomitan dictionary zip."""
+    ranks = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if not os.path.basename(name).startswith('term_meta_bank_'):
+                continue
+            for entry in json.loads(archive.read(name).decode('utf-8')):
+                if len(entry) < 3 or entry[1] != 'freq':
+                    continue
+                rank = yomitan_rank(entry[2])
+                if rank is not None and rank > 0 and (entry[0] not in ranks or rank < ranks[entry[0]]):
+                    ranks[entry[0]] = rank
+    return ranks
+
+
+def yomitan_rank(data):
+    """Integer rank of a term_meta 'freq' payload, or None."""
+    if isinstance(data, dict):
+        data = data.get('frequency', data.get('value'))
+        if isinstance(data, dict):
+            data = data.get('value')
+    if isinstance(data, (int, float)):
+        return int(data)
+    if isinstance(data, str) and data.strip().isdigit():
+        return int(data)
+    return None
+
+
+def read_csv(path, word_column='Expression', rank_column='Frequency'):
+    """{word: rank} from a CSV with a header row; first occurrence wins."""
+    ranks = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            word = (row.get(word_column) or '').strip()
+            if not word or word in ranks:
+                continue
+            try:
+                ranks[word] = int(row.get(rank_column) or '')
+            except ValueError:
+                continue
+    return ranks
+
+
+def source_format(source):
+    """Configured format of a source, or a guess from its file extension."""
+    fmt = source.get('format')
+    if fmt:
+        return fmt
+    extension = os.path.splitext(source['path'])[1].lower()
+    return {'.zip': 'yomitan', '.csv': 'csv'}.get(extension, 'tsv')
+
+
+def read_source(source):
+    """{word: rank} for one source config: {"path", "format", "weight", "word_column", "rank_column"}."""
+    fmt = source_format(source)
+    if fmt == 'yomitan':
+        return read_yomitan(source['path'])
+    if fmt == 'csv':
+        return read_csv(source['path'], source.get('word_column', 'Expression'),
+                        source.get('rank_column', 'Frequency'))
+    if fmt == 'tsv':
+        return parse_frequency_file(source['path'])
+    raise ValueError(f"Unknown frequency source format: {fmt!r} (expected one of {', '.join(SOURCE_FORMATS)})")
+
+
+class FrequencyStore:
+    """Interned, sorted word table plus an int32 (words x sources) rank matrix."""
+
+    def __init__(self, rank_maps=()):
+        # Source lines without a usable rank (TSV sources; 0 for a store loaded by open_store)
+        self.skipped = sum(getattr(ranks, 'skipped', 0) for ranks in rank_maps)
+        rank_maps = [{word: rank for word, rank in ranks.items() if rank > 0} for ranks in rank_maps]
+        self.words = sorted({sys.intern(word) for ranks in rank_maps for word in ranks})
+        self.sources = len(rank_maps)
+        if np is not None:
+            self.matrix = np.zeros((len(self.words), self.sources), dtype=np.int32)
+            row_of = {word: row for row, word in enumerate(self.words)}
+            for column, ranks in enumerate(rank_maps):
+                rows = np.fromiter((row_of[word] for word in ranks), dtype=np.int64, count=len(ranks))
+                self.matrix[rows, column] = np.fromiter(ranks.values(), dtype=np.int32, count=len(ranks))
+        else:
+            self.matrix = [array('i', [ranks.get(word, MISSING) for word in self.words]) for ranks in rank_maps]
+
+    @classmethod
+    def from_sources(cls, sources):
+        return cls([read_source(source) for source in sources])
+
+    @classmethod
+    def from_columns(cls, words, columns):
+        """Store of a sorted word list and one array('i') rank column per source."""
+        store = cls()
+        store.words = words
+        store.sources = len(columns)
+        if np is not None:
+            store.matrix = np.column_stack([np.frombuffer(column, dtype=np.int32) for column in columns]) \
+                if columns else np.zeros((len(words), 0), dtype=np.int32)
+        else:
+            store.matrix = list(columns)
+        return store
+
+    def columns(self):
+        """Rank column bytes per source."""
+        if np is not None:
+            return [np.ascontiguousarray(self.matrix[:, column]).tobytes() for column in range(self.sources)]
+        return [column.tobytes() for column in self.matrix]
+
+    def __len__(self):
+        return len(self.words)
+
+    def merge(self, policy='min', weights=None):
+        """One merged rank per word (NumPy int32 array or array('i'), aligned with self.words)."""
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy: {policy!r} (expected one of {', '.join(MERGE_POLICIES)})")
+        weights = list(weights) if weights else [1.0] * self.sources
+        if len(weights) != self.sources or any(weight <= 0 for weight in weights):
+            raise ValueError("Merge weights must be positive, one per source")
+        if np is not None:
+            return self._merge_numpy(policy, weights)
+        return self._merge_python(policy, weights)
+
+    def _merge_numpy(self, policy, weights):
+        matrix = self.matrix
+        present = matrix != MISSING
+        if policy == 'min':
+            return np.where(present, matrix, np.iinfo(np.int32).max).min(axis=1).astype(np.int32)
+        if policy == 'first':
+            first = present.argmax(axis=1)
+            return matrix[np.arange(len(matrix)), first]
+
+        weight = np.asarray(weights, dtype=np.float64)
+        with np.errstate(divide='ignore'):
+            inverse = np.where(present, weight / matrix, 0.0)
+        total = np.where(present, weight, 0.0).sum(axis=1)
+        return np.maximum(np.rint(total / inverse.sum(axis=1)), 1).astype(np.int32)
+
+    def _merge_python(self, policy, weights):
+        merged = array('i')
+        for ranks in zip(*self.matrix):
+            if policy == 'min':
+                merged.append(min(rank for rank in ranks if rank != MISSING))
+            elif policy == 'first':
+                merged.append(next(rank for rank in ranks if rank != MISSING))
+            else:
+                total = inverse = 0.0
+                for rank, weight in zip(ranks, weights):
+                    if rank != MISSING:
+                        total += weight
+                        inverse += weight / rank
+                merged.append(max(round(total / inverse), 1))
+        return merged
+
+    def merged_ranks(self, policy='min', weights=None):
+        """RankMap of the merged ranks, as FrequencyIndex builds its tables from."""
+        ranks = RankMap(zip(self.words, self.merge(policy, weights).tolist()))
+        ranks.skipped = self.skipped
+        return ranks
+
+
+def read_settings(sources):
+    """Bytes identifying how the sources are read (policy and weights do not change the store)."""
+    return json.dumps([{key: value for key, value in source.items() if key != 'weight'} for source in sources],
+                      sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def save_store(store, store_path, stamp, settings):
+    """Write a store (temp file, then renamed); False if a word cannot be stored."""
+    heap = '\0'.join(store.words).encode('utf-8')
+    if len(store.words) > 1 and heap.count(b'\0') != len(store.words) - 1:
+        return False  # A word contains NUL
+
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    tmp_path = store_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(STORE_HEADER.pack(STORE_MAGIC, BYTE_ORDER_MARK, stamp[0], stamp[1],
+                                  hashlib.sha1(settings).digest(), len(store.words), store.sources, len(heap)))
+        f.write(heap + b'\0' * (-len(heap) % 4))
+        for column in store.columns():
+            f.write(column)
+    os.replace(tmp_path, store_path)
+    return True
+
+
+def load_store(store_path, stamp, settings):
+    """The saved store if it matches the source stamp and read settings, else None."""
+    try:
+        with open(store_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < STORE_HEADER.size:
+        return None
+
+    magic, bom, mtime_ns, size, settings_sha1, count, sources, heap_size = STORE_HEADER.unpack_from(data)
+    if (magic != STORE_MAGIC or bom != BYTE_ORDER_MARK or (mtime_ns, size) != tuple(stamp)
+            or settings_sha1 != hashlib.sha1(settings).digest()):
+        return None
+    start = STORE_HEADER.size + (heap_size + 3) // 4 * 4
+    if len(data) != start + count * sources * 4:
+        return None  # Truncated
+
+    heap = data[STORE_HEADER.size:STORE_HEADER.size + heap_size].decode('utf-8')
+    words = heap.split('\0') if count else []
+    columns = []
+    for column in range(sources):
+        ranks = array('i')
+        ranks.frombytes(data[start + column * count * 4:start + (column + 1) * count * 4])
+        columns.append(ranks)
+    return FrequencyStore.from_columns(words, columns)
+
+
+def open_store(sources, store_path):
+    """
+    FrequencyStore of the sources, read from store_path while it is current.
+
+    Returns:
+        (FrequencyStore, status) where status is 'cached' or 'built'
+    """
+    stamp = source_stamp([source['path'] for source in sources])
+    settings = read_settings(sources)
+    store = load_store(store_path, stamp, settings)
+    if store is not None:
+        return store, 'cached'
+    store = FrequencyStore.from_sources(sources)
+    save_store(store, store_path, stamp, settings)
+    return store, 'built'
+
+
+def merge_settings(sources, policy):
+    """Bytes identifying a merge configuration (part of the compiled index's key)."""
+    return json.dumps({'policy': policy, 'sources': sources}, sort_keys=True, ensure_ascii=False).encode('utf-8')
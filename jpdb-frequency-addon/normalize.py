@@ -0,0 +1,126 @@
+"""
+JPDB Frequency Addon - Lookup Key Normalization
+
+Fallback keys for words that are not in JPDB.txt verbatim:
+normalize() folds width (NFKC), katakana to hiragana and long-vowel marks;
+deinflect() proposes dictionary forms for conjugated verbs and adjectives.
+
+This module does not import aqt.
+"""
+
+import unicodedata
+
+
+# Bump when normalize() or the deinflection table changes (compiled indexes are rebuilt)
+NORMALIZER_VERSION = 2
+
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(ord('ァ'), ord('ヶ') + 1)}
+
+# Hiragana -> its vowel, for long-vowel (ー) folding
+VOWEL_OF = {}
+for _vowel, _kana in (('あ', 'あかがさざただなはばぱまやゃらわぁ'),
+                      ('い', 'いきぎしじちぢにひびぴみりぃ'),
+                      ('う', 'うくぐすずつづぬふぶぷむゆゅるぅゔ'),
+                      ('え', 'えけげせぜてでねへべぺめれぇ'),
+                      ('お', 'おこごそぞとどのほぼぽもよょろをぉ')):
+    for _char in _kana:
+        VOWEL_OF[_char] = _vowel
+
+# Godan dictionary ending -> (a-row, i-row, e-row, te form, ta form)
+GODAN_ROWS = {
+    'う': ('わ', 'い', 'え', 'って', 'った'),
+    'く': ('か', 'き', 'け', 'いて', 'いた'),
+    'ぐ': ('が', 'ぎ', 'げ', 'いで', 'いだ'),
+    'す': ('さ', 'し', 'せ', 'して', 'した'),
+    'つ': ('た', 'ち', 'て', 'って', 'った'),
+    'ぬ': ('な', 'に', 'ね', 'んで', 'んだ'),
+    'ぶ': ('ば', 'び', 'べ', 'んで', 'んだ'),
+    'む': ('ま', 'み', 'め', 'んで', 'んだ'),
+    'る': ('ら', 'り', 'れ', 'って', 'った'),
+}
+MASU_ENDINGS = ('ます', 'ました', 'ません', 'ませんでした', 'ましょう', 'たい', 'たくない', 'たかった', 'ながら')
+ICHIDAN_ENDINGS = MASU_ENDINGS + ('ない', 'なかった', 'た', 'て', 'られる', 'させる', 'れば', 'よう', 'ろ')
+ADJECTIVE_ENDINGS = ('かった', 'くない', 'くなかった', 'くて', 'ければ', 'く')
+# Endings of one kana (食べ|た, 早|く) also end countless nouns and kana words
+# (きた would become きる), so they only apply after a stem containing kanji;
+# the ichidan ones also need the stem to end in a kanji or an i/e-row kana.
+SHORT_ENDING = 1
+ICHIDAN_STEM_KANA = frozenset('いきぎしじちぢにひびぴみりえけげせぜてでねへべぺめれ')
+
+
+def _build_deinflection_rules():
+    """(inflected ending, dictionary ending) pairs, longest ending first."""
+    rules = set()
+    for ending, (a_row, i_row, e_row, te_form, ta_form) in GODAN_ROWS.items():
+        for suffix in ('ない', 'なかった', 'れる', 'せる'):
+            rules.add((a_row + suffix, ending))
+        for suffix in MASU_ENDINGS:
+            rules.add((i_row + suffix, ending))
+        for suffix in ('る', 'ば'):
+            rules.add((e_row + suffix, ending))  # Potential, conditional
+        rules.add((te_form, ending))
+        rules.add((ta_form, ending))
+    for suffix in ICHIDAN_ENDINGS:
+        rules.add((suffix, 'る'))
+    for suffix in ('した', 'して', 'しない', 'します', 'しました', 'される', 'させる', 'しよう'):
+        rules.add((suffix, 'する'))
+    for suffix in ('きた', 'きて', 'こない', 'きます', 'きました', 'こられる'):
+        rules.add((suffix, 'くる'))
+    for suffix in ADJECTIVE_ENDINGS:
+        rules.add((suffix, 'い'))
+    return sorted(rules, key=lambda rule: (-len(rule[0]), rule))
+
+
+DEINFLECTION_RULES = _build_deinflection_rules()
+
+
+def is_kanji(char):
+    return '\u4e00' <= char <= '\u9fff' or '\u3400' <= char <= '\u4dbf' or char == '々'
+
+
+def _short_rule_applies(stem, ending):
+    """Whether a one-kana inflection may be stripped from stem (see SHORT_ENDING)."""
+    if not any(is_kanji(char) for char in stem):
+        return False
+    return ending != 'る' or is_kanji(stem[-1]) or stem[-1] in ICHIDAN_STEM_KANA
+
+
+def normalize(text):
+    """NFKC, katakana -> hiragana, ー -> the preceding kana's vowel."""
+    text = unicodedata.normalize('NFKC', text).translate(KATAKANA_TO_HIRAGANA)
+    if 'ー' not in text:
+        return text
+    chars = []
+    for char in text:
+        if char == 'ー' and chars and chars[-1] in VOWEL_OF:
+            char = VOWEL_OF[chars[-1]]
+        chars.append(char)
+    return ''.join(chars)
+
+
+def deinflect(key, max_steps=2):
+    """
+    Candidate dictionary forms of a normalized key, nearest first.
+
+    Each step strips one inflection (食べなかった -> 食べない -> 食べる);
+    candidates keep at least one character of stem, and one-kana endings
+    need a kanji stem (食べた -> 食べる, but not きた -> きる).
+    """
+    candidates = []
+    frontier = [key]
+    seen = {key}
+    for _ in range(max_steps):
+        next_frontier = []
+        for word in frontier:
+            for inflected, ending in DEINFLECTION_RULES:
+                if len(word) > len(inflected) and word.endswith(inflected):
+                    stem = word[:-len(inflected)]
+                    if len(inflected) <= SHORT_ENDING and not _short_rule_applies(stem, ending):
+                        continue
+                    candidate = stem + ending
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        candidates.append(candidate)
+                        next_frontier.append(candidate)
+        frontier = next_frontier
+    return candidates
@@ -0,0 +1,46 @@
+"""
+JPDB Frequency Addon - Field Text Pipeline
+
+HTML stripping and sentence detection for note fields, with compiled
+patterns and a memo for repeated field values.
+
+This module does not import aqt.
+"""
+
+import html
+import re
+from functools import lru_cache
+
+
+TAG_RE = re.compile(r'<[^>]+>')
+# Sentence punctuation and spaces (half- and full-width)
+SENTENCE_CHARS_RE = re.compile('[。、！？「」 　]')
+MAX_WORD_LENGTH = 15
+FIELD_MEMO_SIZE = 65536
+
+
+def strip_html(text):
+    """Remove HTML tags, decode entities and strip whitespace."""
+    if not text:
+        return text
+    if '<' in text:
+        text = TAG_RE.sub('', text)
+    if '&' in text:
+        text = html.unescape(text).replace('\xa0', ' ')
+    return text.strip()
+
+
+def is_sentence(text):
+    """Check if text appears to be a sentence rather than a single word."""
+    if not text:
+        return False
+
+    # Too long to be a single word, or contains sentence punctuation / spaces
+    return len(text) > MAX_WORD_LENGTH or SENTENCE_CHARS_RE.search(text) is not None
+
+
+@lru_cache(maxsize=FIELD_MEMO_SIZE)
+def analyze_field(raw):
+    """(clean text, is_sentence) of a raw field value, memoized."""
+    clean = strip_html(raw)
+    return clean, is_sentence(clean)
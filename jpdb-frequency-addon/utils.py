@@ -3,10 +3,26 @@ JPDB Frequency Addon - Utility Functions
 """
 
 import os
-import re
+import time
 from aqt import mw
 from aqt.utils import showInfo, getFile
 
+from .freq_index import open_index
+from .freq_sources import merge_settings, open_store
+from .text import analyze_field, strip_html
+
+
+# Compiled index of the frequency file (kept in user_files/, which survives addon updates)
+INDEX_FILE = os.path.join(os.path.dirname(__file__), 'user_files', 'frequency.idx')
+
+# Parsed rank matrix of the merged frequency sources (a policy or weight change re-merges it)
+SOURCES_FILE = os.path.join(os.path.dirname(__file__), 'user_files', 'frequency_sources.bin')
+
+# Seconds between progress window refreshes during a fill
+PROGRESS_INTERVAL = 0.1
+
+# Note ids per notes-table query during a fill
+SQL_CHUNK = 5000
 
 # Global cache for frequency map
 _frequency_map = None
@@ -25,7 +41,11 @@ def get_config():
         'target_field': 'Frequency',
         'overwrite': False,
         'ignore_sentences': True,
-        'frequency_file_path': ''
+        'frequency_file_path': '',
+        'update_chunk_size': 500,
+        'normalized_lookup': True,
+        'frequency_sources': [],
+        'merge_policy': 'min'
     }
 
     for key, value in defaults.items():
@@ -40,33 +60,23 @@ def save_config(config):
     mw.addonManager.writeConfig(__name__.split('.')[0], config)
 
 
-def strip_html(text):
-    """Remove HTML tags from text."""
-    if not text:
-        return text
-    # Remove HTML tags
-    clean = re.sub(r'<[^>]+>', '', text)
-    # Decode common HTML entities
-    clean = clean.replace('&nbsp;', ' ')
-    clean = clean.replace('&lt;', '<')
-    clean = clean.replace('&gt;', '>')
-    clean = clean.replace('&amp;', '&')
-    clean = clean.replace('&quot;', '"')
-    return clean.strip()
+def close_frequency_map():
+    """Unmap the open frequency index, if any."""
+    global _frequency_map, _frequency_file_path
+    if _frequency_map is not None:
+        _frequency_map.close()
+    _frequency_map = None
+    _frequency_file_path = None
 
 
 def clear_frequency_cache():
     """Clear the cached frequency map."""
-    global _frequency_map, _frequency_file_path
-    _frequency_map = None
-    _frequency_file_path = None
+    close_frequency_map()
     showInfo("Frequency cache cleared.")
 
 
 def select_frequency_file(browser=None):
     """Let user select a JPDB.txt file and save the path to config."""
-    global _frequency_map, _frequency_file_path
-
     parent = browser if browser else mw
     file_path = getFile(
         parent,
@@ -77,8 +87,7 @@ def select_frequency_file(browser=None):
 
     if file_path:
         # Clear cache so it reloads with new file
-        _frequency_map = None
-        _frequency_file_path = None
+        close_frequency_map()
 
         # Save to config
         config = get_config()
@@ -92,13 +101,22 @@ def select_frequency_file(browser=None):
 
 
 def load_frequency_map():
-    """Load frequency map from JPDB.txt file."""
+    """
+    Load the frequency map for JPDB.txt.
+
+    Returns a FrequencyIndex (word -> rank via .get()); the compiled index
+    is rebuilt only when JPDB.txt changed. When frequency_sources is
+    configured, those lists are merged instead (see load_merged_sources).
+    """
     global _frequency_map, _frequency_file_path
 
     if _frequency_map is not None:
         return _frequency_map
 
     config = get_config()
+    if config.get('frequency_sources'):
+        return load_merged_sources(config['frequency_sources'], config.get('merge_policy', 'min'))
+
     file_path = config.get('frequency_file_path', '')
 
     # Check if configured path exists
@@ -129,76 +147,229 @@ def load_frequency_map():
             config['frequency_file_path'] = file_path
             save_config(config)
 
-    # Load the file
-    freq_map = {}
+    # Open the compiled index (built from the file on first use or after it changed)
     try:
-        with open(_frequency_file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                parts = line.split('\t')
-                if len(parts) >= 2:
-                    word = parts[0]
-                    rank = parts[1]
-                    # Keep first occurrence (higher rank)
-                    if word not in freq_map:
-                        freq_map[word] = rank
-
-        _frequency_map = freq_map
-        return freq_map
+        _frequency_map, _ = open_index(_frequency_file_path, INDEX_FILE)
+        report_skipped_lines(_frequency_map, _frequency_file_path)
+        return _frequency_map
 
     except Exception as e:
         showInfo(f"Error loading JPDB.txt: {str(e)}")
         return None
 
 
-def is_sentence(text):
-    """Check if text appears to be a sentence rather than a single word."""
-    if not text:
-        return False
+def report_skipped_lines(freq_map, source):
+    """Tell the user about frequency lines a fresh index build could not read."""
+    if freq_map.skipped:
+        showInfo(f"{freq_map.skipped:,} lines of {source} have no integer rank and were skipped.\n"
+                 "Those words will not be found.")
 
-    # Contains sentence punctuation
-    if any(p in text for p in ['。', '、', '！', '？', '「', '」']):
-        return True
 
-    # Too long to be a single word
-    if len(text) > 15:
-        return True
+def load_merged_sources(sources, policy):
+    """
+    Open the compiled index of several merged frequency lists.
 
-    # Contains spaces (likely a phrase)
-    if ' ' in text or '　' in text:
-        return True
+    sources: list of {"path", "format" (tsv, yomitan or csv), "weight",
+    "word_column", "rank_column"}; policy: min, harmonic or first. The
+    index is rebuilt when a source file, the list or the policy changes;
+    only a source file or list change re-parses the sources.
+    """
+    global _frequency_map, _frequency_file_path
+
+    paths = [source['path'] for source in sources]
+    weights = [source.get('weight', 1.0) for source in sources]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        showInfo("Frequency sources not found:\n" + "\n".join(missing))
+        return None
+
+    try:
+        _frequency_map, _ = open_index(
+            paths, INDEX_FILE,
+            load_ranks=lambda: open_store(sources, SOURCES_FILE)[0].merged_ranks(policy, weights),
+            settings=merge_settings(sources, policy)
+        )
+        _frequency_file_path = paths[0]
+        report_skipped_lines(_frequency_map, ", ".join(paths))
+        return _frequency_map
+
+    except Exception as e:
+        showInfo(f"Error loading frequency sources: {str(e)}")
+        return None
 
-    return False
 
+def get_frequency_local(text, normalized_lookup=True):
+    """
+    Look up frequency from local map.
 
-def get_frequency_local(text):
-    """Look up frequency from local map."""
+    With normalized_lookup, words missing verbatim are retried by their
+    normalized key and deinflected forms (see FrequencyIndex.lookup).
+    """
     freq_map = load_frequency_map()
 
     if not freq_map:
         return None, "File not loaded"
 
     # Strip HTML and whitespace
-    clean_text = strip_html(text)
-
-    if clean_text in freq_map:
-        return freq_map[clean_text], None
+    freq = lookup_frequency(freq_map, strip_html(text), normalized_lookup)
+    if freq is not None:
+        return freq, None
 
     return None, "Not found in list"
 
 
+def lookup_frequency(freq_map, clean_text, normalized_lookup=True):
+    """Rank string for already-cleaned text, or None."""
+    if normalized_lookup:
+        return freq_map.lookup(clean_text)[0]
+    return freq_map.get(clean_text)
+
+
+def fetch_note_fields(col, nids):
+    """
+    Field maps of many notes, read straight from the notes table.
+
+    Yields (nid, {field name: value}) in SQL_CHUNK-sized queries, without
+    creating a Note object per note.
+    """
+    from anki.utils import ids2str
+
+    field_names = {}  # notetype id -> field names in order
+    for start in range(0, len(nids), SQL_CHUNK):
+        chunk = nids[start:start + SQL_CHUNK]
+        for nid, mid, flds in col.db.all(f"select id, mid, flds from notes where id in {ids2str(chunk)}"):
+            names = field_names.get(mid)
+            if names is None:
+                notetype = col.models.get(mid)
+                names = field_names[mid] = [field['name'] for field in notetype['flds']] if notetype else []
+            yield nid, dict(zip(names, flds.split('\x1f')))
+
+
+def compute_frequency_updates(col, nids, settings, on_progress=None, want_cancel=None):
+    """
+    Look up frequencies for notes (runs on a background thread).
+
+    Returns:
+        (updates, counts) where updates is a list of (nid, new value) and
+        counts has 'updated', 'skipped', 'not_found' and 'cancelled';
+        nothing is written to the collection.
+    """
+    source_field = settings['source_field']
+    target_field = settings['target_field']
+    ignore_sentences = settings['ignore_sentences']
+    normalized_lookup = settings.get('normalized_lookup', True)
+    counts = {'updated': 0, 'skipped': 0, 'not_found': 0, 'cancelled': False}
+    updates = []
+    freq_map = load_frequency_map()
+    freq_of = {}  # clean text -> rank string or None, for repeated values
+
+    found = 0
+    for idx, (nid, fields) in enumerate(fetch_note_fields(col, nids)):
+        found += 1
+        if want_cancel is not None and want_cancel():
+            counts['cancelled'] = True
+            break
+        if on_progress is not None:
+            on_progress(idx, len(nids), "Looking up")
+
+        # Check source and target fields exist
+        if source_field not in fields or target_field not in fields:
+            counts['skipped'] += 1
+            continue
+
+        clean_text, sentence = analyze_field(fields[source_field])
+
+        # Skip sentences if configured
+        if ignore_sentences and sentence:
+            counts['skipped'] += 1
+            continue
+
+        # Check overwrite setting
+        if fields[target_field] and not settings['overwrite']:
+            counts['skipped'] += 1
+            continue
+
+        # Look up frequency
+        if clean_text in freq_of:
+            freq = freq_of[clean_text]
+        else:
+            freq = freq_of[clean_text] = lookup_frequency(freq_map, clean_text, normalized_lookup) if freq_map else None
+
+        if freq is not None:
+            value = str(freq)
+            if value != fields[target_field]:
+                updates.append((nid, value))
+            counts['updated'] += 1
+        else:
+            counts['not_found'] += 1
+
+    if not counts['cancelled']:
+        counts['skipped'] += len(nids) - found  # Deleted since they were selected
+    return updates, counts
+
+
+def apply_frequency_updates(col, updates, target_field, chunk_size, on_progress=None):
+    """
+    Write (nid, value) updates with col.update_notes() in chunks of chunk_size.
+
+    All chunks are merged into a single undo step.
+
+    Returns:
+        OpChanges of the merged undo entry
+    """
+    undo_start = col.add_custom_undo_entry("Fill JPDB Frequency")
+    for start in range(0, len(updates), chunk_size):
+        notes = []
+        for nid, value in updates[start:start + chunk_size]:
+            note = col.get_note(nid)
+            note[target_field] = value
+            notes.append(note)
+        col.update_notes(notes)
+        if on_progress is not None:
+            on_progress(start + len(notes), len(updates), "Saving")
+    return col.merge_undo_entries(undo_start)
+
+
+class ThrottledProgress:
+    """Forward progress from a background thread to the main window, at most every interval seconds."""
+
+    def __init__(self, interval=PROGRESS_INTERVAL):
+        self.interval = interval
+        self.last = 0.0
+
+    def __call__(self, done, total, stage="Processing"):
+        now = time.monotonic()
+        if now - self.last < self.interval:
+            return
+        self.last = now
+        mw.taskman.run_on_main(
+            lambda: mw.progress.update(value=done, max=total, label=f"{stage} {done}/{total}")
+        )
+
+
 def fill_frequency_for_selected_cards(browser):
-    """Fill frequency data for selected cards in browser."""
+    """
+    Fill frequency data for selected cards in browser.
+
+    Lookups run in a background CollectionOp, so the UI stays responsive;
+    closing the progress window cancels before anything is written. Changed
+    notes are saved with update_notes() in chunks of update_chunk_size, as
+    one undoable step; skipped and not-found notes are never written.
+    """
+    from anki.collection import OpChanges
+    from aqt.operations import CollectionOp
+
     config = get_config()
-    source_field = config.get('source_field', 'Expression')
-    target_field = config.get('target_field', 'Frequency')
-    overwrite = config.get('overwrite', False)
-    ignore_sentences = config.get('ignore_sentences', True)
+    settings = {
+        'source_field': config.get('source_field', 'Expression'),
+        'target_field': config.get('target_field', 'Frequency'),
+        'overwrite': config.get('overwrite', False),
+        'ignore_sentences': config.get('ignore_sentences', True),
+        'update_chunk_size': max(1, int(config.get('update_chunk_size', 500))),
+        'normalized_lookup': config.get('normalized_lookup', True),
+    }
 
-    # Ensure map is loaded before starting
+    # Ensure map is loaded before starting (may ask for the file, so on the main thread)
     if not load_frequency_map():
         showInfo("Could not load JPDB.txt.\n\nPlease use 'Edit > JPDB Frequency > Select JPDB.txt File' to select your frequency file.")
         return
@@ -209,65 +380,51 @@ def fill_frequency_for_selected_cards(browser):
         showInfo("No notes selected.")
         return
 
-    mw.progress.start(max=len(selected_nids), immediate=True)
-
-    updated_count = 0
-    skipped_count = 0
-    not_found_count = 0
-
-    try:
-        for idx, nid in enumerate(selected_nids):
-            note = mw.col.get_note(nid)
-
-            # Check source field exists
-            if source_field not in note:
-                skipped_count += 1
-                mw.progress.update()
-                continue
-
-            # Check target field exists
-            if target_field not in note:
-                skipped_count += 1
-                mw.progress.update()
-                continue
-
-            original_text = note[source_field]
-            clean_text = strip_html(original_text)
-
-            # Skip sentences if configured
-            if ignore_sentences and is_sentence(clean_text):
-                skipped_count += 1
-                mw.progress.update()
-                continue
-
-            # Check overwrite setting
-            if note[target_field] and not overwrite:
-                skipped_count += 1
-                mw.progress.update()
-                continue
-
-            # Look up frequency
-            freq, error = get_frequency_local(clean_text)
-
-            if freq is not None:
-                note[target_field] = str(freq)
-                mw.col.update_note(note)
-                updated_count += 1
-            else:
-                not_found_count += 1
-
-            mw.progress.update(
-                value=idx + 1,
-                label=f"Processing {idx + 1}/{len(selected_nids)}"
+    counts = {}
+    timings = {}
+
+    def op(col):
+        progress = ThrottledProgress()
+        started = time.perf_counter()
+        updates, result = compute_frequency_updates(
+            col, selected_nids, settings,
+            on_progress=progress,
+            want_cancel=mw.progress.want_cancel
+        )
+        counts.update(result)
+        timings['lookup'] = time.perf_counter() - started
+        timings['written'] = 0
+        if result['cancelled'] or not updates:
+            return OpChanges()
+
+        started = time.perf_counter()
+        changes = apply_frequency_updates(col, updates, settings['target_field'],
+                                          settings['update_chunk_size'], on_progress=progress)
+        timings['write'] = time.perf_counter() - started
+        timings['written'] = len(updates)
+        return changes
+
+    def on_success(changes):
+        if counts['cancelled']:
+            showInfo("Cancelled. No notes were changed.", parent=browser)
+            return
+        report = (
+            f"Looked up {len(selected_nids)} notes in {timings['lookup']:.2f}s "
+            f"({len(selected_nids) / max(timings['lookup'], 1e-9):,.0f} notes/sec)"
+        )
+        if timings['written']:
+            report += (
+                f"\nWrote {timings['written']} notes in {timings['write']:.2f}s "
+                f"({timings['written'] / max(timings['write'], 1e-9):,.0f} notes/sec, "
+                f"chunks of {settings['update_chunk_size']})"
             )
-
-    finally:
-        mw.progress.finish()
-        mw.reset()
-
-    showInfo(
-        f"Completed!\n\n"
-        f"Updated: {updated_count}\n"
-        f"Skipped: {skipped_count}\n"
-        f"Not found: {not_found_count}"
-    )
+        showInfo(
+            f"Completed!\n\n"
+            f"Updated: {counts['updated']}\n"
+            f"Skipped: {counts['skipped']}\n"
+            f"Not found: {counts['not_found']}\n\n"
+            f"{report}",
+            parent=browser
+        )
+
+    CollectionOp(parent=browser, op=op).success(on_success).run_in_background()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latency and worker-utilization statistics for the scrapers
+"""
+
+import math
+import threading
+import time
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+class LatencyStats:
+    """Thread-safe per-item latency and per-worker busy/finish times"""
+
+    def __init__(self, num_workers):
+        self.num_workers = num_workers
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.busy = {}
+        self.finished = {}
+        self.requeued = 0
+        self.started = time.monotonic()
+
+    def record(self, worker_id, latency, busy=None):
+        """Record one lookup; busy is the worker time spent on it (default: latency)"""
+        with self.lock:
+            self.latencies.append(latency)
+            self.busy[worker_id] = self.busy.get(worker_id, 0.0) + (latency if busy is None else busy)
+
+    def requeue(self):
+        with self.lock:
+            self.requeued += 1
+
+    def worker_done(self, worker_id):
+        with self.lock:
+            self.finished[worker_id] = time.monotonic() - self.started
+
+    def report(self, label='Lookups'):
+        wall = time.monotonic() - self.started
+        values = sorted(self.latencies)
+        total_busy = sum(self.busy.values())
+        ideal = total_busy / self.num_workers if self.num_workers else 0.0
+
+        print(f"\n[INFO] {label}: {len(values)} in {wall:.1f}s ({self.requeued} requeued)")
+        if values:
+            print(f"  Latency p50 {percentile(values, 50)*1000:.0f}ms  p90 {percentile(values, 90)*1000:.0f}ms  "
+                  f"p99 {percentile(values, 99)*1000:.0f}ms  max {values[-1]*1000:.0f}ms")
+        if self.finished:
+            finish_times = sorted(self.finished.values())
+            print(f"  Workers finished between {finish_times[0]:.1f}s and {finish_times[-1]:.1f}s")
+        if wall > 0:
+            print(f"  Ideal wall-clock (busy / workers): {ideal:.1f}s  Efficiency: {ideal / wall * 100:.0f}%")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent on-disk cache for dictionary lookups (single SQLite file)
+
+- Raw responses are stored once per content hash (zlib-compressed)
+- Parsed meanings are stored per (source, expression, parser version)
+- Positive results expire after TTL, negative results after a shorter TTL
+- Total raw size is capped; least recently used entries are evicted first
+
+After a parser change (PARSER_VERSION bump), meanings are re-parsed from the
+cached raw responses without touching the network.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+
+# Configuration
+CACHE_FILE = 'naver_cache.sqlite3'
+DEFAULT_TTL = 90 * 24 * 3600  # 90 days for found meanings
+NEGATIVE_TTL = 3 * 24 * 3600  # 3 days for not found / failed lookups
+MAX_BYTES = 512 * 1024 * 1024  # cap on stored raw response size
+EVICT_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    source TEXT NOT NULL,
+    expression TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    digest TEXT,
+    meaning TEXT,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (source, expression, parser_version)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+"""
+
+class LookupCache:
+    """Thread-safe SQLite lookup cache"""
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL, max_bytes=MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.reparsed = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def _is_fresh(self, created, meaning, now):
+        ttl = self.ttl if meaning else self.negative_ttl
+        return now - created < ttl
+
+    def get(self, source, expression, parser_version, parse=None):
+        """
+        Look up a cached result
+
+        Args:
+            parse: optional parser(raw) used to re-parse a cached raw response
+                   stored under an older parser version
+
+        Returns:
+            (found, meaning) - found is False on a miss; meaning is None for a
+            cached negative result
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT meaning, created FROM entries WHERE source=? AND expression=? AND parser_version=?',
+                (source, expression, parser_version)
+            ).fetchone()
+            if row and self._is_fresh(row[1], row[0], now):
+                self.conn.execute(
+                    'UPDATE entries SET accessed=? WHERE source=? AND expression=? AND parser_version=?',
+                    (now, source, expression, parser_version)
+                )
+                self.hits += 1
+                return True, row[0]
+
+            if parse is not None:
+                # Re-parse the newest raw response from another parser version
+                row = self.conn.execute(
+                    'SELECT e.digest, e.created, b.data FROM entries e JOIN blobs b ON b.digest = e.digest '
+                    'WHERE e.source=? AND e.expression=? AND e.parser_version!=? '
+                    'ORDER BY e.created DESC LIMIT 1',
+                    (source, expression, parser_version)
+                ).fetchone()
+                if row:
+                    digest, created, data = row
+                    meaning = parse(zlib.decompress(data).decode('utf-8'))
+                    if self._is_fresh(created, meaning, now):
+                        self.conn.execute(
+                            'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (source, expression, parser_version, digest, meaning, created, now)
+                        )
+                        self.reparsed += 1
+                        return True, meaning
+
+            self.misses += 1
+            return False, None
+
+    def put(self, source, expression, parser_version, raw, meaning):
+        """Store a lookup result (raw may be None, meaning None = negative)"""
+        now = time.time()
+        digest = None
+        with self.lock:
+            if raw is not None:
+                data = raw.encode('utf-8') if isinstance(raw, str) else raw
+                digest = hashlib.sha1(data).hexdigest()
+                exists = self.conn.execute('SELECT 1 FROM blobs WHERE digest=?', (digest,)).fetchone()
+                if not exists:
+                    packed = zlib.compress(data, 6)
+                    self.conn.execute('INSERT INTO blobs VALUES (?, ?, ?)', (digest, packed, len(packed)))
+                    self.total_bytes += len(packed)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (source, expression, parser_version, digest, meaning, now, now)
+            )
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until raw size is under 90% of the cap"""
+        target = self.max_bytes * 0.9
+        while self.total_bytes > target:
+            victims = self.conn.execute(
+                'SELECT source, expression, parser_version FROM entries ORDER BY accessed LIMIT ?',
+                (EVICT_BATCH,)
+            ).fetchall()
+            if not victims:
+                break
+            self.conn.execute('BEGIN')
+            self.conn.executemany(
+                'DELETE FROM entries WHERE source=? AND expression=? AND parser_version=?', victims
+            )
+            self.conn.execute(
+                'DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries WHERE digest IS NOT NULL)'
+            )
+            self.conn.execute('COMMIT')
+            self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def purge_expired(self):
+        """Delete expired entries and unreferenced raw responses"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute('BEGIN')
+            self.conn.execute(
+                'DELETE FROM entries WHERE (meaning IS NOT NULL AND created < ?) OR (meaning IS NULL AND created < ?)',
+                (now - self.ttl, now - self.negative_ttl)
+            )
+            self.conn.execute(
+                'DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries WHERE digest IS NOT NULL)'
+            )
+            self.conn.execute('COMMIT')
+            self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def stats_line(self):
+        return (f"Cache: {self.hits} hits, {self.reparsed} re-parsed, {self.misses} misses "
+                f"({self.total_bytes / 1024 / 1024:.1f} MB raw)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class CachedFetcher:
+    """
+    Wrap a fetcher backend with a LookupCache
+
+    Cache hits skip the network entirely (last_hit is set so callers can
+    skip their polite delay). Failed lookups (HTTP errors, Selenium render
+    failures or timeouts) are not cached (last_failed is set so callers can
+    retry); a response without meanings is cached as a negative result.
+    With a parse function and a backend that has fetch(), the raw response
+    is stored too, so a parser bump re-parses without refetching.
+    """
+
+    def __init__(self, fetcher, cache, parser_version, parse=None):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.parser_version = parser_version
+        self.parse = parse
+        self.name = fetcher.name
+        self.last_hit = False
+        self.last_failed = False
+
+    def lookup(self, word):
+        found, meaning = self.cache.get(self.name, word, self.parser_version, self.parse)
+        self.last_hit = found
+        self.last_failed = False
+        if found:
+            return meaning
+
+        if hasattr(self.fetcher, 'fetch') and self.parse is not None:
+            raw = self.fetcher.fetch(word)
+            if raw is None:
+                self.last_failed = True
+                return None  # Network/HTTP error: retry later, don't cache
+            meaning = self.parse(raw)
+        else:
+            raw = None
+            meaning = self.fetcher.lookup(word)
+            self.last_failed = getattr(self.fetcher, 'last_failed', False)
+            if self.last_failed:
+                return meaning  # Failed lookup: retry later, don't cache
+
+        self.cache.put(self.name, word, self.parser_version, raw, meaning)
+        return meaning
+
+    def close(self):
+        self.fetcher.close()
+
+if __name__ == '__main__':
+    import sys
+
+    cache = LookupCache(sys.argv[1] if len(sys.argv) > 1 else CACHE_FILE)
+    count, negative = cache.conn.execute(
+        'SELECT COUNT(*), SUM(meaning IS NULL) FROM entries'
+    ).fetchone()
+    print(f"Entries: {count} ({negative or 0} negative)")
+    print(f"Raw responses: {cache.total_bytes / 1024 / 1024:.1f} MB (cap {cache.max_bytes / 1024 / 1024:.0f} MB)")
+    cache.purge_expired()
+    print(f"[OK] Expired entries purged")
+    cache.close()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline extraction of Naver Japanese Dictionary entries
+
+Parses a saved search page (HTML, e.g. driver.page_source) or a search API
+response (JSON) into structured entries without a browser:
+
+    Entry(headword, reading, pos, senses)
+
+Every scraper goes through this module, so a selector change only has to be
+made (and checked against saved pages) here.
+
+Usage:
+    python naver_extract.py suru_page.html resources/fixtures/naver/思う.json
+"""
+
+import html
+import json
+import re
+from collections import namedtuple
+from html.parser import HTMLParser
+
+# Configuration
+MAX_MEANINGS = 3
+WORD_SECTION_MARKER = 'id="searchPage_entry"'  # Word results section of the search page
+
+TAG_RE = re.compile(r'<[^>]+>')
+KANJI_BRACKETS = '[]【】 '
+
+Entry = namedtuple('Entry', ['headword', 'reading', 'pos', 'senses'])
+
+def clean_text(text):
+    """Strip HTML tags/entities and collapse whitespace"""
+    if not text:
+        return ''
+    text = html.unescape(TAG_RE.sub('', text))
+    return ' '.join(text.split())
+
+def format_meanings(meanings):
+    """
+    Format meaning texts with numbers: 1. ... 2. ... 3. ...
+
+    Args:
+        meanings: list of raw meaning texts (in page order)
+
+    Returns:
+        Numbered meaning string or None (maximum 3 meanings)
+    """
+    cleaned = []
+    for text in meanings[:MAX_MEANINGS]:
+        text = ' '.join(text.split()) if text else ''
+        if text:
+            cleaned.append(text)
+
+    if not cleaned:
+        return None
+
+    return ' '.join(f"{i+1}. {meaning}" for i, meaning in enumerate(cleaned))
+
+# JSON (search API)
+
+def extract_json_entries(data):
+    """
+    Extract entries from a parsed API response
+
+    searchResultMap.searchResultListMap.WORD.items[].meansCollector holds
+    either {'mean': ...} entries or {'means': [{'value': ...}, ...]} groups.
+    """
+    items = (data.get('searchResultMap', {})
+                 .get('searchResultListMap', {})
+                 .get('WORD', {})
+                 .get('items', []))
+
+    entries = []
+    for item in items:
+        senses = []
+        pos = ''
+        for collector in item.get('meansCollector') or []:
+            pos = pos or clean_text(collector.get('partOfSpeech2') or collector.get('partOfSpeech'))
+            if 'means' in collector:
+                for mean in collector.get('means') or []:
+                    senses.append(clean_text(mean.get('value', '')))
+            elif 'mean' in collector:
+                senses.append(clean_text(collector.get('mean', '')))
+
+        reading = clean_text(item.get('expEntry'))
+        kanji = clean_text(item.get('expKanji')).strip(KANJI_BRACKETS)
+        entries.append(Entry(kanji or reading, reading, pos, [s for s in senses if s]))
+    return entries
+
+def extract_json_meanings(data):
+    """Meaning texts of the first word entry of an API response"""
+    entries = extract_json_entries(data)
+    return entries[0].senses if entries else []
+
+def parse_word_json(raw):
+    """Parse a raw API response body into the numbered meaning string"""
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    return format_meanings(extract_json_meanings(data))
+
+# HTML (rendered search page)
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'source', 'track', 'wbr'}
+
+class _StopParsing(Exception):
+    pass
+
+class WordSectionParser(HTMLParser):
+    """
+    Single-pass parser for the word section of a search page
+
+    Each div.row is one entry: div.origin > a (reading), span._kanji
+    (headword), p.word_class (POS) and p.mean (senses, in order).
+    Parsing stops as soon as the word section is closed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.entries = []
+        self.stray_senses = []  # p.mean outside any div.row (layout fallback)
+        self.stack = []  # (tag, role) of open elements
+        self.current = None
+        self.field = None
+        self.buffer = []
+        self.skip = 0  # depth inside span.blind (screen-reader only text)
+
+    def _role(self, tag, classes):
+        if 'blind' in classes:
+            return 'blind'
+        if tag == 'div' and 'row' in classes:
+            return 'row'
+        if tag == 'div' and 'origin' in classes:
+            return 'origin'
+        if tag == 'a' and self.stack and self.stack[-1][1] == 'origin':
+            return 'reading'
+        if tag == 'span' and '_kanji' in classes:
+            return 'headword'
+        if tag == 'p' and 'word_class' in classes:
+            return 'pos'
+        if tag == 'p' and 'mean' in classes:
+            return 'sense'
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        classes = ()
+        for name, value in attrs:
+            if name == 'class' and value:
+                classes = value.split()
+                break
+        role = self._role(tag, classes)
+        self.stack.append((tag, role))
+
+        if role == 'blind':
+            self.skip += 1
+        elif role == 'row':
+            self.current = {'reading': '', 'headword': '', 'pos': '', 'senses': []}
+        elif role in ('reading', 'headword', 'pos', 'sense') and self.field is None:
+            self.field = role
+            self.buffer = []
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Pop up to the matching open tag (tolerates unclosed children)
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            self._close(self.stack.pop()[1])
+        if not self.stack:
+            raise _StopParsing()
+
+    def _close(self, role):
+        if role == 'blind':
+            self.skip -= 1
+        elif role is not None and role == self.field:
+            text = ' '.join(''.join(self.buffer).split())
+            self.field = None
+            if self.current is None:
+                if role == 'sense' and text:
+                    self.stray_senses.append(text)
+            elif role == 'sense':
+                if text:
+                    self.current['senses'].append(text)
+            else:
+                self.current[role] = self.current[role] or text
+        elif role == 'row' and self.current is not None:
+            entry = self.current
+            self.current = None
+            if entry['reading'] or entry['senses']:
+                headword = entry['headword'].strip(KANJI_BRACKETS)
+                self.entries.append(Entry(headword or entry['reading'], entry['reading'],
+                                          entry['pos'], entry['senses']))
+
+    def handle_data(self, data):
+        if self.field is not None and not self.skip:
+            self.buffer.append(data)
+
+def extract_html_entries(page):
+    """
+    Extract entries from a saved search page
+
+    Only the word section is parsed; pages without one (older layouts,
+    error pages) are parsed whole and loose p.mean texts become one entry.
+    """
+    start = page.find(WORD_SECTION_MARKER)
+    if start != -1:
+        page = page[page.rfind('<', 0, start):]
+
+    parser = WordSectionParser()
+    try:
+        parser.feed(page)
+        parser.close()
+    except _StopParsing:
+        pass
+
+    if not parser.entries and parser.stray_senses:
+        return [Entry('', '', '', parser.stray_senses)]
+    return parser.entries
+
+def parse_word_html(page):
+    """Parse a saved search page into the numbered meaning string"""
+    entries = extract_html_entries(page) if page else []
+    return format_meanings(entries[0].senses) if entries else None
+
+def extract_entries(content, is_json=False):
+    """Extract entries from a saved page or API response body"""
+    if is_json:
+        try:
+            return extract_json_entries(json.loads(content))
+        except ValueError:
+            return []
+    return extract_html_entries(content)
+
+def extract_file(path):
+    """Extract entries from a saved .html page or .json API response"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return extract_entries(f.read(), path.endswith('.json'))
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        entries = extract_file(path)
+        print(f"\n{path}: {len(entries)} entries")
+        for entry in entries:
+            print(f"  {entry.headword} ({entry.reading}) [{entry.pos}]")
+            for i, sense in enumerate(entry.senses):
+                print(f"    {i+1}. {sense}")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fetcher backends for Naver Japanese Dictionary lookups
+- http: calls the JSON search API over a pooled keep-alive session (fast)
+- selenium: renders the search page in headless Chrome (fallback)
+
+Both backends return the same numbered format (1. ... 2. ... 3. ...);
+the extraction itself lives in naver_extract.py
+"""
+
+from urllib.parse import quote
+
+from naver_extract import parse_word_html, parse_word_json
+
+# Configuration
+NAVER_API_URL = 'https://ja.dict.naver.com/api/v1/search/word'
+NAVER_SEARCH_URL = 'https://ja.dict.naver.com/#/search?range=word&query={word}'
+PARSER_VERSION = 1  # Bump when extraction/format rules change (cached meanings get re-parsed)
+REQUEST_TIMEOUT = 10  # seconds
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+BACKENDS = ['http', 'selenium']
+
+class HttpFetcher:
+    """Look up words through the Naver JSON API with a keep-alive session"""
+
+    name = 'http'
+    last_failed = False  # True when the last lookup hit a network/HTTP error
+
+    def __init__(self, api_url=NAVER_API_URL, pool_size=4, timeout=REQUEST_TIMEOUT, archive=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.api_url = api_url
+        self.timeout = timeout
+        self.archive = archive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/json',
+            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+            'Referer': 'https://ja.dict.naver.com/',
+        })
+
+    def fetch(self, word):
+        """Return the raw JSON body for word, or None on error"""
+        url = f"{self.api_url}?query={quote(word)}&range=word"
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except Exception:
+            return None
+        if response.status_code != 200:
+            return None
+        if self.archive is not None:
+            self.archive.add(self.name, word, response.text)
+        return response.text
+
+    def lookup(self, word):
+        """Return numbered meanings for word, or None"""
+        raw = self.fetch(word)
+        self.last_failed = raw is None
+        return parse_word_json(raw)
+
+    def close(self):
+        self.session.close()
+
+def create_driver(driver_path=None):
+    """
+    Create a new WebDriver instance with maximum optimization
+
+    Args:
+        driver_path: chromedriver binary (resolved with webdriver-manager if None)
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless=new')  # New headless mode
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--lang=ko-KR')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+
+    # Performance optimizations
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-plugins')
+    chrome_options.add_argument('--disable-images')  # Don't load images
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-javascript-harmony')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--disable-translate')
+    chrome_options.add_argument('--disable-default-apps')
+    chrome_options.add_argument('--no-first-run')
+    chrome_options.add_argument('--no-default-browser-check')
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--disable-permissions-api')
+    chrome_options.add_argument('--ignore-certificate-errors')
+
+    # Page load strategy
+    chrome_options.page_load_strategy = 'eager'  # Don't wait for full page load
+
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+
+    driver = webdriver.Chrome(
+        service=Service(driver_path or ChromeDriverManager().install()),
+        options=chrome_options
+    )
+
+    # Set timeouts
+    driver.set_page_load_timeout(10)
+    driver.set_script_timeout(10)
+
+    return driver
+
+def fetch_page(driver, word):
+    """Render the search page for word and return its source, or None"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    try:
+        driver.get(NAVER_SEARCH_URL.format(word=word))
+
+        # Wait until the meanings are rendered
+        WebDriverWait(driver, 3).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, '.mean'))
+        )
+        return driver.page_source
+
+    except Exception as e:
+        return None
+
+def scrape_naver_meaning(driver, word):
+    """Scrape meaning from Naver Japanese Dictionary (rendered page parsed offline)"""
+    return parse_word_html(fetch_page(driver, word))
+
+class SeleniumFetcher:
+    """
+    Look up words by rendering the search page in headless Chrome
+
+    Browsers come from a shared DriverPool; without one, a private
+    single-browser pool is created (and closed with the fetcher).
+    """
+
+    name = 'selenium'
+    last_failed = False  # A missing page and a failed render look the same here
+
+    def __init__(self, pool=None, archive=None):
+        from driver_pool import DriverPool
+
+        self.owns_pool = pool is None
+        self.pool = pool or DriverPool(1)
+        self.archive = archive
+
+    def fetch(self, word):
+        """Return the rendered page source for word, or None on error"""
+        page = self.pool.lookup(word, fetch_page)
+        if page is not None and self.archive is not None:
+            self.archive.add(self.name, word, page)
+        return page
+
+    def lookup(self, word):
+        """Return numbered meanings for word, or None"""
+        meaning = parse_word_html(self.fetch(word))
+        self.last_failed = meaning is None
+        return meaning
+
+    def close(self):
+        if self.owns_pool:
+            self.pool.close()
+
+def create_fetcher(backend='http', api_url=NAVER_API_URL, driver_pool=None, archive=None):
+    """Create a fetcher for the given backend name (archive: optional ResponseArchive)"""
+    if backend == 'http':
+        return HttpFetcher(api_url, archive=archive)
+    if backend == 'selenium':
+        return SeleniumFetcher(driver_pool, archive)
+    raise ValueError(f"Unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
+
+if __name__ == '__main__':
+    import sys
+
+    args = sys.argv[1:]
+    backend = args.pop(0) if args and args[0] in BACKENDS else 'http'
+    words = args or ['する', '思う', 'ある']
+
+    fetcher = create_fetcher(backend)
+    try:
+        for word in words:
+            print(f"{word}: {fetcher.lookup(word) or '[NOT FOUND]'}")
+    finally:
+        fetcher.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Naver JSON API
+Serves recorded responses for /api/v1/search/word so the scrapers can be
+tested and load-tested without touching Naver.
+
+Recorded responses are <word>.json files in the fixture directory
+(e.g. naver_response.json saved by debug_naver.py, renamed to 思う.json).
+Queries that would resolve outside that directory get an empty result.
+Unknown words get an empty result. --error-rate injects 429/503 responses
+to exercise the adaptive backoff.
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Configuration
+FIXTURE_DIR = 'resources/fixtures/naver/'
+API_PATH = '/api/v1/search/word'
+EMPTY_RESPONSE = {'searchResultMap': {'searchResultListMap': {'WORD': {'items': []}}}}
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+
+        with server.lock:
+            server.request_count += 1
+
+        if url.path != API_PATH:
+            self.send_body(404, b'{}')
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.error_rate and random.random() < server.error_rate:
+            status = random.choice([429, 503])
+            self.send_body(status, b'{}', {'Retry-After': '1'} if status == 429 else None)
+            return
+
+        word = parse_qs(url.query).get('query', [''])[0]
+        self.send_body(200, server.load_fixture(word))
+
+    def send_body(self, status, body, extra_headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Quiet
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixture_dir=FIXTURE_DIR, latency=0.0, error_rate=0.0):
+        super().__init__(address, FixtureHandler)
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.empty = json.dumps(EMPTY_RESPONSE).encode('utf-8')
+
+    def load_fixture(self, word):
+        if word not in self.cache:
+            # Only files directly in the fixture directory ("../x" or "/x" queries get an empty result)
+            root = os.path.realpath(self.fixture_dir)
+            path = os.path.realpath(os.path.join(root, f"{word}.json"))
+            if os.path.dirname(path) == root and os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    self.cache[word] = f.read()
+            else:
+                self.cache[word] = self.empty
+        return self.cache[word]
+
+    @property
+    def api_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+def start_server(port=0, **kwargs):
+    """Start a fixture server in a background thread and return it"""
+    server = FixtureServer(('127.0.0.1', port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded Naver JSON responses locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 429/503 responses')
+    args = parser.parse_args()
+
+    server = FixtureServer(('127.0.0.1', args.port), args.fixtures, args.latency, args.error_rate)
+    print(f"[OK] Serving {args.fixtures} at {server.api_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[INFO] Served {server.request_count} requests")
+
+if __name__ == '__main__':
+    main()
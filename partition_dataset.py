@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Range-partitioned dataset splitter (generalizes the resources/noun/ chunks)
+
+Splits a POS split, the master list or a vocab store into shards, either
+by Frequency range (--range 3000: 0~2999, 3000~5999, ...) or by row count
+(--rows 5000, extended so rows sharing a Frequency stay in one shard).
+Shards are serialized and written in parallel worker processes. A
+manifest.json records each shard's row count, Frequency min/max, size and
+SHA-256.
+
+Formats:
+    json    pretty-printed array, like resources/noun/*.json
+    jsonl   one compact object per line
+    csv     Anki CSV columns
+Add --gzip to compress any of them (deterministic, so checksums are stable).
+
+load_window() reads the manifest and opens only the shards that overlap
+the requested Frequency window.
+
+Usage:
+    python partition_dataset.py split --input resources/pos/noun.csv --output /tmp/noun --range 3000
+    python partition_dataset.py split --input resources/vocab.store --pos verb --output /tmp/verb \\
+        --rows 1000 --format jsonl --gzip
+    python partition_dataset.py load --output /tmp/noun --window 5000 8000
+    python partition_dataset.py load --output /tmp/noun --window 5000 8000 --verify
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from convert_to_csv import HEADERS, JSON_FIELDS
+from vocab_store import COLUMNS, LINE_TERMINATOR, POS_COLUMN, open_store, read_list_rows
+
+# Configuration
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+FORMATS = ('json', 'jsonl', 'csv')
+DEFAULT_FIELDS = {'json': list(JSON_FIELDS), 'jsonl': list(JSON_FIELDS), 'csv': HEADERS}
+
+FREQUENCY = COLUMNS.index('Frequency')
+
+def read_input(path, pos=None):
+    """Rows in COLUMNS order from a CSV/JSON word list or a vocab store, optionally one POS only"""
+    if path.lower().endswith('.store'):
+        with open_store(path) as store:
+            rows = [list(row) for row in store.iter_rows(COLUMNS)]
+    else:
+        rows = read_list_rows(path)
+        if pos is not None and not any(row[-1] for row in rows):
+            raise ValueError(f"{path} has no POS column; --pos needs a vocab store")
+    if pos is not None:
+        rows = [row for row in rows if row[COLUMNS.index(POS_COLUMN)] == pos]
+    return rows
+
+def frequency_of(row):
+    value = row[FREQUENCY].strip()
+    if not value.isdigit():
+        raise ValueError(f"Row {row[COLUMNS.index('Expression')]!r} has no numeric Frequency ({value!r})")
+    return int(value)
+
+def plan_shards(rows, range_size=None, row_limit=None):
+    """[(shard name, rows)] in Frequency order, by Frequency range or by row count"""
+    rows = sorted(rows, key=frequency_of)
+    shards = []
+    if range_size:
+        for row in rows:
+            low = frequency_of(row) // range_size * range_size
+            if not shards or shards[-1][0] != low:
+                shards.append((low, []))
+            shards[-1][1].append(row)
+        # Named by range bounds, the last one clipped to its highest Frequency (like 15000~15959)
+        return [(f"{low}~{min(low + range_size - 1, frequency_of(chunk[-1]))}", chunk) for low, chunk in shards]
+
+    # A chunk runs past row_limit until the Frequency changes, so shard ranges (and names) never overlap
+    start = 0
+    while start < len(rows):
+        end = min(start + row_limit, len(rows))
+        while end < len(rows) and frequency_of(rows[end]) == frequency_of(rows[end - 1]):
+            end += 1
+        chunk = rows[start:end]
+        shards.append((f"{frequency_of(chunk[0])}~{frequency_of(chunk[-1])}", chunk))
+        start = end
+    return shards
+
+def shard_entries(rows, fields):
+    """Row dicts of the given fields, Frequency as a number (as in the JSON word lists)"""
+    indexes = [COLUMNS.index(field) for field in fields]
+    for row in rows:
+        entry = {field: row[i] for field, i in zip(fields, indexes)}
+        if 'Frequency' in entry:
+            entry['Frequency'] = int(entry['Frequency'])
+        yield entry
+
+def serialize(rows, fmt, fields):
+    """Shard bytes in the given format"""
+    if fmt == 'json':
+        return json.dumps(list(shard_entries(rows, fields)), ensure_ascii=False, indent=2).encode('utf-8')
+    if fmt == 'jsonl':
+        return ''.join(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+                       for entry in shard_entries(rows, fields)).encode('utf-8')
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator=LINE_TERMINATOR)
+    writer.writerow(fields)
+    indexes = [COLUMNS.index(field) for field in fields]
+    writer.writerows([row[i] for i in indexes] for row in rows)
+    return buffer.getvalue().encode('utf-8')
+
+def write_shard(task):
+    """Serialize and write one shard (temp file, then renamed); returns its manifest entry"""
+    output_dir, name, rows, fmt, fields, compress = task
+    data = serialize(rows, fmt, fields)
+    filename = f"{name}.{fmt}"
+    if compress:
+        data = gzip.compress(data, mtime=0)
+        filename += '.gz'
+
+    path = os.path.join(output_dir, filename)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+    return {
+        'file': filename,
+        'rows': len(rows),
+        'frequency_min': frequency_of(rows[0]),
+        'frequency_max': frequency_of(rows[-1]),
+        'bytes': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+
+def split(rows, output_dir, fmt='json', fields=None, range_size=None, row_limit=None, compress=False,
+          workers=None, source=None):
+    """Write the shards and the manifest; returns the manifest"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if bool(range_size) == bool(row_limit):
+        raise ValueError("Give exactly one of range_size and row_limit")
+    fields = list(fields or DEFAULT_FIELDS[fmt])
+    unknown = [field for field in fields if field not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    previous = load_manifest(output_dir) if os.path.exists(os.path.join(output_dir, MANIFEST_FILE)) else None
+
+    tasks = [(output_dir, name, chunk, fmt, fields, compress)
+             for name, chunk in plan_shards(rows, range_size, row_limit)]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        shards = [write_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(write_shard, tasks))
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': source,
+        'format': fmt,
+        'compression': 'gzip' if compress else None,
+        'fields': fields,
+        'partition': {'range': range_size} if range_size else {'rows': row_limit},
+        'rows': sum(shard['rows'] for shard in shards),
+        'shards': shards,
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    # Shards of the previous split that this one no longer has
+    if previous is not None:
+        current = {shard['file'] for shard in shards}
+        for shard in previous['shards']:
+            path = os.path.join(output_dir, shard['file'])
+            if shard['file'] not in current and os.path.exists(path):
+                os.remove(path)
+    return manifest
+
+def load_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {directory}: {manifest.get('version')}")
+    return manifest
+
+def shards_for(manifest, low=None, high=None):
+    """Manifest entries of the shards overlapping the Frequency window [low, high]"""
+    return [shard for shard in manifest['shards']
+            if (low is None or shard['frequency_max'] >= low) and (high is None or shard['frequency_min'] <= high)]
+
+def read_shard(directory, manifest, shard, verify=False):
+    """Row dicts of one shard (Frequency as a number)"""
+    with open(os.path.join(directory, shard['file']), 'rb') as f:
+        data = f.read()
+    if verify and hashlib.sha256(data).hexdigest() != shard['sha256']:
+        raise ValueError(f"Checksum mismatch: {shard['file']}")
+    if manifest.get('compression') == 'gzip':
+        data = gzip.decompress(data)
+
+    text = data.decode('utf-8')
+    if manifest['format'] == 'json':
+        return json.loads(text)
+    if manifest['format'] == 'jsonl':
+        return [json.loads(line) for line in text.splitlines() if line]
+    entries = list(csv.DictReader(io.StringIO(text, newline='')))
+    for entry in entries:
+        if 'Frequency' in entry:
+            entry['Frequency'] = int(entry['Frequency'])
+    return entries
+
+def load_window(directory, low=None, high=None, verify=False):
+    """
+    Rows with low <= Frequency <= high, reading only the shards that can hold them
+
+    Returns:
+        (row dicts in Frequency order, number of shards opened)
+    """
+    manifest = load_manifest(directory)
+    shards = shards_for(manifest, low, high)
+    rows = []
+    for shard in shards:
+        rows.extend(entry for entry in read_shard(directory, manifest, shard, verify)
+                    if (low is None or entry['Frequency'] >= low) and (high is None or entry['Frequency'] <= high))
+    return rows, len(shards)
+
+def main():
+    parser = argparse.ArgumentParser(description='Split a word list into Frequency-range or size-bounded shards')
+    parser.add_argument('command', choices=['split', 'load'])
+    parser.add_argument('--output', required=True, help='Shard directory (holds manifest.json)')
+    parser.add_argument('--input', help='split: CSV/JSON word list or vocab store')
+    parser.add_argument('--pos', help='split: only rows of this POS (vocab store input)')
+    parser.add_argument('--range', type=int, dest='range_size', help='split: Frequency range per shard')
+    parser.add_argument('--rows', type=int, dest='row_limit', help='split: rows per shard')
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    parser.add_argument('--fields', help='split: comma-separated fields (default depends on the format)')
+    parser.add_argument('--gzip', action='store_true', help='split: gzip every shard')
+    parser.add_argument('--workers', type=int, default=None, help='split: writer processes (default: CPU count)')
+    parser.add_argument('--window', type=int, nargs=2, metavar=('LOW', 'HIGH'), help='load: Frequency window')
+    parser.add_argument('--verify', action='store_true', help='load: check shard checksums')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == 'load':
+        low, high = args.window or (None, None)
+        rows, opened = load_window(args.output, low, high, args.verify)
+        total = len(load_manifest(args.output)['shards'])
+        print(f"[OK] {len(rows):,} rows from {opened}/{total} shards "
+              f"({(time.perf_counter() - started) * 1000:.1f} ms)")
+        return
+
+    if not args.input or bool(args.range_size) == bool(args.row_limit):
+        parser.error('split needs --input and exactly one of --range / --rows')
+    rows = read_input(args.input, args.pos)
+    fields = args.fields.split(',') if args.fields else None
+    manifest = split(rows, args.output, args.format, fields, args.range_size, args.row_limit, args.gzip,
+                     args.workers, source=args.input)
+
+    print("=" * 60)
+    print(f"{args.input}{f' ({args.pos})' if args.pos else ''} -> {args.output}")
+    print("=" * 60)
+    for shard in manifest['shards']:
+        print(f"  [OK] {shard['file']:24s} {shard['rows']:6,} rows  "
+              f"{shard['frequency_min']}~{shard['frequency_max']}  {shard['bytes'] / 1024:8.1f} KB")
+    print(f"[OK] {manifest['rows']:,} rows in {len(manifest['shards'])} shards ({time.perf_counter() - started:.2f}s)")
+
+if __name__ == '__main__':
+    main()
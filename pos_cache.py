@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of POS classifications (single SQLite file)
+
+Results are keyed by (expression, SudachiPy version, dictionary version,
+split mode), so upgrading SudachiPy or its dictionary invalidates them
+automatically. Computing the key never loads the dictionary.
+"""
+
+import sqlite3
+from importlib import metadata
+
+# Configuration
+POS_CACHE_FILE = 'pos_cache.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classifications (
+    expression TEXT NOT NULL,
+    sudachi_version TEXT NOT NULL,
+    dict_version TEXT NOT NULL,
+    split_mode TEXT NOT NULL,
+    category TEXT NOT NULL,
+    pos_detail TEXT NOT NULL,
+    PRIMARY KEY (sudachi_version, dict_version, split_mode, expression)
+);
+"""
+
+def package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+def classifier_key(dict_name, split_mode):
+    """(sudachi_version, dict_version, split_mode) for the installed packages"""
+    return (package_version('SudachiPy'), package_version(f'SudachiDict-{dict_name}'), split_mode)
+
+class PosCache:
+    """SQLite cache of (category, pos_detail) per expression and classifier key"""
+
+    def __init__(self, path=POS_CACHE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def get_all(self, key):
+        """Every cached result for a classifier key: expression -> (category, pos_detail)"""
+        rows = self.conn.execute(
+            'SELECT expression, category, pos_detail FROM classifications '
+            'WHERE sudachi_version=? AND dict_version=? AND split_mode=?',
+            key
+        )
+        return {expression: (category, pos_detail) for expression, category, pos_detail in rows}
+
+    def put_many(self, key, results):
+        """Store results: iterable of (expression, (category, pos_detail))"""
+        self.conn.execute('BEGIN')
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?, ?, ?)',
+            ((expression,) + tuple(key) + tuple(result) for expression, result in results)
+        )
+        self.conn.execute('COMMIT')
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local POS classification service
+
+Loads the SudachiPy dictionary once and answers batched classify requests
+over a Unix socket (a named pipe on Windows). classify_pos.py uses a
+running service automatically; other scripts can use PosClient.
+
+Messages are pickles, so only the user who started the service may talk to
+it: the socket lives in a per-user directory (mode 0700, under
+$XDG_RUNTIME_DIR when set), next to a random authkey (mode 0600) written
+at each start. Clients read the key from there.
+
+Usage:
+    python pos_service.py start [--dict full]   # run in a separate terminal
+    python pos_service.py status
+    python pos_service.py bench                 # cold start vs warm call latency
+    python pos_service.py stop
+"""
+
+import argparse
+import getpass
+import os
+import secrets
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from classify_pos import ANALYZERS, SUDACHI_DICT, classify_batch, create_tokenizer
+
+# Configuration
+SERVICE_DIR_NAME = 'japanese-anki-pos-service'
+SOCKET_FILE = 'pos_service.sock'
+AUTHKEY_FILE = 'pos_service.key'
+PIPE_NAME = r'\\.\pipe\japanese_anki_pos_service'
+AUTHKEY_BYTES = 32
+BENCH_WORDS = ['思い出す', '食べる', '美しい', 'ゆっくり', '図書館', 'しかし', 'ああ', 'お茶']
+
+def service_dir():
+    """Per-user directory for the socket and the authkey, created private to this user"""
+    if sys.platform == 'win32':
+        # %LOCALAPPDATA% is only readable by its user
+        path = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), SERVICE_DIR_NAME)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        path = os.path.join(runtime_dir, SERVICE_DIR_NAME)
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"{SERVICE_DIR_NAME}-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not a directory owned by this user")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+def service_address():
+    if sys.platform == 'win32':
+        return f"{PIPE_NAME}_{getpass.getuser()}"
+    return os.path.join(service_dir(), SOCKET_FILE)
+
+def authkey_path():
+    return os.path.join(service_dir(), AUTHKEY_FILE)
+
+def read_authkey():
+    """Authkey of the running service (FileNotFoundError when none was started)"""
+    with open(authkey_path(), 'rb') as f:
+        return f.read()
+
+def write_authkey():
+    """Write a fresh random authkey, readable by this user only"""
+    key = secrets.token_bytes(AUTHKEY_BYTES)
+    path = authkey_path()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        if sys.platform != 'win32':
+            os.fchmod(f.fileno(), 0o600)  # In case the file already existed
+        f.write(key)
+    return key
+
+def service_family():
+    return 'AF_PIPE' if sys.platform == 'win32' else 'AF_UNIX'
+
+class PosClient:
+    """Connection to a running service"""
+
+    def __init__(self, address=None):
+        self.conn = Client(address or service_address(), family=service_family(), authkey=read_authkey())
+
+    def _call(self, *request):
+        self.conn.send(request)
+        status, payload = self.conn.recv()
+        if status != 'ok':
+            raise RuntimeError(f"pos_service: {payload}")
+        return payload
+
+    def ping(self):
+        """Service info: dict name, load time, pid, requests served"""
+        return self._call('ping')
+
+    def classify(self, words, analysis='head'):
+        """(category, pos_detail) per word, same as the classify_pos.ANALYZERS function"""
+        return self._call('classify', list(words), analysis)
+
+    def shutdown(self):
+        self._call('shutdown')
+
+    def close(self):
+        self.conn.close()
+
+def connect_service(dict_name=None):
+    """Client for a running service (using dict_name, if given), or None"""
+    try:
+        client = PosClient()
+    except (OSError, EOFError, AuthenticationError):
+        return None
+    try:
+        if dict_name is None or client.ping()['dict'] == dict_name:
+            return client
+    except (OSError, EOFError, RuntimeError):
+        pass
+    client.close()
+    return None
+
+class PosService:
+    """Serve classify requests; one tokenizer per connection, one shared dictionary"""
+
+    def __init__(self, dict_name=SUDACHI_DICT):
+        from sudachipy import dictionary
+
+        self.dict_name = dict_name
+        started = time.perf_counter()
+        self.dictionary = dictionary.Dictionary(dict=dict_name)
+        self.load_seconds = time.perf_counter() - started
+        self.requests = 0
+        self.words = 0
+        self.lock = threading.Lock()
+        self.listener = None
+        self.authkey = None
+        self.stopping = False
+
+    def info(self):
+        return {'dict': self.dict_name, 'load_seconds': self.load_seconds, 'pid': os.getpid(),
+                'requests': self.requests, 'words': self.words}
+
+    def handle(self, conn):
+        tokenizer_obj = self.dictionary.create()  # Tokenizers are not thread-safe
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    break
+
+                command = request[0]
+                if command == 'classify':
+                    analysis = request[2] if len(request) > 2 else 'head'
+                    if analysis not in ANALYZERS:
+                        conn.send(('error', f"unknown analysis {analysis!r}"))
+                        continue
+                    results = ANALYZERS[analysis](tokenizer_obj, request[1])
+                    with self.lock:
+                        self.requests += 1
+                        self.words += len(results)
+                    conn.send(('ok', results))
+                elif command == 'ping':
+                    conn.send(('ok', self.info()))
+                elif command == 'shutdown':
+                    conn.send(('ok', None))
+                    self.request_stop()
+                    break
+                else:
+                    conn.send(('error', f"unknown command {command!r}"))
+        finally:
+            conn.close()
+
+    def serve(self):
+        try:
+            address = service_address()
+        except PermissionError as e:
+            print(f"[ERROR] {e}")
+            return
+        if connect_service() is not None:
+            print(f"[ERROR] A service is already running on {address}")
+            return
+        if service_family() == 'AF_UNIX' and os.path.exists(address):
+            os.remove(address)  # Stale socket from a crashed service
+
+        self.authkey = write_authkey()
+        self.listener = Listener(address, family=service_family(), authkey=self.authkey)
+        print(f"[OK] {self.dict_name.upper()} dictionary loaded in {self.load_seconds:.2f}s")
+        print(f"[OK] Listening on {address} (Ctrl+C to stop)")
+
+        try:
+            while True:
+                try:
+                    conn = self.listener.accept()
+                except Exception as e:
+                    print(f"[WARNING] Rejected connection: {e}")
+                    continue
+                if self.stopping:
+                    conn.close()
+                    break
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.listener.close()
+            try:
+                os.remove(authkey_path())
+            except OSError:
+                pass
+            print(f"\n[INFO] Stopped after {self.requests} requests ({self.words} words)")
+
+    def request_stop(self):
+        """Stop accepting; a dummy connection wakes up the blocked accept()"""
+        self.stopping = True
+        try:
+            Client(service_address(), family=service_family(), authkey=self.authkey).close()
+        except OSError:
+            pass
+
+def bench(dict_name, rounds=20):
+    """Compare a cold in-process classification with warm calls to the service"""
+    print("=" * 60)
+    print("POS classification latency: cold start vs warm service")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    tokenizer_obj = create_tokenizer(dict_name)
+    expected = classify_batch(tokenizer_obj, BENCH_WORDS)
+    cold = time.perf_counter() - started
+    print(f"  Cold (load {dict_name} dictionary + classify): {cold * 1000:9.1f} ms")
+
+    client = connect_service(dict_name)
+    if client is None:
+        print(f"[WARNING] No {dict_name} service running; start one with: python pos_service.py start --dict {dict_name}")
+        return
+
+    try:
+        started = time.perf_counter()
+        first = PosClient()
+        first.classify(BENCH_WORDS)
+        first.close()
+        connect_call = time.perf_counter() - started
+
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            results = client.classify(BENCH_WORDS)
+            timings.append(time.perf_counter() - started)
+        assert results == expected, 'service results differ from in-process classification'
+    finally:
+        client.close()
+
+    timings.sort()
+    print(f"  Warm (connect + classify):                 {connect_call * 1000:9.1f} ms")
+    print(f"  Warm (classify on open connection, p50):   {timings[len(timings) // 2] * 1000:9.2f} ms")
+    print(f"  Speedup over cold start: {cold / connect_call:,.0f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Local POS classification service')
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'bench'])
+    parser.add_argument('--dict', default=SUDACHI_DICT, choices=['small', 'core', 'full'])
+    args = parser.parse_args()
+
+    if args.command == 'start':
+        print("=" * 60)
+        print("POS classification service")
+        print("=" * 60)
+        PosService(args.dict).serve()
+    elif args.command == 'bench':
+        bench(args.dict)
+    else:
+        client = connect_service()
+        if client is None:
+            print("[INFO] Service is not running")
+            return
+        info = client.ping()
+        if args.command == 'stop':
+            client.shutdown()
+            print(f"[OK] Service stopped (pid {info['pid']})")
+        else:
+            print(f"[OK] Service running (pid {info['pid']}): {info['dict'].upper()} dictionary "
+                  f"loaded in {info['load_seconds']:.2f}s, {info['requests']} requests, {info['words']} words")
+        client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Raw response archive for the scrapers
+
+Every raw response (API JSON or rendered page HTML) is stored once per
+content hash, zlib-compressed, in an append-only pack file. A small text
+index maps (source, expression) to the record's offset and length; later
+index lines win.
+
+The reparse command streams the archive through the current extractor
+(naver_extract.py) on a process pool and regenerates the Meaning column of
+every CSV in resources/pos/ without touching the network.
+
+Usage:
+    python response_archive.py stats
+    python response_archive.py reparse [--workers 8]
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+import zlib
+
+# Configuration
+ARCHIVE_FILE = 'naver_archive.pack'  # index: <pack>.idx
+POS_DIR = 'resources/pos/'
+REPARSE_CHUNK = 256  # responses per worker task
+
+def index_path_for(pack_path):
+    return pack_path + '.idx'
+
+def parser_for(source):
+    """Extractor for the responses of a fetcher backend"""
+    from naver_extract import parse_word_html, parse_word_json
+
+    return parse_word_html if source == 'selenium' else parse_word_json
+
+class ResponseArchive:
+    """Thread-safe append-only pack of compressed, deduplicated responses"""
+
+    def __init__(self, path=ARCHIVE_FILE):
+        self.path = path
+        self.index_path = index_path_for(path)
+        self.lock = threading.Lock()
+        self.records = {}  # digest -> (offset, length)
+        self.latest = {}  # (source, expression) -> digest
+        self.added = 0
+        self.deduplicated = 0
+
+        self.pack = open(path, 'ab')
+        self.pack_size = self.pack.seek(0, os.SEEK_END)
+        self._load_index()
+        self.index = open(self.index_path, 'a', encoding='utf-8')
+
+    def _load_index(self):
+        """Read the index; lines pointing past the end of the pack are ignored"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) != 5:
+                    continue  # Torn last line
+                source, expression, digest, offset, length = parts
+                offset, length = int(offset), int(length)
+                if offset + length > self.pack_size:
+                    continue
+                self.records[digest] = (offset, length)
+                self.latest[(source, expression)] = digest
+
+    def add(self, source, expression, raw):
+        """Archive one raw response (str or bytes)"""
+        data = raw.encode('utf-8') if isinstance(raw, str) else raw
+        digest = hashlib.sha1(data).hexdigest()
+        with self.lock:
+            if digest in self.records:
+                self.deduplicated += 1
+            else:
+                packed = zlib.compress(data, 6)
+                offset = self.pack_size
+                self.pack.write(packed)
+                self.pack.flush()  # Pack data lands before the index line that points at it
+                self.pack_size += len(packed)
+                self.records[digest] = (offset, len(packed))
+                self.added += 1
+            if self.latest.get((source, expression)) != digest:
+                offset, length = self.records[digest]
+                self.index.write(f"{source}\t{expression}\t{digest}\t{offset}\t{length}\n")
+                self.index.flush()
+                self.latest[(source, expression)] = digest
+
+    def get(self, source, expression):
+        """Latest raw response for (source, expression) as text, or None"""
+        with self.lock:
+            digest = self.latest.get((source, expression))
+            if digest is None:
+                return None
+            offset, length = self.records[digest]
+        return read_record(self.path, offset, length)
+
+    def locations(self):
+        """Latest (source, expression, offset, length) of every archived lookup"""
+        with self.lock:
+            return [(source, expression) + self.records[digest]
+                    for (source, expression), digest in self.latest.items()]
+
+    def stats_line(self):
+        return (f"Archive: {len(self.latest)} lookups, {len(self.records)} unique responses "
+                f"({self.pack_size / 1024 / 1024:.1f} MB packed), "
+                f"{self.added} added, {self.deduplicated} deduplicated this run")
+
+    def close(self):
+        with self.lock:
+            self.pack.close()
+            self.index.close()
+
+def read_record(path, offset, length, pack=None):
+    """Decompress one record from the pack file"""
+    if pack is None:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+    else:
+        pack.seek(offset)
+        data = pack.read(length)
+    return zlib.decompress(data).decode('utf-8')
+
+# Reparse (process pool)
+
+_worker_pack = None
+
+def _init_reparse_worker(path):
+    """Each worker process keeps its own read handle on the pack"""
+    global _worker_pack
+    _worker_pack = open(path, 'rb')
+
+def _reparse_chunk(chunk):
+    """Parse a batch of (source, expression, offset, length) records"""
+    results = []
+    for source, expression, offset, length in chunk:
+        raw = read_record(None, offset, length, _worker_pack)
+        results.append((source, expression, parser_for(source)(raw)))
+    return results
+
+def reparse_archive(archive, workers=None, chunk_size=REPARSE_CHUNK):
+    """
+    Re-parse every archived lookup with the current extractor
+
+    When both backends archived a word, the http (JSON) response wins.
+
+    Returns:
+        dict expression -> meaning (None when the response has no meanings)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    locations = sorted(archive.locations(), key=lambda loc: loc[2])  # Read the pack sequentially
+    chunks = [locations[i:i + chunk_size] for i in range(0, len(locations), chunk_size)]
+
+    meanings = {}
+    sources = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_reparse_worker,
+                             initargs=(archive.path,)) as executor:
+        for results in executor.map(_reparse_chunk, chunks):
+            for source, expression, meaning in results:
+                if sources.get(expression) == 'http' and source != 'http':
+                    continue
+                sources[expression] = source
+                meanings[expression] = meaning
+    return meanings
+
+def regenerate_meanings(meanings, pos_dir=POS_DIR):
+    """
+    Rewrite the Meaning column of every CSV in pos_dir from re-parsed results
+
+    Rows whose expression was never archived, or whose response re-parses
+    to no meaning (e.g. after a parser regression), are left untouched;
+    files without any change are not rewritten.
+    """
+    import csv
+    from pathlib import Path
+    from result_journal import write_csv_atomic
+
+    totals = {'updated': 0, 'unchanged': 0, 'missing': 0, 'unparsed': 0}
+    for csv_path in sorted(Path(pos_dir).glob('*.csv')):
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            headers = reader.fieldnames
+            rows = list(reader)
+
+        updated = 0
+        for row in rows:
+            expression = row.get('Expression', '').strip()
+            if expression not in meanings:
+                totals['missing'] += 1
+                continue
+            meaning = meanings[expression]
+            if not meaning:
+                totals['unparsed'] += 1
+                continue
+            if row.get('Meaning', '') != meaning:
+                row['Meaning'] = meaning
+                updated += 1
+            else:
+                totals['unchanged'] += 1
+
+        if updated:
+            write_csv_atomic(str(csv_path), headers, rows)
+        totals['updated'] += updated
+        print(f"  - {csv_path.name}: {updated:,} meanings updated")
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description='Raw response archive tools')
+    parser.add_argument('command', choices=['stats', 'reparse'])
+    parser.add_argument('--archive', default=ARCHIVE_FILE, help='Pack file (index: <pack>.idx)')
+    parser.add_argument('--pos-dir', default=POS_DIR, help='CSV files to regenerate')
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: all cores)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.archive):
+        print(f"[ERROR] No archive at {args.archive}")
+        return
+
+    archive = ResponseArchive(args.archive)
+    try:
+        print(f"[INFO] {archive.stats_line()}")
+        if args.command == 'stats':
+            return
+
+        print("=" * 60)
+        print("Re-parsing archived responses (no network)")
+        print("=" * 60)
+        started = time.perf_counter()
+        meanings = reparse_archive(archive, args.workers)
+        elapsed = time.perf_counter() - started
+        found = sum(1 for meaning in meanings.values() if meaning)
+        print(f"[OK] Parsed {len(meanings):,} responses in {elapsed:.1f}s "
+              f"({len(meanings) / max(elapsed, 1e-9):,.0f}/s), {found:,} with meanings")
+
+        totals = regenerate_meanings(meanings, args.pos_dir)
+        print(f"\n[OK] {totals['updated']:,} updated, {totals['unchanged']:,} unchanged, "
+              f"{totals['missing']:,} rows not in the archive, "
+              f"{totals['unparsed']:,} kept (archived response has no meaning)")
+    finally:
+        archive.close()
+
+if __name__ == '__main__':
+    main()
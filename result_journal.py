@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Append-only result journal for the scrapers
+
+Each scraped result is appended as one JSON line instead of rewriting the
+whole CSV. Lines are flushed immediately and fsync'ed in batches. The journal
+is merged into the CSV once at the end of a run (or on demand), and replayed
+on resume.
+
+Usage (manual merge):
+    python result_journal.py resources/pos/noun.csv
+"""
+
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+# Configuration
+JOURNAL_DIR = 'scraping_journal/'
+FSYNC_EVERY = 100  # results per fsync
+FSYNC_INTERVAL = 2.0  # seconds between fsyncs at most
+
+def journal_path_for(csv_path):
+    """Journal file used for a CSV file"""
+    return os.path.join(JOURNAL_DIR, os.path.basename(csv_path) + '.jsonl')
+
+class ResultJournal:
+    """Thread-safe append-only JSONL journal with batched fsync"""
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.count = 0
+
+    def append(self, row_idx, expression, meaning, status):
+        """Record one result (O(1), no CSV rewrite)"""
+        line = json.dumps(
+            {'row': row_idx, 'expression': expression, 'meaning': meaning, 'status': status},
+            ensure_ascii=False
+        )
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            self.count += 1
+            self.unsynced += 1
+            now = time.monotonic()
+            if self.unsynced >= self.fsync_every or now - self.last_sync >= self.fsync_interval:
+                os.fsync(self.file.fileno())
+                self.unsynced = 0
+                self.last_sync = now
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+
+def replay_journal(path):
+    """
+    Read a journal back
+
+    Returns:
+        dict row_idx -> (expression, meaning); later entries win.
+        A torn last line (crash mid-write) is ignored.
+    """
+    results = {}
+    if not os.path.exists(path):
+        return results
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            results[entry['row']] = (entry['expression'], entry['meaning'])
+    return results
+
+def apply_journal(rows, path):
+    """
+    Apply journaled meanings to rows in place
+
+    Entries whose expression no longer matches the row (CSV edited or
+    regenerated since) are ignored. Returns the number of rows updated.
+    """
+    applied = 0
+    for row_idx, (expression, meaning) in replay_journal(path).items():
+        if row_idx < len(rows) and rows[row_idx].get('Expression', '').strip() == expression:
+            rows[row_idx]['Meaning'] = meaning
+            applied += 1
+    return applied
+
+def write_csv_atomic(csv_path, headers, rows):
+    """Write rows to a temp file and rename it over csv_path"""
+    tmp_path = csv_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(rows)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, csv_path)
+
+def merge_journal(csv_path, path=None):
+    """Merge a journal into its CSV and remove the journal"""
+    path = path or journal_path_for(csv_path)
+    if not os.path.exists(path):
+        return 0
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        headers = reader.fieldnames
+        rows = list(reader)
+
+    applied = apply_journal(rows, path)
+    write_csv_atomic(csv_path, headers, rows)
+    os.remove(path)
+    return applied
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    for csv_path in sys.argv[1:]:
+        applied = merge_journal(csv_path)
+        print(f"[OK] {csv_path}: merged {applied} journaled results")
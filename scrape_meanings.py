@@ -6,9 +6,6 @@ Updates the Meaning field with numbered definitions (1. ... 2. ... 3. ...)
 """
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
@@ -18,6 +15,11 @@ import os
 import json
 from pathlib import Path
 
+from naver_fetcher import PARSER_VERSION, fetch_page, parse_word_html
+from lookup_cache import LookupCache
+
+CACHE_SOURCE = 'selenium'  # Same extraction as the selenium backend
+
 # Configuration
 POS_DIR = 'resources/pos/'
 PROGRESS_FILE = 'scraping_progress.json'
@@ -39,80 +41,26 @@ def save_progress(progress):
     with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
         json.dump(progress, f, ensure_ascii=False, indent=2)
 
-def scrape_naver_meaning(driver, word):
+def scrape_with_retry(driver, word, max_retries=MAX_RETRIES):
     """
-    Scrape meaning from Naver Japanese Dictionary
-
-    Args:
-        driver: Selenium WebDriver instance
-        word: Japanese word to look up
+    Scrape with retry logic
 
     Returns:
-        Korean meaning string with numbers (1. ... 2. ... 3. ...) or None
-        Maximum 3 meanings
+        (page source, meaning) - page is None when every attempt failed to render
     """
-    try:
-        url = f"https://ja.dict.naver.com/#/search?range=word&query={word}"
-        driver.get(url)
-
-        # Wait for the page to load (minimal timeout)
-        wait = WebDriverWait(driver, 3)
-
-        elements = None
-
-        # Try to find the first search result container to avoid idioms/phrases
-        try:
-            # Look for the first word entry
-            first_entry = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.component_word'))
-            )
-
-            # Get mean elements only from the first entry
-            elements = first_entry.find_elements(By.CSS_SELECTOR, '.mean')
-        except:
-            pass
-
-        # Fallback: just get all .mean elements
-        if not elements or len(elements) == 0:
-            try:
-                elements = wait.until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, '.mean'))
-                )
-            except:
-                return None
-
-        if elements and len(elements) > 0:
-            meanings = []
-            for elem in elements[:3]:  # Maximum 3 meanings
-                text = elem.text.strip()
-                if text:
-                    # Clean up text (remove extra whitespace)
-                    text = ' '.join(text.split())
-                    meanings.append(text)
-
-            if meanings:
-                # Format with numbers: 1. ... 2. ... 3. ...
-                numbered_meanings = [f"{i+1}. {meaning}" for i, meaning in enumerate(meanings)]
-                return ' '.join(numbered_meanings)
-
-        return None
-
-    except Exception as e:
-        return None
-
-def scrape_with_retry(driver, word, max_retries=MAX_RETRIES):
-    """Scrape with retry logic"""
+    page = None
     for attempt in range(max_retries):
-        meaning = scrape_naver_meaning(driver, word)
+        page = fetch_page(driver, word)
+        meaning = parse_word_html(page)
         if meaning:
-            return meaning
+            return page, meaning
 
         if attempt < max_retries - 1:
             time.sleep(0.3)  # Minimal wait before retry
 
-    return None
+    return page, None
 
-def process_csv_file(driver, csv_path, progress):
+def process_csv_file(driver, csv_path, progress, cache=None):
     """
     Process a single CSV file
 
@@ -120,6 +68,7 @@ def process_csv_file(driver, csv_path, progress):
         driver: Selenium WebDriver
         csv_path: Path to CSV file
         progress: Progress dictionary
+        cache: Optional LookupCache (hits skip the browser and the delay)
 
     Returns:
         Updated progress dictionary
@@ -153,8 +102,13 @@ def process_csv_file(driver, csv_path, progress):
 
             print(f"  [{i+1}/{total}] {expression}... ", end='', flush=True)
 
-            # Scrape meaning
-            meaning = scrape_with_retry(driver, expression)
+            # Scrape meaning (cache first)
+            found, meaning = (cache.get(CACHE_SOURCE, expression, PARSER_VERSION, parse_word_html)
+                              if cache else (False, None))
+            if not found:
+                page, meaning = scrape_with_retry(driver, expression)
+                if cache and page is not None:  # Render failures and timeouts are retried next run
+                    cache.put(CACHE_SOURCE, expression, PARSER_VERSION, page, meaning)
 
             if meaning:
                 row['Meaning'] = meaning
@@ -177,7 +131,8 @@ def process_csv_file(driver, csv_path, progress):
                     writer.writerows(rows)
 
             # Be polite to the server
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+            if not found:
+                time.sleep(DELAY_BETWEEN_REQUESTS)
 
     except KeyboardInterrupt:
         # Save on Ctrl+C
@@ -247,11 +202,14 @@ def main():
         print(f"[ERROR] Failed to initialize WebDriver: {e}")
         return
 
+    cache = LookupCache()
+
     try:
         # Process each CSV file
         for csv_file in csv_files:
-            progress = process_csv_file(driver, str(csv_file), progress)
+            progress = process_csv_file(driver, str(csv_file), progress, cache)
             save_progress(progress)
+            print(f"[INFO] {cache.stats_line()}")
 
         print("\n" + "=" * 60)
         print("All files completed!")
@@ -273,6 +231,7 @@ def main():
 
     finally:
         driver.quit()
+        cache.close()
         print("\n[INFO] WebDriver closed")
 
 if __name__ == '__main__':
@@ -2,36 +2,45 @@
 # -*- coding: utf-8 -*-
 """
 Parallel scraper for Naver Japanese Dictionary
-Uses multiple WebDriver instances to scrape faster
+Uses multiple fetcher instances (HTTP API sessions or WebDrivers) to scrape faster
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import csv
 import time
 import os
 import json
+import argparse
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+import queue
+
+from naver_fetcher import BACKENDS, NAVER_API_URL, PARSER_VERSION, create_fetcher
+from async_scraper import DEFAULT_RATE, DEFAULT_BURST, DEFAULT_CONCURRENCY
+from lookup_cache import CACHE_FILE, CachedFetcher, LookupCache
+from response_archive import ARCHIVE_FILE, ResponseArchive, parser_for
+from result_journal import ResultJournal, apply_journal, journal_path_for, write_csv_atomic
+from latency_stats import LatencyStats
 
 # Configuration
 POS_DIR = 'resources/pos/'
 PROGRESS_FILE = 'scraping_progress_parallel.json'
-NUM_WORKERS = 10  # Number of parallel browsers
+NUM_WORKERS = 10  # Number of parallel fetchers (browsers or HTTP sessions)
+DEFAULT_BACKEND = 'http'  # 'http' (JSON API) or 'selenium' (headless Chrome fallback)
 DELAY_BETWEEN_REQUESTS = 0.1  # Minimal delay per worker
-MAX_RETRIES = 2
+MAX_RETRIES = 2  # Attempts per word (failed lookups are requeued)
+
+# Rough seconds per lookup, used for the time estimate
+SECONDS_PER_LOOKUP = {'http': 0.05, 'selenium': 2}
 
-# Files to process
+# Files to process (--all-files: every CSV in POS_DIR)
 TARGET_FILES = ['noun.csv', 'verb.csv', 'adjective.csv', 'adverb.csv']
 
-# Thread-safe lock for file operations
-file_lock = threading.Lock()
+# Scheduling
+UNKNOWN_FREQUENCY = 10 ** 9  # Rows without a Frequency rank go last
+SENTINEL = (float('inf'), 0, 0, -1, -1)  # Sorts after every queued row
+
+# Thread-safe lock for progress file
 progress_lock = threading.Lock()
 
 def load_progress():
@@ -48,265 +57,314 @@ def save_progress(progress):
         with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
             json.dump(progress, f, ensure_ascii=False, indent=2)
 
-def create_driver():
-    """Create a new WebDriver instance with maximum optimization"""
-    chrome_options = Options()
-    chrome_options.add_argument('--headless=new')  # New headless mode
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-software-rasterizer')
-    chrome_options.add_argument('--lang=ko-KR')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-
-    # Performance optimizations
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-plugins')
-    chrome_options.add_argument('--disable-images')  # Don't load images
-    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
-    chrome_options.add_argument('--disable-javascript-harmony')
-    chrome_options.add_argument('--disable-sync')
-    chrome_options.add_argument('--disable-translate')
-    chrome_options.add_argument('--disable-default-apps')
-    chrome_options.add_argument('--no-first-run')
-    chrome_options.add_argument('--no-default-browser-check')
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--disable-permissions-api')
-    chrome_options.add_argument('--ignore-certificate-errors')
-
-    # Page load strategy
-    chrome_options.page_load_strategy = 'eager'  # Don't wait for full page load
-
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=chrome_options
-    )
-
-    # Set timeouts
-    driver.set_page_load_timeout(10)
-    driver.set_script_timeout(10)
-
-    return driver
+def has_meaning(row):
+    """Rows with a numbered meaning are skipped"""
+    existing_meaning = row.get('Meaning', '').strip()
+    return bool(existing_meaning and '1.' in existing_meaning)
 
-def scrape_naver_meaning(driver, word):
-    """Scrape meaning from Naver Japanese Dictionary"""
+def frequency_of(row):
+    """Frequency rank used as scheduling priority (unknown ranks go last)"""
     try:
-        url = f"https://ja.dict.naver.com/#/search?range=word&query={word}"
-        driver.get(url)
-
-        wait = WebDriverWait(driver, 3)
-        elements = None
-
-        # Try to find the first word entry
-        try:
-            first_entry = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.component_word'))
-            )
-            elements = first_entry.find_elements(By.CSS_SELECTOR, '.mean')
-        except:
-            pass
-
-        # Fallback
-        if not elements or len(elements) == 0:
-            try:
-                elements = wait.until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, '.mean'))
-                )
-            except:
-                return None
-
-        if elements and len(elements) > 0:
-            meanings = []
-            for elem in elements[:3]:  # Maximum 3 meanings
-                text = elem.text.strip()
-                if text:
-                    text = ' '.join(text.split())
-                    meanings.append(text)
-
-            if meanings:
-                numbered_meanings = [f"{i+1}. {meaning}" for i, meaning in enumerate(meanings)]
-                return ' '.join(numbered_meanings)
-
-        return None
+        return int(row.get('Frequency', ''))
+    except ValueError:
+        return UNKNOWN_FREQUENCY
 
-    except Exception as e:
-        return None
-
-def scrape_with_retry(driver, word):
-    """Scrape with retry logic"""
-    for attempt in range(MAX_RETRIES):
-        meaning = scrape_naver_meaning(driver, word)
-        if meaning:
-            return meaning
-        if attempt < MAX_RETRIES - 1:
-            time.sleep(0.2)
-    return None
-
-def worker_task(worker_id, rows_chunk, indices, filename, all_rows, headers, csv_path):
-    """Worker function to process a chunk of rows"""
-    driver = None
-    results = []
+def read_csv_with_journal(csv_path):
+    """Read a CSV file and replay any journal left by an interrupted run"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        headers = reader.fieldnames
+        rows = list(reader)
 
-    try:
-        driver = create_driver()
-        print(f"[Worker {worker_id}] Started with {len(rows_chunk)} entries")
+    journal_path = journal_path_for(csv_path)
+    if os.path.exists(journal_path):
+        applied = apply_journal(rows, journal_path)
+        print(f"[INFO] Replayed {applied} results from {journal_path}")
+
+    return headers, rows, journal_path
+
+def merge_results(csv_path, headers, rows, journal):
+    """Write the CSV once and drop the journal it now contains"""
+    journal.close()
+    write_csv_atomic(csv_path, headers, rows)
+    os.remove(journal.path)
+
+class FileState:
+    """
+    Per-file bookkeeping for the run-wide scheduler
+
+    Rows of every target file share one queue; each file is merged back
+    into its own CSV as soon as its last pending row is finished.
+    """
+
+    def __init__(self, csv_path, progress):
+        self.csv_path = csv_path
+        self.filename = os.path.basename(csv_path)
+        self.progress = progress
+        self.headers, self.rows, self.journal_path = read_csv_with_journal(csv_path)
+        self.pending = [
+            idx for idx, row in enumerate(self.rows)
+            if not has_meaning(row) and row.get('Expression', '').strip()
+        ]
+        self.remaining = len(self.pending)
+        self.journal = ResultJournal(self.journal_path)
+        self.lock = threading.Lock()
+
+    def record(self, row_idx, meaning):
+        """Store one final result (journal only); merge the file after its last row"""
+        row = self.rows[row_idx]
+        row['Meaning'] = meaning or ''
+        status = "[OK]" if meaning else "[FAIL]"
+        self.journal.append(row_idx, row.get('Expression', '').strip(), row['Meaning'], status)
+
+        with self.lock:
+            self.remaining -= 1
+            done = self.remaining == 0
+        if done:
+            self.finish()
+
+    def finish(self):
+        """Merge results into the CSV and mark the file complete"""
+        print(f"\n[INFO] Saving {self.filename} ({self.journal.count} journaled)...")
+        merge_results(self.csv_path, self.headers, self.rows, self.journal)
+        self.progress[self.filename] = len(self.rows)
+        save_progress(self.progress)
+        print(f"[OK] Completed {self.filename}")
+
+def load_file_states(csv_files, progress):
+    """Read every target file; files with nothing pending are finished right away"""
+    states = []
+    for csv_file in csv_files:
+        state = FileState(str(csv_file), progress)
+        filled = len(state.rows) - len(state.pending)
+        print(f"  - {state.filename}: {len(state.pending):,} to process ({filled:,} filled or empty)")
+        if state.pending:
+            states.append(state)
+        else:
+            state.finish()
+    return states
+
+def worker_task(worker_id, work_queue, files, stats, backend=DEFAULT_BACKEND, api_url=NAVER_API_URL, cache=None, driver_pool=None, archive=None, stop=None):
+    """
+    Worker function: pull rows from the shared priority queue until a sentinel
+
+    A failed lookup is requeued behind all first attempts (up to MAX_RETRIES
+    attempts) instead of blocking this worker with a retry loop. Once stop
+    is set (Ctrl+C), the rows still queued are left for the next run.
+    """
+    fetcher = None
+    completed = 0
 
-        for idx, (row_idx, row) in enumerate(zip(indices, rows_chunk)):
-            expression = row.get('Expression', '').strip()
+    try:
+        fetcher = create_fetcher(backend, api_url, driver_pool, archive)
+        if cache is not None:
+            fetcher = CachedFetcher(fetcher, cache, PARSER_VERSION, parser_for(backend))
+        print(f"[Worker {worker_id}] Started ({backend})")
 
-            if not expression:
-                results.append((row_idx, row, ''))
-                continue
+        while True:
+            attempt, frequency, seq, file_idx, row_idx = work_queue.get()
+            if file_idx == SENTINEL[3] or (stop is not None and stop.is_set()):
+                work_queue.task_done()
+                break
 
-            # Skip if meaning already exists
-            existing_meaning = row.get('Meaning', '').strip()
-            if existing_meaning and '1.' in existing_meaning:
-                results.append((row_idx, row, '[SKIP]'))
-                # No delay for skipped entries
-                continue
+            state = files[file_idx]
+            expression = state.rows[row_idx].get('Expression', '').strip()
 
-            # Scrape meaning
-            meaning = scrape_with_retry(driver, expression)
+            try:
+                # Scrape meaning
+                started = time.perf_counter()
+                try:
+                    meaning = fetcher.lookup(expression)
+                    failed = not meaning and getattr(fetcher, 'last_failed', True)
+                except Exception as e:
+                    print(f"[Worker {worker_id}] Lookup error for {expression}: {e}")
+                    meaning, failed = None, True
+                latency = time.perf_counter() - started
+                from_cache = getattr(fetcher, 'last_hit', False)
+
+                if failed and attempt + 1 < MAX_RETRIES:
+                    # Transient failure: retry later, after every first attempt
+                    work_queue.put((attempt + 1, frequency, seq, file_idx, row_idx))
+                    stats.requeue()
+                else:
+                    # Append to the file's journal (merged when the file is done)
+                    state.record(row_idx, meaning)
+                    completed += 1
+                    if completed % 100 == 0:
+                        print(f"[Worker {worker_id}] Progress: {completed} done")
+
+                # Only delay if we actually scraped
+                if not from_cache:
+                    time.sleep(DELAY_BETWEEN_REQUESTS)
+
+                stats.record(worker_id, latency, time.perf_counter() - started)
+
+            finally:
+                work_queue.task_done()
+
+        print(f"[Worker {worker_id}] Completed! ({completed} entries)")
 
-            if meaning:
-                row['Meaning'] = meaning
-                status = "[OK]"
-            else:
-                row['Meaning'] = ''
-                status = "[FAIL]"
+    except Exception as e:
+        print(f"[Worker {worker_id}] Error: {e}")
 
-            results.append((row_idx, row, status))
+    finally:
+        stats.worker_done(worker_id)
+        if fetcher:
+            fetcher.close()
 
-            # Update main rows array and save every 50 entries
-            if (idx + 1) % 50 == 0:
-                with file_lock:
-                    # Update rows
-                    for r_idx, updated_row, _ in results:
-                        all_rows[r_idx] = updated_row
+    return completed
 
-                    # Save to CSV
-                    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-                        writer = csv.DictWriter(f, fieldnames=headers)
-                        writer.writeheader()
-                        writer.writerows(all_rows)
+def process_files_parallel(csv_files, progress, num_workers=NUM_WORKERS, backend=DEFAULT_BACKEND, api_url=NAVER_API_URL, cache=None, archive=None):
+    """
+    Process all files with one long-lived worker pool
 
-                    results = []  # Clear processed results
+    Pending rows of every file go into a single queue ordered by Frequency,
+    so common words finish first and workers stay busy across file boundaries.
+    """
+    print(f"\n{'=' * 60}")
+    print(f"Scheduling {len(csv_files)} files")
+    print(f"{'=' * 60}")
 
-                print(f"[Worker {worker_id}] Progress: {idx+1}/{len(rows_chunk)} (saved)")
+    files = load_file_states(csv_files, progress)
+    if not files:
+        return progress
 
-            # Progress indicator
-            elif (idx + 1) % 10 == 0:
-                print(f"[Worker {worker_id}] Progress: {idx+1}/{len(rows_chunk)}")
+    work_queue = queue.PriorityQueue()
+    seq = 0
+    for file_idx, state in enumerate(files):
+        for row_idx in state.pending:
+            work_queue.put((0, frequency_of(state.rows[row_idx]), seq, file_idx, row_idx))
+            seq += 1
 
-            # Only delay if we actually scraped
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+    print(f"\nQueued {seq:,} entries for {num_workers} workers")
 
-        print(f"[Worker {worker_id}] Completed!")
+    stats = LatencyStats(num_workers)
 
-    except Exception as e:
-        print(f"[Worker {worker_id}] Error: {e}")
+    # One pre-warmed browser per worker, shared for the whole run
+    driver_pool = None
+    if backend == 'selenium':
+        from driver_pool import DriverPool
+        driver_pool = DriverPool(num_workers)
 
+    stop = threading.Event()
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(worker_task, worker_id, work_queue, files, stats, backend, api_url, cache,
+                                driver_pool, archive, stop)
+                for worker_id in range(num_workers)
+            ]
+
+            # Wait until every row (including requeued retries) is finished,
+            # or every worker has died
+            try:
+                while work_queue.unfinished_tasks and not all(f.done() for f in futures):
+                    time.sleep(0.2)
+            except BaseException:
+                stop.set()  # Interrupted: workers finish their current row and leave the rest queued
+                raise
+            finally:
+                # Wake every worker, even one blocked on an empty queue
+                for _ in futures:
+                    work_queue.put(SENTINEL)
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"[ERROR] Worker failed: {e}")
+
+        stats.report()
     finally:
-        if driver:
-            driver.quit()
+        if driver_pool is not None:
+            driver_pool.report()
+            driver_pool.close()
+
+        # Files left unfinished (interrupted, or all workers died) keep their journal for the next run
+        for state in files:
+            if state.remaining:
+                state.journal.close()
+                print(f"[WARNING] {state.filename}: {state.remaining} entries left in {state.journal_path}")
 
-    return results
+    return progress
+
+def process_files_async(csv_files, progress, args, cache=None, archive=None):
+    """Process all files with the asyncio engine (HTTP API only), most frequent words first"""
+    from async_scraper import run_lookups
 
-def process_csv_file_parallel(csv_path, progress, num_workers=NUM_WORKERS):
-    """Process CSV file with parallel workers"""
-    filename = os.path.basename(csv_path)
     print(f"\n{'=' * 60}")
-    print(f"Processing: {filename}")
+    print(f"Scheduling {len(csv_files)} files (async engine)")
     print(f"{'=' * 60}")
 
-    # Read CSV
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        rows = list(reader)
-
-    total = len(rows)
-
-    # Filter out rows that already have meanings (skip filled entries)
-    to_process = []
-    to_process_indices = []
-    already_filled = 0
-
-    for idx, row in enumerate(rows):
-        existing_meaning = row.get('Meaning', '').strip()
-        if existing_meaning and '1.' in existing_meaning:
-            already_filled += 1
-            continue
-        to_process.append(row)
-        to_process_indices.append(idx)
-
-    print(f"Total entries: {total}")
-    print(f"Already filled: {already_filled}")
-    print(f"To process: {len(to_process)}")
-    print(f"Workers: {num_workers}")
-
-    if len(to_process) == 0:
-        print(f"[INFO] {filename} already completed, skipping")
-        progress[filename] = total
+    files = load_file_states(csv_files, progress)
+    if not files:
         return progress
 
-    # Use filtered rows
-    remaining_rows = to_process
-    remaining_indices = to_process_indices
-
-    # Split into chunks for workers
-    chunk_size = len(remaining_rows) // num_workers
-    if chunk_size == 0:
-        chunk_size = 1
+    pending = sorted(
+        ((frequency_of(state.rows[row_idx]), file_idx, row_idx)
+         for file_idx, state in enumerate(files) for row_idx in state.pending)
+    )
+    print(f"\nQueued {len(pending):,} entries")
+    print(f"Rate limit: {args.rate:g} req/s (burst {args.burst}), concurrency {args.concurrency}")
 
-    chunks = []
-    index_chunks = []
-    for i in range(0, len(remaining_rows), chunk_size):
-        chunks.append(remaining_rows[i:i+chunk_size])
-        index_chunks.append(remaining_indices[i:i+chunk_size])
+    completed = 0
 
-    print(f"[INFO] Split into {len(chunks)} chunks")
+    def on_result(key, expression, meaning):
+        nonlocal completed
+        file_idx, row_idx = key
+        files[file_idx].record(row_idx, meaning)
+        completed += 1
+        if completed % 500 == 0:
+            print(f"  Progress: {completed}/{len(pending)}")
 
-    # Process in parallel
-    all_results = []
+    words = (((file_idx, row_idx), files[file_idx].rows[row_idx]['Expression'].strip())
+             for _, file_idx, row_idx in pending)
 
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        futures = []
-        for worker_id, (chunk, indices) in enumerate(zip(chunks, index_chunks)):
-            future = executor.submit(worker_task, worker_id, chunk, indices, filename, rows, headers, csv_path)
-            futures.append(future)
+    try:
+        run_lookups(words, on_result, rate=args.rate, burst=args.burst,
+                    concurrency=args.concurrency, api_url=args.api_url, cache=cache, archive=archive)
+    finally:
+        # Interrupted runs keep their journals; they are replayed next time
+        for state in files:
+            if state.remaining:
+                state.journal.close()
 
-        # Collect results as they complete
-        for future in as_completed(futures):
-            try:
-                results = future.result()
-                all_results.extend(results)
-            except Exception as e:
-                print(f"[ERROR] Worker failed: {e}")
-
-    # Update rows with final results (if any remaining)
-    if all_results:
-        for row_idx, updated_row, status in all_results:
-            rows[row_idx] = updated_row
-
-    # Save final results
-    print(f"\n[INFO] Saving final results to {filename}...")
-    with file_lock:
-        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(rows)
-
-    # Update progress
-    progress[filename] = total
-    save_progress(progress)
-
-    print(f"[OK] Completed {filename}")
     return progress
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Parallel Naver dictionary scraper')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help='Lookup backend: http (JSON API, fast) or selenium (headless Chrome)')
+    parser.add_argument('--workers', type=int, default=NUM_WORKERS,
+                        help='Number of parallel fetchers')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                        help='threads: one fetcher per worker thread; async: asyncio engine with a global rate limit')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help='Async engine: target requests per second')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                        help='Async engine: token bucket burst size')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Async engine: max in-flight requests')
+    parser.add_argument('--api-url', default=NAVER_API_URL,
+                        help='JSON API endpoint (e.g. a local naver_fixture_server.py)')
+    parser.add_argument('--cache-file', default=CACHE_FILE,
+                        help='SQLite lookup cache shared by all runs')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always hit the network')
+    parser.add_argument('--archive-file', default=ARCHIVE_FILE,
+                        help='Pack file archiving every raw response (see response_archive.py reparse)')
+    parser.add_argument('--no-archive', action='store_true',
+                        help='Do not archive raw responses')
+    parser.add_argument('--all-files', action='store_true',
+                        help=f'Process every CSV in {POS_DIR} instead of TARGET_FILES')
+    args = parser.parse_args()
+    if args.engine == 'async' and args.backend != 'http':
+        parser.error('--engine async only supports the http backend')
+    return args
+
 def main():
+    args = parse_args()
+
     print("=" * 60)
     print("Naver Dictionary Scraper - PARALLEL MODE")
     print("=" * 60)
@@ -315,14 +373,20 @@ def main():
     progress = load_progress()
 
     # Get target CSV files
-    csv_files = [Path(POS_DIR) / filename for filename in TARGET_FILES]
-    csv_files = [f for f in csv_files if f.exists()]
+    if args.all_files:
+        csv_files = sorted(Path(POS_DIR).glob('*.csv'))
+    else:
+        csv_files = [Path(POS_DIR) / filename for filename in TARGET_FILES]
+        csv_files = [f for f in csv_files if f.exists()]
 
     if not csv_files:
         print(f"[ERROR] No target CSV files found in {POS_DIR}")
         return
 
-    print(f"\nProcessing {len(csv_files)} CSV files with {NUM_WORKERS} parallel workers:")
+    if args.engine == 'async':
+        print(f"\nProcessing {len(csv_files)} CSV files with the async engine ({args.rate:g} req/s):")
+    else:
+        print(f"\nProcessing {len(csv_files)} CSV files with {args.workers} parallel workers ({args.backend} backend):")
     total_entries = 0
     for csv_file in csv_files:
         with open(csv_file, 'r', encoding='utf-8') as f:
@@ -336,14 +400,26 @@ def main():
     print(f"\nTotal remaining entries: {total_entries:,}")
 
     # Estimate time
-    estimated_seconds = (total_entries / NUM_WORKERS) * (DELAY_BETWEEN_REQUESTS + 2)
+    if args.engine == 'async':
+        estimated_seconds = total_entries / args.rate
+    else:
+        estimated_seconds = (total_entries / args.workers) * (DELAY_BETWEEN_REQUESTS + SECONDS_PER_LOOKUP[args.backend])
     estimated_hours = estimated_seconds / 3600
     print(f"Estimated time: {estimated_hours:.1f} hours")
 
+    cache = None if args.no_cache else LookupCache(args.cache_file)
+    archive = None if args.no_archive else ResponseArchive(args.archive_file)
+
     try:
-        # Process each CSV file
-        for csv_file in csv_files:
-            progress = process_csv_file_parallel(str(csv_file), progress, NUM_WORKERS)
+        # One run-wide schedule across all files
+        if args.engine == 'async':
+            progress = process_files_async(csv_files, progress, args, cache, archive)
+        else:
+            progress = process_files_parallel(csv_files, progress, args.workers, args.backend, args.api_url, cache, archive)
+        if cache is not None:
+            print(f"[INFO] {cache.stats_line()}")
+        if archive is not None:
+            print(f"[INFO] {archive.stats_line()}")
 
         print("\n" + "=" * 60)
         print("All files completed!")
@@ -363,5 +439,11 @@ def main():
         print(f"\n[ERROR] {type(e).__name__}: {e}")
         save_progress(progress)
 
+    finally:
+        if cache is not None:
+            cache.close()
+        if archive is not None:
+            archive.close()
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quick test to verify deck_delta.diff on a homograph reorder
+
+Moves ある (Frequency 2) behind its homograph at 810. Both GUIDs must show
+up as changed: ある now holds the 810 row and ある#2 the moved one. Nothing
+may be added or deleted, or importing the delta would overwrite a note
+that the deleted CSV then asks to remove.
+"""
+
+from build_apkg import note_entries, read_rows
+from convert_to_csv import HEADERS
+from deck_delta import diff
+
+csv_path = 'resources/all/26225_Japanese.csv'
+word = 'ある'
+moved_to = '99999'
+
+EXPRESSION = HEADERS.index('Expression')
+FREQUENCY = HEADERS.index('Frequency')
+
+rows = read_rows(csv_path)
+_, _, _, baseline = diff(note_entries(rows), {})
+
+# Unchanged list: empty delta
+added, changed, deleted, _ = diff(note_entries(rows), baseline)
+assert not (added or changed or deleted), 'unchanged list produced a delta'
+print("[OK] Unchanged list: empty delta")
+
+homographs = [row[FREQUENCY] for row in rows if row[EXPRESSION].strip() == word]
+print(f"{word} rows before: Frequency {', '.join(homographs)}")
+first = min((row for row in rows if row[EXPRESSION].strip() == word), key=lambda row: int(row[FREQUENCY]))
+first[FREQUENCY] = moved_to
+
+added, changed, deleted, _ = diff(note_entries(rows), baseline)
+changed_notes = {key: fields[FREQUENCY] for _, key, fields in changed}
+print(f"Added: {len(added)}, Changed: {changed_notes}, Deleted: {deleted}")
+
+assert not added, 'reorder reported added notes'
+assert not deleted, 'reorder reported deleted notes'
+assert changed_notes == {word: homographs[1], f'{word}#2': moved_to}, 'reorder changed the wrong notes'
+print("[OK] Homograph reorder: both GUIDs changed, nothing added or deleted")
@@ -6,10 +6,11 @@ Tests the scraping functionality with a few sample words
 """
 
 import requests
-from bs4 import BeautifulSoup
 import time
 from urllib.parse import quote
 
+from naver_extract import parse_word_html, parse_word_json
+
 def scrape_naver_meaning(word):
     """
     Scrape meaning from Naver Japanese Dictionary
@@ -18,7 +19,7 @@ def scrape_naver_meaning(word):
         word: Japanese word to look up
 
     Returns:
-        Korean meaning string or None if not found
+        Numbered Korean meaning string or None if not found
     """
     # Use the search page URL
     encoded_word = quote(word)
@@ -37,46 +38,17 @@ def scrape_naver_meaning(word):
         response = requests.get(api_url, headers=headers, timeout=10)
 
         if response.status_code == 200:
-            try:
-                data = response.json()
-
-                # Navigate the JSON structure
-                if 'searchResultMap' in data:
-                    result_map = data.get('searchResultMap', {})
-                    list_map = result_map.get('searchResultListMap', {})
-                    word_results = list_map.get('WORD', {})
-                    items = word_results.get('items', [])
-
-                    if items:
-                        first_item = items[0]
-                        means = first_item.get('meansCollector', [])
-
-                        meanings = [m.get('mean', '') for m in means if 'mean' in m]
-
-                        if meanings:
-                            # Return top 3 meanings
-                            return ', '.join(meanings[:3])
-
-            except Exception as json_error:
-                pass  # Fall through to HTML parsing
+            meaning = parse_word_json(response.text)
+            if meaning:
+                return meaning
 
         # If API fails, try HTML scraping
         response = requests.get(url, headers=headers, timeout=10)
 
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Look for meaning elements (this may need adjustment based on actual HTML)
-            meanings = []
-            mean_elements = soup.select('.mean')
-
-            for elem in mean_elements[:3]:
-                text = elem.get_text(strip=True)
-                if text:
-                    meanings.append(text)
-
-            if meanings:
-                return ', '.join(meanings)
+            meaning = parse_word_html(response.text)
+            if meaning:
+                return meaning
 
         return None
 
@@ -5,62 +5,12 @@ Test numbered meanings format
 """
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 
-def scrape_naver_meaning(driver, word):
-    """Scrape meaning with numbered format (max 3 meanings)"""
-    try:
-        url = f"https://ja.dict.naver.com/#/search?range=word&query={word}"
-        driver.get(url)
-
-        # Wait for JavaScript to render
-        time.sleep(2)
-        wait = WebDriverWait(driver, 15)
-
-        elements = None
-
-        # Try to find the first search result container to avoid idioms/phrases
-        try:
-            first_entry = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.component_word'))
-            )
-            elements = first_entry.find_elements(By.CSS_SELECTOR, '.mean')
-        except:
-            pass
-
-        # Fallback: just get all .mean elements
-        if not elements or len(elements) == 0:
-            try:
-                elements = wait.until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, '.mean'))
-                )
-            except:
-                return None
-
-        if elements and len(elements) > 0:
-            meanings = []
-            for elem in elements[:3]:  # Maximum 3 meanings
-                text = elem.text.strip()
-                if text:
-                    text = ' '.join(text.split())
-                    meanings.append(text)
-
-            if meanings:
-                # Format: 1. ... 2. ... 3. ...
-                numbered_meanings = [f"{i+1}. {meaning}" for i, meaning in enumerate(meanings)]
-                return ' '.join(numbered_meanings)
-
-        return None
-
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
+from naver_fetcher import scrape_naver_meaning
 
 def main():
     print("Testing numbered meanings format\n")
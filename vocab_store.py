@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar binary store for the vocabulary dataset
+
+The word list exists as the master CSV/JSON, the resources/pos/*.csv splits
+and the resources/noun/*.json chunks, and every tool re-parses text. This
+module compiles it once into a single memory-mapped file with one column
+per field (the 14 Anki fields plus POS, the split a row came from):
+
+    int32 columns    Frequency (any column whose values are all plain integers)
+    string columns   uint32 ids into an interned table of the column's distinct
+                     values: an offset array plus one NUL-terminated UTF-8 heap
+
+Opening the store only reads the column directory. A column is mapped on
+first use, and a string is decoded only when it is accessed, so a tool that
+needs Frequency and Expression never touches Meaning or builds row dicts.
+CSV and JSON are export targets: export-pos rewrites the POS splits
+byte-for-byte, export-json writes the 26225_Japanese.json layout.
+
+Usage:
+    python vocab_store.py build                       # From resources/pos/*.csv
+    python vocab_store.py build --input 26225_Japanese.csv
+    python vocab_store.py info
+    python vocab_store.py export-csv --output 26225_Japanese.csv
+    python vocab_store.py export-json --output 26225_Japanese.json
+    python vocab_store.py export-pos --output resources/pos/
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from pathlib import Path
+
+from convert_to_csv import HEADERS, JSON_FIELDS, entry_row, iter_json_array
+
+# Configuration
+STORE_FILE = 'resources/vocab.store'
+POS_DIR = 'resources/pos/'
+POS_COLUMN = 'POS'
+COLUMNS = HEADERS + [POS_COLUMN]
+LINE_TERMINATOR = '\n'  # As in the checked-in CSVs
+
+STORE_MAGIC = b'VOCABST1'
+BYTE_ORDER_MARK = 0x01020304  # Written natively; a mismatch means a foreign store
+# magic, byte order mark, row count, column count
+HEADER = struct.Struct('=8sIII')
+# name, kind, distinct values, data offset, value table offset, heap offset, heap size
+COLUMN = struct.Struct('=32sBxxxIQQQQ')
+INT32, STRING = 0, 1
+ALIGN = 8
+
+def is_plain_int(value):
+    """True for integers that format back to the same text (no sign, spaces or leading zeros)"""
+    return value.isdigit() and value.isascii() and (value == '0' or value[0] != '0') and int(value) < 2 ** 31
+
+def read_pos_rows(pos_dir):
+    """Rows in COLUMNS order from every <POS>.csv in pos_dir, in Frequency order"""
+    rows = []
+    for path in sorted(Path(pos_dir).glob('*.csv')):
+        rows.extend(row[:-1] + [path.stem] for row in read_list_rows(str(path)))
+    frequency = COLUMNS.index('Frequency')
+    rows.sort(key=lambda row: int(row[frequency]) if row[frequency].isdigit() else float('inf'))
+    return rows
+
+def read_list_rows(path):
+    """Rows in COLUMNS order (POS empty) from a CSV with a header row or the JSON word list"""
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return [[str(value) for value in entry_row(entry)] + [''] for entry in iter_json_array(f)]
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = [header.index(name) if name in header else None for name in COLUMNS]
+        return [[row[i] if i is not None and i < len(row) else '' for i in columns] for row in reader]
+
+def padding(size):
+    return b'\0' * (-size % ALIGN)
+
+def encode_column(values):
+    """(kind, distinct count, data bytes, value table bytes, heap bytes) for one column"""
+    if values and all(is_plain_int(value) for value in values):
+        return INT32, 0, array('i', map(int, values)).tobytes(), b'', b''
+
+    ids = {}
+    column = array('I', [ids.setdefault(value, len(ids)) for value in values])
+    if any('\0' in value for value in ids):
+        raise ValueError('NUL characters cannot be stored (they terminate heap values)')
+    encoded = [value.encode('utf-8') + b'\0' for value in ids]  # Insertion order = id order
+    offsets = array('I', [0])
+    heap_size = 0
+    for value in encoded:
+        heap_size += len(value)
+        offsets.append(heap_size)
+    return STRING, len(ids), column.tobytes(), offsets.tobytes(), b''.join(encoded)
+
+def build_store(rows, store_path):
+    """Write rows (lists in COLUMNS order) to store_path (temp file, then renamed); returns the row count"""
+    encoded = [encode_column([row[i] for row in rows]) for i in range(len(COLUMNS))]
+
+    offset = HEADER.size + COLUMN.size * len(COLUMNS)
+    offset += -offset % ALIGN
+    directory, sections = [], []
+    for name, (kind, distinct, data, table, heap) in zip(COLUMNS, encoded):
+        data_offset = offset
+        table_offset = data_offset + len(data) + -len(data) % ALIGN
+        heap_offset = table_offset + len(table) + -len(table) % ALIGN
+        offset = heap_offset + len(heap) + -len(heap) % ALIGN
+        directory.append(COLUMN.pack(name.encode('utf-8'), kind, distinct, data_offset, table_offset,
+                                     heap_offset, len(heap)))
+        sections.extend([data, padding(len(data)), table, padding(len(table)), heap, padding(len(heap))])
+
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    tmp_path = store_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        header = HEADER.pack(STORE_MAGIC, BYTE_ORDER_MARK, len(rows), len(COLUMNS)) + b''.join(directory)
+        f.write(header + padding(len(header)))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, store_path)
+    return len(rows)
+
+class StringColumn:
+    """Interned string column: a uint32 id per row, values decoded on first access"""
+
+    def __init__(self, mm, view, rows, distinct, data_offset, table_offset, heap_offset, heap_size):
+        self._mm = mm
+        self.ids = view[data_offset:data_offset + rows * 4].cast('I')
+        self._offsets = view[table_offset:table_offset + (distinct + 1) * 4].cast('I')
+        self._heap = heap_offset
+        self._heap_size = heap_size
+        self._values = [None] * distinct
+        self._decoded = False
+
+    def __len__(self):
+        return len(self.ids)
+
+    def value(self, value_id):
+        """The string with the given id"""
+        value = self._values[value_id]
+        if value is None:
+            start = self._heap + self._offsets[value_id]
+            end = self._heap + self._offsets[value_id + 1] - 1
+            value = self._values[value_id] = self._mm[start:end].decode('utf-8')
+        return value
+
+    def __getitem__(self, row):
+        return self.value(self.ids[row])
+
+    def __iter__(self):
+        """Every row's value; the whole heap is decoded in one call first"""
+        if not self._decoded:
+            heap = self._mm[self._heap:self._heap + self._heap_size].decode('utf-8')
+            self._values = heap.split('\0')[:-1]
+            self._decoded = True
+        return map(self._values.__getitem__, self.ids)
+
+    @property
+    def distinct(self):
+        return len(self._values)
+
+    def id_of(self, text):
+        """Id of a value (for comparing rows by id without decoding), or None"""
+        for value_id in range(self.distinct):
+            if self.value(value_id) == text:
+                return value_id
+        return None
+
+    def release(self):
+        self.ids.release()
+        self._offsets.release()
+
+class VocabStore:
+    """Read-only, memory-mapped columnar view of the vocabulary"""
+
+    def __init__(self, store_path=STORE_FILE):
+        with open(store_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, bom, self.rows, count = HEADER.unpack_from(self._mm)
+        if magic != STORE_MAGIC or bom != BYTE_ORDER_MARK:
+            self._mm.close()
+            raise ValueError(f"{store_path} is not a vocabulary store (rebuild it with: python vocab_store.py build)")
+        self._view = memoryview(self._mm)
+        self._directory = {}
+        for i in range(count):
+            name, *entry = COLUMN.unpack_from(self._mm, HEADER.size + i * COLUMN.size)
+            self._directory[name.rstrip(b'\0').decode('utf-8')] = entry
+        self._columns = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def names(self):
+        return list(self._directory)
+
+    def column(self, name):
+        """int32 memoryview (numeric columns) or StringColumn, mapped on first use"""
+        column = self._columns.get(name)
+        if column is None:
+            if name not in self._directory:
+                raise KeyError(f"No column {name!r} (columns: {', '.join(self._directory)})")
+            kind, distinct, data_offset, table_offset, heap_offset, heap_size = self._directory[name]
+            if kind == INT32:
+                column = self._view[data_offset:data_offset + self.rows * 4].cast('i')
+            else:
+                column = StringColumn(self._mm, self._view, self.rows, distinct, data_offset, table_offset,
+                                      heap_offset, heap_size)
+            self._columns[name] = column
+        return column
+
+    def text_column(self, name):
+        """Values of a column as strings (ints formatted back), e.g. for CSV export"""
+        column = self.column(name)
+        return map(str, column) if isinstance(column, memoryview) else iter(column)
+
+    def iter_rows(self, names=None):
+        """Tuples of the named columns' text values, row by row"""
+        return zip(*(self.text_column(name) for name in (names or self.names)))
+
+    def close(self):
+        """Release the mapping (required before the store file can be replaced on Windows)"""
+        if self._mm is None:
+            return
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
+        self._view.release()
+        self._mm.close()
+        self._mm = None
+
+def open_store(store_path=STORE_FILE):
+    return VocabStore(store_path)
+
+def export_csv(store, output_file, names=HEADERS, pos=None):
+    """Write the named columns (optionally only rows of one POS) as CSV; returns the row count"""
+    rows = store.iter_rows(names)
+    if pos is not None:
+        pos_ids = store.column(POS_COLUMN).ids
+        pos_id = store.column(POS_COLUMN).id_of(pos)
+        rows = (row for row, row_pos in zip(rows, pos_ids) if row_pos == pos_id)
+
+    count = 0
+    with open(output_file, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f, lineterminator=LINE_TERMINATOR)
+        writer.writerow(names)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def export_pos(store, output_dir):
+    """One <POS>.csv per POS value; returns {POS: row count}"""
+    pos_column = store.column(POS_COLUMN)
+    os.makedirs(output_dir, exist_ok=True)
+    return {pos_column.value(i): export_csv(store, os.path.join(output_dir, f"{pos_column.value(i)}.csv"),
+                                            pos=pos_column.value(i))
+            for i in range(pos_column.distinct) if pos_column.value(i)}
+
+def export_json(store, output_file):
+    """The 26225_Japanese.json layout (Frequency as a number), streamed; returns the row count"""
+    count = 0
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write('[')
+        for row in store.iter_rows(JSON_FIELDS):
+            entry = dict(zip(JSON_FIELDS, row))
+            if entry['Frequency'].isdigit():
+                entry['Frequency'] = int(entry['Frequency'])
+            text = json.dumps(entry, ensure_ascii=False, indent=2)
+            f.write(('\n  ' if count == 0 else ',\n  ') + text.replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else ']')
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar binary store for the vocabulary dataset')
+    parser.add_argument('command', choices=['build', 'info', 'export-csv', 'export-json', 'export-pos'])
+    parser.add_argument('--store', default=STORE_FILE)
+    parser.add_argument('--input', help=f'build: CSV/JSON word list instead of {POS_DIR}*.csv')
+    parser.add_argument('--output', help='export: output file (directory for export-pos)')
+    parser.add_argument('--pos', help='export-csv: only rows of this POS')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == 'build':
+        rows = read_list_rows(args.input) if args.input else read_pos_rows(POS_DIR)
+        count = build_store(rows, args.store)
+        print(f"[OK] {count:,} rows from {args.input or POS_DIR} -> {args.store} "
+              f"({os.path.getsize(args.store) / 1024 / 1024:.1f} MB, {time.perf_counter() - started:.2f}s)")
+        return
+
+    with open_store(args.store) as store:
+        if args.command == 'info':
+            print("=" * 60)
+            print(f"{args.store}: {len(store):,} rows, opened in {(time.perf_counter() - started) * 1000:.2f} ms")
+            print("=" * 60)
+            for name in store.names:
+                column = store.column(name)
+                kind = 'int32' if isinstance(column, memoryview) else f'string, {column.distinct:,} distinct'
+                print(f"  {name:16s} {kind}")
+            return
+        if not args.output:
+            parser.error(f'{args.command} needs --output')
+        if args.command == 'export-csv':
+            count = export_csv(store, args.output, pos=args.pos)
+        elif args.command == 'export-json':
+            count = export_json(store, args.output)
+        else:
+            counts = export_pos(store, args.output)
+            count = sum(counts.values())
+            for pos, rows in sorted(counts.items()):
+                print(f"  [OK] {os.path.join(args.output, pos + '.csv')} ({rows} entries)")
+    print(f"[OK] Exported {count:,} rows to {args.output} ({time.perf_counter() - started:.2f}s)")
+
+if __name__ == '__main__':
+    main()